@@ -0,0 +1,82 @@
+"""
+Compare the memory footprint of parsed resumes kept as one dict per candidate (the original
+`resumes` layout) against the compact CandidateStore records.
+
+Usage (from the backend directory):
+    python benchmarks/bench_candidate_memory.py
+    python benchmarks/bench_candidate_memory.py --sizes 10000 100000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from candidate_store import CandidateStore
+
+from bench_skill_index import LEVELS, SKILL_POOL
+
+EDUCATION = ["BSc Computer Science", "MSc Data Science", "BA Marketing", "BSN Nursing", "MBA", "BEng Mechanical"]
+
+
+def make_parsed_resumes(count, rng):
+    """
+    Yield synthetic parsed resumes. Each one goes through json.loads like a real parse, so
+    strings are not shared between candidates.
+    """
+    for i in range(count):
+        years = rng.randint(0, 20)
+        yield f"cand-{i}", json.loads(json.dumps({
+            "name": f"Candidate {i}",
+            "skills": rng.sample(SKILL_POOL, rng.randint(3, 12)),
+            "experience": rng.choice([str(years), f"{years} years"]),
+            "education": rng.choice(EDUCATION),
+            "experience_level": rng.choice(LEVELS),
+        }))
+
+
+def measure(build):
+    """Bytes still allocated after build() returns, with its result kept alive"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def run(size, seed):
+    dict_bytes, _ = measure(lambda: dict(make_parsed_resumes(size, random.Random(seed))))
+
+    def build_store():
+        store = CandidateStore()
+        for cid, parsed_data in make_parsed_resumes(size, random.Random(seed)):
+            store.add(cid, parsed_data)
+        return store
+
+    store_bytes, store = measure(build_store)
+    assert store.get("cand-0")["name"] == "Candidate 0"
+    print(
+        f"{size:>9,} candidates | dicts {dict_bytes / 2**20:8.1f} MiB ({dict_bytes / size:6.0f} B each) | "
+        f"store {store_bytes / 2**20:8.1f} MiB ({store_bytes / size:6.0f} B each) | "
+        f"saving {1 - store_bytes / dict_bytes:6.1%}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Load test the API end to end with a local Gemini stand-in (fake_gemini.FakeGenerativeModel).
+
+The backend runs in a uvicorn subprocess, in a scratch directory, with the fake model in place
+of Gemini. After uploading --seed-resumes synthetic resumes, a closed-loop async load
+generator keeps --concurrency requests in flight for --duration seconds. The requests are a
+weighted mix of:
+- /upload-resume/: new text and PDF resumes
+- /search-candidates/
+- /career-insights/{id}: cached, or regenerated with refresh=true
+- /jobs
+
+Throughput, error counts and p50/p95/p99 latency are reported per endpoint.
+
+Usage (from the backend directory; needs httpx):
+    python benchmarks/bench_load.py
+    python benchmarks/bench_load.py --concurrency 64 --duration 60 --mix upload=1,search=4,insights=2,jobs=3
+    python benchmarks/bench_load.py --llm-latency lognormal:1.5:0.6 --llm-errors quota=0.02,hang=0.005 --json results.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from bench_skill_index import LEVELS
+from synthetic_resumes import REAL_SKILLS, make_resume_file
+
+OPERATIONS = ("upload", "search", "insights", "jobs")
+PERCENTILES = (50, 95, 99)
+
+
+def parse_mix(spec):
+    """{operation: weight} from "upload=1,search=4,insights=2,jobs=3" """
+    mix = {}
+    for item in spec.split(","):
+        name, weight = item.split("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(p / 100 * len(sorted_values)) - 1))]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve(args):
+    """Run the backend with the fake model; this is the subprocess started by start_server()"""
+    import uvicorn
+    from fake_gemini import FakeGenerativeModel, parse_error_rates
+
+    import main
+    main.llm_client.model = FakeGenerativeModel(
+        latency=args.llm_latency, error_rates=parse_error_rates(args.llm_errors), seed=args.seed
+    )
+    uvicorn.run(main.app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+def start_server(args, workdir):
+    port = free_port()
+    env = dict(os.environ)
+    env.update({
+        "STORAGE_BACKEND": args.storage,
+        "PARSE_MODE": args.parse_mode,
+        "LLM_MAX_CONCURRENCY": str(args.llm_concurrency),
+        "LLM_REQUESTS_PER_MINUTE": str(args.llm_rpm),
+        "LLM_TIMEOUT_SECONDS": str(args.llm_timeout),
+        "PARSE_RETRY_BACKOFF_SECONDS": "0.2",
+        "PYTHONPATH": os.pathsep.join([BACKEND_DIR, BENCHMARKS_DIR]),
+    })
+    command = [
+        sys.executable, os.path.abspath(__file__), "--serve", "--port", str(port),
+        "--llm-latency", args.llm_latency, "--llm-errors", args.llm_errors, "--seed", str(args.seed),
+    ]
+    process = subprocess.Popen(command, cwd=workdir, env=env)
+    return process, f"http://127.0.0.1:{port}"
+
+
+async def wait_until_ready(client, process, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Backend exited with code {process.returncode}")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Backend did not start in time")
+
+
+class LoadGenerator:
+    """Closed-loop workers issuing a weighted mix of requests and recording their latency"""
+
+    def __init__(self, client, args):
+        self.client = client
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.mix = parse_mix(args.mix)
+        self.candidate_ids = []
+        self.uploads = 0
+        # operation -> [(latency seconds, status)]
+        self.results = {name: [] for name in self.mix}
+
+    async def upload(self):
+        filename, content, content_type = make_resume_file(
+            self.rng, self.uploads, pdf_ratio=self.args.pdf_ratio, messy_ratio=self.args.messy_ratio
+        )
+        self.uploads += 1
+        response = await self.client.post("/upload-resume/", files={"file": (filename, content, content_type)})
+        if response.status_code in (200, 202):
+            self.candidate_ids.append(response.json()["candidate_id"])
+        return response
+
+    async def search(self):
+        query = {
+            "skills": self.rng.sample(REAL_SKILLS, self.rng.randint(1, 3)),
+            "experience_level": self.rng.choice(LEVELS),
+        }
+        if self.rng.random() < 0.5:
+            query["query"] = " ".join(self.rng.sample(REAL_SKILLS, 3))
+        return await self.client.post("/search-candidates/", json=query)
+
+    async def insights(self):
+        if not self.candidate_ids:
+            return await self.jobs()
+        params = {"refresh": "true"} if self.rng.random() < self.args.insights_refresh_ratio else None
+        return await self.client.get(f"/career-insights/{self.rng.choice(self.candidate_ids)}", params=params)
+
+    async def jobs(self):
+        params = {"limit": 20, "offset": self.rng.choice([0, 0, 20])}
+        if self.rng.random() < 0.3:
+            params["experience_level"] = self.rng.choice(LEVELS)
+        return await self.client.get("/jobs", params=params)
+
+    async def seed(self, count, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                await self.upload()
+
+        await asyncio.gather(*(one() for _ in range(count)))
+
+    async def worker(self, deadline):
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        while time.monotonic() < deadline:
+            name = self.rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                status = (await getattr(self, name)()).status_code
+            except Exception as e:
+                status = type(e).__name__
+            self.results[name].append((time.perf_counter() - start, status))
+
+    async def run(self, concurrency, duration):
+        start = time.perf_counter()
+        deadline = time.monotonic() + duration
+        await asyncio.gather(*(self.worker(deadline) for _ in range(concurrency)))
+        return time.perf_counter() - start
+
+
+def summarize(results, elapsed):
+    summary = {}
+    for name, samples in list(results.items()) + [("total", [s for samples in results.values() for s in samples])]:
+        latencies = sorted(latency for latency, _ in samples)
+        errors = sum(1 for _, status in samples if not isinstance(status, int) or status >= 400)
+        summary[name] = {
+            "requests": len(samples),
+            "errors": errors,
+            "throughput_rps": round(len(samples) / elapsed, 2),
+            **{f"p{p}_ms": round(percentile(latencies, p) * 1000, 1) for p in PERCENTILES},
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else float("nan"),
+        }
+    return summary
+
+
+def print_summary(summary, elapsed):
+    print(f"\n{elapsed:.1f}s elapsed")
+    print(f"{'endpoint':>10} | {'requests':>8} | {'errors':>6} | {'req/s':>8} | "
+          + " | ".join(f"{f'p{p} ms':>9}" for p in PERCENTILES) + f" | {'max ms':>9}")
+    for name, row in summary.items():
+        print(f"{name:>10} | {row['requests']:>8,} | {row['errors']:>6,} | {row['throughput_rps']:>8.2f} | "
+              + " | ".join(f"{row[f'p{p}_ms']:>9.1f}" for p in PERCENTILES) + f" | {row['max_ms']:>9.1f}")
+
+
+async def benchmark(args, base_url, process):
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.concurrency + 8)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.request_timeout, limits=limits) as client:
+        await wait_until_ready(client, process)
+        generator = LoadGenerator(client, args)
+        start = time.perf_counter()
+        await generator.seed(args.seed_resumes, args.concurrency)
+        print(f"Seeded {len(generator.candidate_ids)} resumes in {time.perf_counter() - start:.1f}s")
+
+        elapsed = await generator.run(args.concurrency, args.duration)
+        summary = summarize(generator.results, elapsed)
+        print_summary(summary, elapsed)
+
+        stats = (await client.get("/parse-stats")).json()
+        print(f"\nparse stats: {json.dumps(stats)}")
+    return {"elapsed_seconds": round(elapsed, 2), "endpoints": summary, "parse_stats": stats, "settings": vars(args)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=16, help="requests kept in flight")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of timed load")
+    parser.add_argument("--mix", default="upload=1,search=4,insights=2,jobs=3")
+    parser.add_argument("--seed-resumes", type=int, default=50, help="resumes uploaded before the timed run")
+    parser.add_argument("--pdf-ratio", type=float, default=0.3)
+    parser.add_argument("--messy-ratio", type=float, default=0.2, help="share of resumes the pre-parser is unsure of")
+    parser.add_argument("--insights-refresh-ratio", type=float, default=0.3, help="insight requests bypassing the cache")
+    parser.add_argument("--llm-latency", default="lognormal:0.8:0.4", help="const:S, uniform:LO:HI, lognormal:MEDIAN:SIGMA or exp:MEAN")
+    parser.add_argument("--llm-errors", default="", help="e.g. quota=0.02,server=0.01,invalid_json=0.03,hang=0.005")
+    parser.add_argument("--llm-concurrency", type=int, default=8)
+    parser.add_argument("--llm-rpm", type=float, default=100000, help="scheduler requests-per-minute limit")
+    parser.add_argument("--llm-timeout", type=float, default=10.0)
+    parser.add_argument("--parse-mode", default="hybrid", choices=["hybrid", "llm", "offline"])
+    parser.add_argument("--storage", default="sqlite", choices=["sqlite", "memory"])
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="bench_load_") as workdir:
+        process, base_url = start_server(args, workdir)
+        try:
+            results = asyncio.run(benchmark(args, base_url, process))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
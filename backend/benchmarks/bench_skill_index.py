@@ -0,0 +1,95 @@
+"""
+Compare the inverted SkillIndex against the original full scan of `resumes`.
+
+Usage (from the backend directory):
+    python benchmarks/bench_skill_index.py
+    python benchmarks/bench_skill_index.py --sizes 10000 100000 --queries 50
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_index import SkillIndex
+from skills import SkillNormalizer
+
+SKILL_POOL = [
+    "JavaScript", "React", "Node.js", "Python", "MongoDB", "AWS", "R", "Machine Learning",
+    "SQL", "TensorFlow", "Statistics", "SEO", "SEM", "Social Media Marketing", "Content Strategy",
+    "Analytics", "Campaign Management", "Patient Care", "Medical Records", "Vital Signs",
+    "Care Planning", "Communication", "Financial Modeling", "Excel", "Data Analysis",
+    "Forecasting", "Budgeting", "PowerBI", "Recruitment", "Employee Relations", "HRIS",
+    "AutoCAD", "SolidWorks", "3D Modeling", "Prototyping", "Product Design", "Figma",
+    "Docker", "Kubernetes", "CI/CD", "Terraform", "Linux", "Copywriting", "Wireframing",
+]
+SKILL_POOL += [f"Skill {i}" for i in range(2000)]
+LEVELS = ["Entry", "Mid", "Senior"]
+
+
+def make_candidates(count, rng):
+    """Generate synthetic parsed resumes shaped like parse_resume_with_gemini output"""
+    resumes = {}
+    for i in range(count):
+        resumes[f"cand-{i}"] = {
+            "name": f"Candidate {i}",
+            "skills": rng.sample(SKILL_POOL, rng.randint(3, 12)),
+            "experience": str(rng.randint(0, 20)),
+            "education": "BSc",
+            "experience_level": rng.choice(LEVELS),
+        }
+    return resumes
+
+
+def scan_search(resumes, skills, experience_level):
+    """The original search_candidates implementation"""
+    return [
+        cid
+        for cid, details in resumes.items()
+        if any(skill in details["skills"] for skill in skills)
+        and details["experience_level"] == experience_level
+    ]
+
+
+def run(size, query_count, rng):
+    resumes = make_candidates(size, rng)
+    queries = [(rng.sample(SKILL_POOL, rng.randint(1, 4)), rng.choice(LEVELS)) for _ in range(query_count)]
+
+    start = time.perf_counter()
+    index = SkillIndex(SkillNormalizer())
+    for cid, details in resumes.items():
+        index.add(cid, details["skills"], details["experience_level"])
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scan_results = [scan_search(resumes, skills, level) for skills, level in queries]
+    scan_time = (time.perf_counter() - start) / query_count
+
+    start = time.perf_counter()
+    index_results = [index.search(skills, level) for skills, level in queries]
+    index_time = (time.perf_counter() - start) / query_count
+
+    assert scan_results == index_results, "index and scan disagree"
+    print(
+        f"{size:>9,} candidates | build {build_time * 1000:9.1f} ms | "
+        f"scan {scan_time * 1000:9.3f} ms/query | index {index_time * 1000:8.3f} ms/query | "
+        f"speedup {scan_time / index_time:7.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for size in args.sizes:
+        run(size, args.queries, rng)
+
+
+if __name__ == "__main__":
+    main()
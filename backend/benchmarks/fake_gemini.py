@@ -0,0 +1,166 @@
+"""
+Local stand-in for google.generativeai.GenerativeModel, for benchmarks that must not depend on
+the live Gemini API. Latency and errors are drawn from configurable distributions; parse
+prompts get JSON built from the resume text itself, insight prompts get markdown.
+"""
+import asyncio
+import json
+import random
+import re
+
+from synthetic_resumes import REAL_SKILLS
+
+RESUME_CONTENT_PATTERN = re.compile(r"Resume content:\s*(.*)", re.DOTALL)
+BATCH_SECTION_PATTERN = re.compile(r"=== Resume ID: (\d+) \([A-Z]+\) ===\n(.*?)(?=\n=== Resume ID: |\Z)", re.DOTALL)
+YEARS_PATTERN = re.compile(r"(\d{1,2})\+? years", re.IGNORECASE)
+DEGREE_PATTERN = re.compile(r"^.*\b(BSc|MSc|BA|MBA|BEng|PhD|BSN)\b.*$", re.MULTILINE)
+SKILL_PATTERNS = [
+    (skill, re.compile(rf"(?<![A-Za-z0-9]){re.escape(skill)}(?![A-Za-z0-9])", re.IGNORECASE)) for skill in REAL_SKILLS
+]
+
+# Exceptions with the messages the real SDK raises, so classify_llm_error sees the same classes
+ERROR_FACTORIES = {
+    "quota": lambda: Exception("429 Resource has been exhausted (e.g. check quota)."),
+    "server": lambda: Exception("500 An internal error has occurred. Please retry."),
+    "permission": lambda: Exception("403 Permission denied: API key not valid."),
+}
+
+
+class LatencyDistribution:
+    """
+    Seconds per call drawn from a distribution spec:
+    const:S, uniform:LOW:HIGH, lognormal:MEDIAN:SIGMA or exp:MEAN
+    """
+
+    def __init__(self, spec, rng):
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        self.rng = rng
+        if kind not in ("const", "uniform", "lognormal", "exp"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self):
+        if self.kind == "const":
+            return self.params[0]
+        if self.kind == "uniform":
+            return self.rng.uniform(*self.params)
+        if self.kind == "lognormal":
+            median, sigma = self.params
+            return median * self.rng.lognormvariate(0.0, sigma)
+        return self.rng.expovariate(1.0 / self.params[0])
+
+
+def parse_error_rates(spec):
+    """{error kind: probability} from "quota=0.02,server=0.01,invalid_json=0.05,hang=0.01" """
+    rates = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        kind, rate = item.split("=")
+        if kind not in ERROR_FACTORIES and kind not in ("invalid_json", "hang"):
+            raise ValueError(f"Unknown error kind: {kind}")
+        rates[kind] = float(rate)
+    return rates
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class FakeStream:
+    """Async iterator of response chunks, each after its share of the call's latency"""
+
+    def __init__(self, chunks, delays):
+        self._chunks = chunks
+        self._delays = delays
+
+    async def __aiter__(self):
+        for chunk, delay in zip(self._chunks, self._delays):
+            await asyncio.sleep(delay)
+            yield FakeResponse(chunk)
+
+
+def fake_resume_json(text):
+    """What a well-behaved model would extract from one synthetic resume"""
+    lines = [line.strip() for line in text.strip().splitlines() if line.strip()]
+    years = [int(match) for match in YEARS_PATTERN.findall(text)]
+    degree = DEGREE_PATTERN.search(text)
+    experience = max(years) if years else 1
+    return {
+        "name": lines[0] if lines else "Unknown",
+        "skills": [skill for skill, pattern in SKILL_PATTERNS if pattern.search(text)] or ["Communication"],
+        "experience": str(experience),
+        "education": degree.group(0).strip() if degree else "Not specified",
+        "experience_level": "Entry" if experience < 3 else "Mid" if experience < 7 else "Senior",
+    }
+
+
+def fake_insights(prompt):
+    skills = re.search(r"- Skills: (.*)", prompt)
+    skills = skills.group(1).strip() if skills else "their current skills"
+    sections = [
+        f"## Professional Strengths\n- Solid foundation in {skills}\n- Delivers results on cross-functional teams\n",
+        "## Areas for Improvement\n- Broaden exposure to system design\n- Build stakeholder communication skills\n",
+        "## Recommended Career Paths\n- Technical lead: grow ownership of larger projects\n- Specialist: deepen expertise in one domain\n",
+        "## Suggested Certifications & Courses\n- A cloud practitioner certification\n- An advanced course in their strongest skill\n",
+        "## Skills to Develop\n- Architecture\n- Mentoring\n- Data literacy\n",
+    ]
+    return "\n".join(sections)
+
+
+class FakeGenerativeModel:
+    """
+    Drop-in for GenerativeModel.generate_content_async. Each call sleeps for a sampled latency,
+    then fails with probability given by error_rates or answers the prompt:
+    - quota / server / permission: raise the SDK's error for that class
+    - invalid_json: answer with text that is not JSON
+    - hang: sleep for hang_seconds, long enough for the client's timeout to fire
+    """
+
+    def __init__(self, latency="lognormal:0.8:0.4", error_rates=None, hang_seconds=120.0, seed=0, stream_chunks=8):
+        self.rng = random.Random(seed)
+        self.latency = LatencyDistribution(latency, self.rng)
+        self.error_rates = error_rates or {}
+        self.hang_seconds = hang_seconds
+        self.stream_chunks = stream_chunks
+        self.calls = 0
+        self.errors = {}
+
+    def _draw_error(self):
+        roll = self.rng.random()
+        for kind, rate in self.error_rates.items():
+            if roll < rate:
+                self.errors[kind] = self.errors.get(kind, 0) + 1
+                return kind
+            roll -= rate
+        return None
+
+    def _answer(self, prompt):
+        if "Resume ID:" in prompt:
+            return json.dumps([
+                {"id": short_id, **fake_resume_json(text)} for short_id, text in BATCH_SECTION_PATTERN.findall(prompt)
+            ])
+        match = RESUME_CONTENT_PATTERN.search(prompt)
+        if match:
+            return json.dumps(fake_resume_json(match.group(1)))
+        return fake_insights(prompt)
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        self.calls += 1
+        latency = self.latency.sample()
+        error = self._draw_error()
+        if error == "hang":
+            await asyncio.sleep(self.hang_seconds)
+        if error in ERROR_FACTORIES:
+            await asyncio.sleep(latency * 0.1)
+            raise ERROR_FACTORIES[error]()
+        text = "Sorry, I can't help with that." if error == "invalid_json" else self._answer(prompt)
+        if not stream:
+            await asyncio.sleep(latency)
+            return FakeResponse(text)
+        # Time to first chunk is a third of the latency; the rest is spread over the chunks
+        size = max(1, len(text) // self.stream_chunks + 1)
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        await asyncio.sleep(latency / 3)
+        return FakeStream(chunks, [latency * 2 / 3 / len(chunks)] * len(chunks))
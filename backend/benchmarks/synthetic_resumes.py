@@ -0,0 +1,133 @@
+"""
+Synthetic resumes for benchmarks: plain-text resumes with the usual sections (or, for "messy"
+ones, without headings so the local pre-parser is unsure) and minimal text PDFs of them that
+PyPDF2 can extract.
+
+Usage (from the backend directory), to write sample files:
+    python benchmarks/synthetic_resumes.py --count 20 --out /tmp/resumes
+"""
+import argparse
+import os
+import random
+
+from bench_skill_index import LEVELS, SKILL_POOL
+
+# The pool without the generated "Skill N" padding
+REAL_SKILLS = [skill for skill in SKILL_POOL if not skill.startswith("Skill ")]
+
+FIRST_NAMES = ["Ava", "Liam", "Maya", "Noah", "Priya", "Omar", "Chen", "Sofia", "Diego", "Amara", "Yuki", "Lena"]
+LAST_NAMES = ["Patel", "Garcia", "Nguyen", "Okafor", "Smith", "Kowalski", "Haddad", "Silva", "Kim", "Moreau"]
+TITLES = ["Software Engineer", "Data Analyst", "Marketing Specialist", "Registered Nurse", "Financial Analyst",
+          "HR Generalist", "Product Designer", "DevOps Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Health", "Stark Analytics", "Wayne Finance"]
+DEGREES = ["BSc Computer Science", "MSc Data Science", "BA Marketing", "BSN Nursing", "MBA", "BEng Mechanical"]
+LEVEL_YEARS = {"Entry": (0, 2), "Mid": (3, 6), "Senior": (7, 15)}
+
+
+def make_resume_text(rng, index, messy=False):
+    """One synthetic resume; index (in the email address) keeps file contents unique"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = f"{name.split()[0].lower()}.{index}@example.com"
+    level = rng.choice(LEVELS)
+    years = rng.randint(*LEVEL_YEARS[level])
+    skills = rng.sample(REAL_SKILLS, rng.randint(4, 10))
+    title = rng.choice(TITLES)
+    start_year = 2024 - years
+    end = "Present"
+    roles = []
+    for company in rng.sample(COMPANIES, 2):
+        roles.append(
+            f"{title}, {company} - Jan {start_year} - {end}\n"
+            f"- Delivered projects using {', '.join(rng.sample(skills, 2))}\n"
+            f"- Worked with stakeholders to improve team processes"
+        )
+        end = f"Dec {start_year - 1}"
+        start_year -= rng.randint(1, 3)
+    degree = f"{rng.choice(DEGREES)}, State University, {2024 - years - rng.randint(0, 4)}"
+
+    if messy:
+        # No section headings: the pre-parser has to fall back to the gazetteer and guesses
+        return (
+            f"{name.lower()}\n{email}\n"
+            f"I have worked as a {title.lower()} and know {', '.join(skills).lower()}. "
+            f"Studied {degree}. {roles[0]}\n"
+        )
+    return "\n".join([
+        name,
+        f"{email} | +1 555 0100",
+        "",
+        "Summary",
+        f"{title} with {years} years of experience.",
+        "",
+        "Skills",
+        ", ".join(skills),
+        "",
+        "Experience",
+        "\n".join(roles),
+        "",
+        "Education",
+        degree,
+        "",
+    ])
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_resume_pdf(text, lines_per_page=50):
+    """A minimal PDF (Helvetica, one text object per page) holding text"""
+    lines = text.encode("latin-1", "replace").decode("latin-1").splitlines() or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in pages:
+        stream = "BT /F1 10 Tf 14 TL 50 790 Td\n" + "".join(f"({_pdf_escape(line)}) Tj T*\n" for line in page_lines) + "ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+
+def make_resume_file(rng, index, pdf_ratio=0.3, messy_ratio=0.2):
+    """(filename, content bytes, content type) for one synthetic upload"""
+    text = make_resume_text(rng, index, messy=rng.random() < messy_ratio)
+    if rng.random() < pdf_ratio:
+        return f"resume_{index}.pdf", make_resume_pdf(text), "application/pdf"
+    return f"resume_{index}.txt", text.encode("utf-8"), "text/plain"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--out", default="synthetic_resumes")
+    parser.add_argument("--pdf-ratio", type=float, default=0.3)
+    parser.add_argument("--messy-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    os.makedirs(args.out, exist_ok=True)
+    for i in range(args.count):
+        filename, content, _ = make_resume_file(rng, i, args.pdf_ratio, args.messy_ratio)
+        with open(os.path.join(args.out, filename), "wb") as f:
+            f.write(content)
+    print(f"Wrote {args.count} resumes to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import sys
+
+from matching import UNKNOWN_LEVEL, level_code
+
+# Display names for the experience level codes in matching.EXPERIENCE_LEVELS
+EXPERIENCE_LEVEL_NAMES = ["Entry", "Mid", "Senior"]
+
+# Fields with a compact encoding; anything else a parse returns is kept in CandidateRecord.extra
+COMPACT_FIELDS = ("name", "skills", "experience", "education", "experience_level")
+
+
+class CandidateRecord:
+    """
+    One parsed resume: level as an integer code, skills and experience as interned strings.
+    Skill filtering is served by the SkillIndex, so no skill IDs are kept here.
+    """
+
+    __slots__ = ("name", "education", "experience", "level", "skills", "extra")
+
+    def __init__(self, name, education, experience, level, skills, extra=None):
+        self.name = name
+        self.education = education
+        # Raw experience text, interned since values like "5 years" repeat across candidates
+        self.experience = experience
+        self.level = level
+        # The parse's own spellings, so get() returns them unchanged; interned since the same
+        # strings ("Python", "SQL") repeat across candidates
+        self.skills = skills
+        # Fields without a compact encoding (unknown keys, non-standard level labels), usually None
+        self.extra = extra
+
+
+class CandidateStore:
+    """
+    Compact in-memory store of parsed resumes. Records are kept as __slots__ objects, with the
+    experience level as an integer code and repeated strings interned, instead of one dict per
+    candidate; dicts are only built by get() when a record leaves through the API.
+    """
+
+    def __init__(self):
+        self._records = {}
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self._records
+
+    def add(self, candidate_id, parsed_data):
+        self._records[candidate_id] = self.encode(parsed_data)
+
+    def get(self, candidate_id):
+        """JSON view of a candidate, or None"""
+        record = self._records.get(candidate_id)
+        return self.decode(record) if record is not None else None
+
+    def encode(self, parsed_data):
+        extra = {key: value for key, value in parsed_data.items() if key not in COMPACT_FIELDS}
+        level_label = parsed_data.get("experience_level")
+        level = level_code(level_label)
+        if level == UNKNOWN_LEVEL or level_label != EXPERIENCE_LEVEL_NAMES[level]:
+            # Keep the label as given so the JSON view round-trips
+            extra["experience_level"] = level_label
+        skills = parsed_data.get("skills") or []
+        if isinstance(skills, str):
+            skills = [skills]
+        experience = parsed_data.get("experience")
+        return CandidateRecord(
+            name=parsed_data.get("name"),
+            education=parsed_data.get("education"),
+            experience=sys.intern(experience) if isinstance(experience, str) else experience,
+            level=level,
+            skills=tuple(sys.intern(skill) if isinstance(skill, str) else skill for skill in skills),
+            extra=extra or None,
+        )
+
+    def decode(self, record):
+        data = {
+            "name": record.name,
+            "skills": list(record.skills),
+            "experience": record.experience,
+            "education": record.education,
+            "experience_level": self._level_label(record),
+        }
+        if record.extra:
+            data.update(record.extra)
+        return data
+
+    def _level_label(self, record):
+        if record.extra and "experience_level" in record.extra:
+            return record.extra["experience_level"]
+        return EXPERIENCE_LEVEL_NAMES[record.level]
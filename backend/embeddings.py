@@ -0,0 +1,262 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+from retrieval import hashed_embedding, tokenize, top_k_indices
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, run a single worker
+    fcntl = None
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the this to was were will with "
+    "we you your i my me he she they their them who which that these those not but if into about over".split()
+)
+
+# Below this many vectors a query scans everything; above it the IVF index is used
+BRUTE_FORCE_LIMIT = 4096
+# Rows scored per matrix product when scanning, bounding temporary memory
+SCAN_CHUNK_ROWS = 65536
+
+# IVF training takes seconds at a few hundred thousand rows, so it runs on this thread (NumPy
+# releases the GIL for the matrix products) while queries keep using the old index or a scan
+_training_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ivf-train")
+
+
+def embed_texts(texts, dim=256):
+    """
+    Hashed bag-of-words embeddings (unigrams and bigrams, sublinear term frequency,
+    stopwords removed) as an L2-normalized float32 matrix, one row per text.
+    """
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = [token for token in tokenize(text) if token not in STOPWORDS]
+        bigrams = [f"{first} {second}" for first, second in zip(words, words[1:])]
+        matrix[row] = hashed_embedding(words + bigrams, dim)
+    return matrix
+
+
+class VectorStore:
+    """
+    Append-only float32 vectors in a memory-mapped file (`<name>.f32`) with their IDs in a
+    sidecar file (`<name>.ids`, one per line), searched through an IVF approximate index.
+    Appends take an exclusive file lock, so several workers can share one store; each
+    picks up the others' rows on refresh().
+    """
+
+    def __init__(self, directory, name, dim=256, nprobe=8):
+        self.dim = dim
+        self.nprobe = nprobe
+        os.makedirs(directory, exist_ok=True)
+        self.vectors_path = os.path.join(directory, f"{name}.f32")
+        self.ids_path = os.path.join(directory, f"{name}.ids")
+        self.lock_path = os.path.join(directory, f"{name}.lock")
+        for path in (self.vectors_path, self.ids_path):
+            open(path, "ab").close()
+
+        self._ids = []
+        # doc_id -> latest row; re-added IDs leave their old row behind
+        self._rows = {}
+        self._ids_offset = 0
+        self._matrix = None
+        self._index = None
+        # Future of a background IVFIndex.train, swapped in by _current_index() once done
+        self._training = None
+        self.refresh()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._rows
+
+    @contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def refresh(self):
+        """Load rows appended since the last refresh, including those written by other workers"""
+        with open(self.ids_path, "rb") as ids_file:
+            ids_file.seek(self._ids_offset)
+            data = ids_file.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        if not complete:
+            return
+        self._ids_offset += len(complete)
+        first_new = len(self._ids)
+        for doc_id in complete.decode("utf-8").splitlines():
+            self._rows[doc_id] = len(self._ids)
+            self._ids.append(doc_id)
+        self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(self._ids), self.dim))
+        if self._index is not None:
+            self._index.add(self._matrix, first_new, len(self._ids))
+
+    def missing(self, doc_ids):
+        """The IDs from doc_ids that have no vector yet"""
+        self.refresh()
+        return [doc_id for doc_id in doc_ids if doc_id not in self._rows]
+
+    def add(self, doc_ids, vectors, replace=False):
+        """Append vectors for doc_ids; existing IDs are skipped unless replace is True"""
+        with self._locked():
+            self.refresh()
+            keep = [i for i, doc_id in enumerate(doc_ids) if replace or doc_id not in self._rows]
+            if not keep:
+                return 0
+            rows = np.ascontiguousarray(vectors[keep], dtype=np.float32)
+            # Vectors go first so a reader never sees an ID without its row
+            with open(self.vectors_path, "r+b") as vectors_file:
+                vectors_file.seek(len(self._ids) * self.dim * 4)
+                vectors_file.write(rows.tobytes())
+            with open(self.ids_path, "ab") as ids_file:
+                ids_file.write("".join(f"{doc_ids[i]}\n" for i in keep).encode("utf-8"))
+            self.refresh()
+        return len(keep)
+
+    def vector(self, doc_id):
+        self.refresh()
+        row = self._rows.get(doc_id)
+        return None if row is None else np.array(self._matrix[row])
+
+    def row_indexes(self, doc_ids):
+        """Row of the latest vector for each of doc_ids, as an int64 array; -1 for IDs without a vector"""
+        self.refresh()
+        return np.fromiter((self._rows.get(doc_id, -1) for doc_id in doc_ids), dtype=np.int64, count=len(doc_ids))
+
+    def scores(self, rows, query):
+        """
+        Dot product of query with each of the given rows (from row_indexes), 0 for rows of -1.
+        Rows are scored straight from the memory map: a query over most of the store scans it in
+        contiguous slices, a smaller one gathers its rows a slice at a time.
+        """
+        self.refresh()
+        query = np.asarray(query, dtype=np.float32)
+        result = np.zeros(len(rows), dtype=np.float32)
+        found = np.flatnonzero(rows >= 0)
+        if not len(found):
+            return result
+        if 2 * len(found) >= len(self._ids):
+            scanned = np.empty(len(self._ids), dtype=np.float32)
+            for start in range(0, len(self._ids), SCAN_CHUNK_ROWS):
+                scanned[start:start + SCAN_CHUNK_ROWS] = self._matrix[start:start + SCAN_CHUNK_ROWS] @ query
+            result[found] = scanned[rows[found]]
+        else:
+            for start in range(0, len(found), SCAN_CHUNK_ROWS):
+                positions = found[start:start + SCAN_CHUNK_ROWS]
+                result[positions] = self._matrix[rows[positions]] @ query
+        return result
+
+    def _current_index(self):
+        """
+        The IVF index to query, or None to scan every row. A missing or stale index is retrained
+        in the background; until that finishes the previous index (or a scan) answers queries.
+        """
+        if self._training is not None and self._training.done():
+            training, self._training = self._training, None
+            index = training.result()
+            # Rows appended while training ran
+            index.add(self._matrix, index.trained_rows, len(self._ids))
+            self._index = index
+        if (self._index is None or self._index.stale(len(self._ids))) and self._training is None:
+            self._training = _training_executor.submit(IVFIndex.train, self._matrix, len(self._ids))
+        return self._index
+
+    def search(self, query, limit=10, exclude=()):
+        """[(doc_id, cosine similarity)] for the nearest vectors to query, best first"""
+        self.refresh()
+        if not self._rows:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        index = self._current_index() if len(self._ids) > BRUTE_FORCE_LIMIT else None
+        if index is None:
+            # Full scan over contiguous slices, which avoids copying rows out by index
+            candidates = np.arange(len(self._ids))
+            scores = np.empty(len(candidates), dtype=np.float32)
+            for start in range(0, len(candidates), SCAN_CHUNK_ROWS):
+                scores[start:start + SCAN_CHUNK_ROWS] = self._matrix[start:start + SCAN_CHUNK_ROWS] @ query
+        else:
+            candidates = index.candidates(query, self.nprobe)
+            scores = np.empty(len(candidates), dtype=np.float32)
+            for start in range(0, len(candidates), SCAN_CHUNK_ROWS):
+                rows = candidates[start:start + SCAN_CHUNK_ROWS]
+                scores[start:start + len(rows)] = self._matrix[rows] @ query
+
+        # Only the best rows need sorting: enough to fill limit after skipping every
+        # superseded or excluded row
+        k = min(len(scores), limit + len(exclude) + len(self._ids) - len(self._rows))
+        results = []
+        for i in top_k_indices(scores, k):
+            row = int(candidates[i])
+            doc_id = self._ids[row]
+            # Skip rows superseded by a later vector for the same ID
+            if self._rows[doc_id] != row or doc_id in exclude:
+                continue
+            results.append((doc_id, float(scores[i])))
+            if len(results) >= limit:
+                break
+        return results
+
+
+class IVFIndex:
+    """Inverted-file index: rows grouped under their nearest k-means centroid, probed per query"""
+
+    def __init__(self, centroids, lists, trained_rows):
+        self.centroids = centroids
+        self.lists = lists
+        self.trained_rows = trained_rows
+
+    @classmethod
+    def train(cls, matrix, count, iterations=10, seed=0):
+        nlist = max(1, int(np.sqrt(count)))
+        rng = np.random.default_rng(seed)
+        sample = np.array(matrix[np.sort(rng.choice(count, size=min(count, nlist * 64), replace=False))])
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)]
+        # Spherical k-means: vectors are normalized, so nearest means highest dot product
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[assignment == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    centroids[c] = centroid / norm if norm > 0 else centroid
+        index = cls(centroids, [[] for _ in range(nlist)], count)
+        index.add(matrix, 0, count)
+        return index
+
+    def stale(self, count):
+        # Retrain once the data has doubled since the centroids were fitted
+        return count > 2 * self.trained_rows
+
+    def add(self, matrix, start, stop):
+        for chunk_start in range(start, stop, SCAN_CHUNK_ROWS):
+            chunk_stop = min(stop, chunk_start + SCAN_CHUNK_ROWS)
+            assignment = np.argmax(np.asarray(matrix[chunk_start:chunk_stop]) @ self.centroids.T, axis=1)
+            for offset, c in enumerate(assignment):
+                self.lists[c].append(chunk_start + offset)
+
+    def candidates(self, query, nprobe):
+        probes = np.argsort(-(self.centroids @ query))[:nprobe]
+        return np.fromiter((row for c in probes for row in self.lists[c]), dtype=np.int64)
+
+
+def create_vector_stores(dim=None):
+    """Candidate and job VectorStores under EMBEDDINGS_DIR"""
+    directory = os.getenv("EMBEDDINGS_DIR", "data/embeddings")
+    dim = dim or int(os.getenv("EMBEDDING_DIM", "256"))
+    nprobe = int(os.getenv("EMBEDDING_NPROBE", "8"))
+    return (
+        VectorStore(directory, "candidates", dim=dim, nprobe=nprobe),
+        VectorStore(directory, "jobs", dim=dim, nprobe=nprobe),
+    )
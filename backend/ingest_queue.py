@@ -0,0 +1,206 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+
+STATUSES = ("queued", "processing", "done", "failed")
+
+
+class IngestQueue:
+    """
+    SQLite-backed queue of uploaded resume files, grouped into batches and persisted across
+    restarts. Several server processes may share one queue: every unfinished item is leased to
+    the process that queued or claimed it, which renews the lease while it runs, and other
+    processes take over only items whose lease has expired.
+    """
+
+    def __init__(self, path, lease_seconds=60.0):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS ingest_batches (
+                batch_id TEXT PRIMARY KEY,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS ingest_items (
+                item_id TEXT PRIMARY KEY,
+                batch_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                filename TEXT NOT NULL,
+                path TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                owner TEXT,
+                lease_expires REAL
+            );
+            CREATE INDEX IF NOT EXISTS ingest_items_batch ON ingest_items (batch_id, seq);
+            CREATE INDEX IF NOT EXISTS ingest_items_status ON ingest_items (status);
+            CREATE INDEX IF NOT EXISTS ingest_items_owner ON ingest_items (owner, status);
+            """
+        )
+        self._conn.commit()
+        self._pending = asyncio.Queue()
+
+    def create_batch(self, files):
+        """Persist a batch of (item_id, filename, path) tuples and queue them; returns the batch ID"""
+        batch_id = str(uuid.uuid4())
+        now = time.time()
+        self._conn.execute("INSERT INTO ingest_batches (batch_id, created_at) VALUES (?, ?)", (batch_id, now))
+        self._conn.executemany(
+            "INSERT INTO ingest_items (item_id, batch_id, seq, filename, path, status, updated_at, owner, lease_expires) "
+            "VALUES (?, ?, ?, ?, ?, 'queued', ?, ?, ?)",
+            [(item_id, batch_id, seq, filename, path, now, self.owner, now + self.lease_seconds)
+             for seq, (item_id, filename, path) in enumerate(files)],
+        )
+        self._conn.commit()
+        for item_id, _, _ in files:
+            self._pending.put_nowait(item_id)
+        return batch_id
+
+    def recover(self):
+        """
+        Take over items whose owner stopped renewing its lease, such as those left by a previous
+        run, and queue them here; returns how many were requeued
+        """
+        now = time.time()
+        rows = self._conn.execute(
+            "SELECT item_id FROM ingest_items WHERE status IN ('queued', 'processing') "
+            "AND (lease_expires IS NULL OR lease_expires < ?) ORDER BY updated_at, seq",
+            (now,),
+        ).fetchall()
+        recovered = 0
+        for row in rows:
+            # Conditional on the lease still being expired, so only one process takes each item
+            cursor = self._conn.execute(
+                "UPDATE ingest_items SET status = 'queued', owner = ?, lease_expires = ?, updated_at = ? "
+                "WHERE item_id = ? AND status IN ('queued', 'processing') "
+                "AND (lease_expires IS NULL OR lease_expires < ?)",
+                (self.owner, now + self.lease_seconds, now, row["item_id"], now),
+            )
+            if cursor.rowcount:
+                self._pending.put_nowait(row["item_id"])
+                recovered += 1
+        self._conn.commit()
+        return recovered
+
+    def renew_leases(self):
+        """Extend the leases of the unfinished items this process owns; returns how many"""
+        cursor = self._conn.execute(
+            "UPDATE ingest_items SET lease_expires = ? WHERE owner = ? AND status IN ('queued', 'processing')",
+            (time.time() + self.lease_seconds, self.owner),
+        )
+        self._conn.commit()
+        return cursor.rowcount
+
+    def requeue_failed(self, batch_id):
+        """Queue a batch's failed items again; returns how many were requeued"""
+        rows = self._conn.execute(
+            "SELECT item_id FROM ingest_items WHERE batch_id = ? AND status = 'failed' ORDER BY seq", (batch_id,)
+        ).fetchall()
+        now = time.time()
+        requeued = 0
+        for row in rows:
+            cursor = self._conn.execute(
+                "UPDATE ingest_items SET status = 'queued', error = NULL, owner = ?, lease_expires = ?, updated_at = ? "
+                "WHERE item_id = ? AND status = 'failed'",
+                (self.owner, now + self.lease_seconds, now, row["item_id"]),
+            )
+            if cursor.rowcount:
+                self._pending.put_nowait(row["item_id"])
+                requeued += 1
+        self._conn.commit()
+        return requeued
+
+    def _claim(self, item_id):
+        """Mark an item as processing by this process and return it, or None if it is no longer queued"""
+        now = time.time()
+        cursor = self._conn.execute(
+            "UPDATE ingest_items SET status = 'processing', owner = ?, lease_expires = ?, updated_at = ? "
+            "WHERE item_id = ? AND status = 'queued'",
+            (self.owner, now + self.lease_seconds, now, item_id),
+        )
+        self._conn.commit()
+        if not cursor.rowcount:
+            return None
+        row = self._conn.execute("SELECT * FROM ingest_items WHERE item_id = ?", (item_id,)).fetchone()
+        return dict(row)
+
+    async def get(self):
+        """Wait for the next queued item, mark it as processing and return it as a dict"""
+        while True:
+            item = self._claim(await self._pending.get())
+            if item is not None:
+                return item
+
+    async def get_many(self, max_items):
+        """Wait for at least one queued item, then take up to max_items without waiting further"""
+        items = [await self.get()]
+        while len(items) < max_items and not self._pending.empty():
+            item = self._claim(self._pending.get_nowait())
+            if item is not None:
+                items.append(item)
+        return items
+
+    def complete(self, item_id, result):
+        self._set_status(item_id, "done", result=json.dumps(result))
+
+    def fail(self, item_id, error):
+        self._set_status(item_id, "failed", error=error)
+
+    def _set_status(self, item_id, status, result=None, error=None):
+        self._conn.execute(
+            "UPDATE ingest_items SET status = ?, result = ?, error = ?, updated_at = ? WHERE item_id = ?",
+            (status, result, error, time.time(), item_id),
+        )
+        self._conn.commit()
+
+    def batch_status(self, batch_id):
+        """Progress counts and per-file results for a batch, or None if it does not exist"""
+        batch = self._conn.execute(
+            "SELECT created_at FROM ingest_batches WHERE batch_id = ?", (batch_id,)
+        ).fetchone()
+        if batch is None:
+            return None
+        rows = self._conn.execute(
+            "SELECT item_id, filename, status, result, error FROM ingest_items WHERE batch_id = ? ORDER BY seq",
+            (batch_id,),
+        ).fetchall()
+        counts = dict.fromkeys(STATUSES, 0)
+        items = []
+        for row in rows:
+            counts[row["status"]] += 1
+            items.append({
+                "candidate_id": row["item_id"],
+                "filename": row["filename"],
+                "status": row["status"],
+                "result": json.loads(row["result"]) if row["result"] else None,
+                "error": row["error"],
+            })
+        return {
+            "batch_id": batch_id,
+            "created_at": batch["created_at"],
+            "total": len(rows),
+            "counts": counts,
+            "complete": counts["queued"] == 0 and counts["processing"] == 0,
+            "items": items,
+        }
+
+
+def create_ingest_queue():
+    """Build an IngestQueue configured from environment variables"""
+    return IngestQueue(
+        os.getenv("INGEST_QUEUE_PATH", "data/ingest_queue.db"),
+        lease_seconds=float(os.getenv("INGEST_LEASE_SECONDS", "60")),
+    )
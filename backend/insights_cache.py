@@ -0,0 +1,67 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+
+
+def profile_hash(profile):
+    """Stable hash of a parsed candidate profile"""
+    encoded = json.dumps(profile, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class InsightsCache:
+    """In-memory TTL + LRU cache of generated career insights, keyed by profile hash"""
+
+    def __init__(self, ttl=3600.0, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # profile hash -> (insights, expires_at)
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, profile):
+        """Return cached insights for the profile, or None if missing or expired"""
+        key = profile_hash(profile)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, profile, insights):
+        key = profile_hash(profile)
+        self._entries[key] = (insights, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, profile):
+        """Drop cached insights for a profile, e.g. when the candidate's data changes"""
+        self._entries.pop(profile_hash(profile), None)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def create_insights_cache():
+    """Build an InsightsCache configured from environment variables"""
+    ttl = float(os.getenv("INSIGHTS_CACHE_TTL_SECONDS", "3600"))
+    max_entries = int(os.getenv("INSIGHTS_CACHE_MAX_ENTRIES", "1000"))
+    return InsightsCache(ttl=ttl, max_entries=max_entries)
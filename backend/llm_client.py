@@ -0,0 +1,186 @@
+import asyncio
+import os
+import time
+
+from llm_scheduler import INTERACTIVE, LLMScheduler
+from metrics import registry
+from singleflight import SingleFlight, prompt_key
+
+# Rough token estimate (about 4 characters per token) used when the SDK reports no usage
+CHARS_PER_TOKEN = 4
+
+LLM_REQUESTS = registry.counter("llm_requests_total", "Gemini calls by call type and outcome", ["call", "outcome"])
+LLM_LATENCY = registry.histogram("llm_request_duration_seconds", "Gemini call latency, until the last chunk for streams", ["call"])
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "Prompt and completion tokens, estimated from characters when the SDK reports no usage", ["type"]
+)
+LLM_ERRORS = registry.counter("llm_errors_total", "Failed Gemini calls by error class", ["error"])
+LLM_IN_FLIGHT = registry.gauge("llm_requests_in_flight", "Gemini calls currently running")
+
+
+def classify_llm_error(e):
+    """Short error class for a failed Gemini call: timeout, quota, permission, filter, not_found or other"""
+    message = str(e).lower()
+    if isinstance(e, asyncio.TimeoutError):
+        return "timeout"
+    if "quota" in message or "429" in message or "resource has been exhausted" in message or "rate limit" in message:
+        return "quota"
+    if "permission" in message or "access" in message:
+        return "permission"
+    if "content" in message and "filtered" in message:
+        return "filter"
+    if "not found" in message or "404" in message:
+        return "not_found"
+    return "other"
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN
+
+
+def record_usage(prompt, response=None, completion_text=""):
+    """Count prompt and completion tokens; returns the completion token count"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        LLM_TOKENS.inc(usage.prompt_token_count, type="prompt")
+        LLM_TOKENS.inc(usage.candidates_token_count, type="completion")
+        return usage.candidates_token_count
+    completion_tokens = estimate_tokens(completion_text)
+    LLM_TOKENS.inc(estimate_tokens(prompt), type="prompt")
+    LLM_TOKENS.inc(completion_tokens, type="completion")
+    return completion_tokens
+
+
+def _response_text(response):
+    # .text raises for blocked or empty responses; callers see that error when they read it
+    try:
+        return response.text
+    except Exception:
+        return ""
+
+
+class LLMClient:
+    """
+    Async wrapper around a Gemini model with per-call timeouts. Calls are admitted by an
+    LLMScheduler (rate limits, priority lanes, quota backoff), and concurrent identical
+    generate() calls share one request.
+    """
+
+    def __init__(self, model, scheduler=None, timeout=60.0, quota_retries=2):
+        self.model = model
+        self.scheduler = scheduler or LLMScheduler()
+        self.timeout = timeout
+        self.quota_retries = quota_retries
+        self.in_flight = 0
+        self._flight = SingleFlight("llm_generate")
+
+    def _started(self):
+        self.in_flight += 1
+        LLM_IN_FLIGHT.inc()
+        return time.perf_counter()
+
+    def _finished(self, call, start, error=None, cancelled=False):
+        self.in_flight -= 1
+        LLM_IN_FLIGHT.dec()
+        LLM_LATENCY.observe(time.perf_counter() - start, call=call)
+        if cancelled:
+            # Neither a success nor a failure of the API, so the scheduler's backoff is left alone
+            LLM_REQUESTS.inc(call=call, outcome="cancelled")
+            return
+        LLM_REQUESTS.inc(call=call, outcome="error" if error is not None else "ok")
+        if error is None:
+            self.scheduler.succeeded()
+        else:
+            error_class = classify_llm_error(error)
+            LLM_ERRORS.inc(error=error_class)
+            if error_class == "quota":
+                self.scheduler.throttled()
+
+    async def generate(self, prompt, generation_config=None, timeout=None, priority=INTERACTIVE):
+        """
+        Run generate_content_async once the scheduler admits it, raising TimeoutError when it
+        takes too long. A caller asking for the same prompt and config as a call already in
+        flight awaits that call instead of starting another.
+        """
+        return await self._flight.do(
+            prompt_key(prompt, repr(generation_config)),
+            lambda: self._generate(prompt, generation_config, timeout, priority),
+        )
+
+    async def _generate(self, prompt, generation_config, timeout, priority):
+        for attempt in range(self.quota_retries + 1):
+            try:
+                return await self._generate_once(prompt, generation_config, timeout, priority)
+            except Exception as e:
+                # Quota errors are retried once the scheduler's backoff lets calls through again
+                if attempt == self.quota_retries or classify_llm_error(e) != "quota":
+                    raise
+
+    async def _generate_once(self, prompt, generation_config, timeout, priority):
+        async with self.scheduler.slot(priority, estimate_tokens(prompt)):
+            start = self._started()
+            error = None
+            cancelled = False
+            try:
+                response = await asyncio.wait_for(
+                    self.model.generate_content_async(prompt, generation_config=generation_config),
+                    timeout=timeout or self.timeout,
+                )
+                self.scheduler.charge(record_usage(prompt, response, _response_text(response)))
+                return response
+            except Exception as e:
+                error = e
+                raise
+            except BaseException:
+                cancelled = True
+                raise
+            finally:
+                self._finished("generate", start, error, cancelled)
+
+    async def stream(self, prompt, generation_config=None, timeout=None, priority=INTERACTIVE):
+        """Yield response text chunks as the model produces them; the timeout applies to each chunk"""
+        timeout = timeout or self.timeout
+        async with self.scheduler.slot(priority, estimate_tokens(prompt)):
+            start = self._started()
+            error = None
+            cancelled = False
+            completion = []
+            try:
+                response = await asyncio.wait_for(
+                    self.model.generate_content_async(prompt, generation_config=generation_config, stream=True),
+                    timeout=timeout,
+                )
+                chunks = response.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                    except StopAsyncIteration:
+                        break
+                    if chunk.text:
+                        completion.append(chunk.text)
+                        yield chunk.text
+            except Exception as e:
+                error = e
+                raise
+            except BaseException:
+                # GeneratorExit when the reader stops early (its client disconnected), or CancelledError
+                cancelled = True
+                raise
+            finally:
+                # Chunks already streamed were generated, and billed, however the stream ended
+                if error is None or completion:
+                    self.scheduler.charge(record_usage(prompt, completion_text="".join(completion)))
+                self._finished("stream", start, error, cancelled)
+
+
+def create_llm_client(model):
+    """Build an LLMClient and its scheduler configured from environment variables"""
+    scheduler = LLMScheduler(
+        max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+        requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60")),
+        tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", "1000000")),
+        interactive_reserve=float(os.getenv("LLM_INTERACTIVE_RESERVE", "0.2")),
+    )
+    timeout = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    quota_retries = int(os.getenv("LLM_QUOTA_RETRIES", "2"))
+    return LLMClient(model, scheduler=scheduler, timeout=timeout, quota_retries=quota_retries)
@@ -0,0 +1,171 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+
+from metrics import registry
+
+# Priority lanes, lower runs first: interactive requests (career insights) are admitted ahead
+# of background work (resume parsing) whenever both are waiting
+INTERACTIVE = 0
+BACKGROUND = 1
+LANE_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+LLM_QUEUE_DEPTH = registry.gauge("llm_queue_depth", "Gemini calls waiting for a scheduler slot", ["lane"])
+LLM_QUEUE_WAIT = registry.histogram("llm_queue_wait_seconds", "Time Gemini calls spent waiting for a scheduler slot", ["lane"])
+LLM_THROTTLED = registry.counter("llm_throttled_total", "Gemini calls rejected for quota or rate limits")
+LLM_RATE_LIMIT = registry.gauge("llm_requests_per_minute_limit", "Current adaptive requests-per-minute limit")
+
+
+class TokenBucket:
+    """
+    Continuously refilled bucket holding up to `capacity` tokens, refilled at `rate` per minute.
+    The level may go negative when usage is debited after the fact, which delays later takers.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.level = float(self.capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate / 60)
+        self._updated = now
+
+    def wait_time(self, amount, reserve=0.0):
+        """Seconds until `amount` can be taken while leaving `reserve` tokens behind; 0 if now"""
+        self._refill()
+        # Requests larger than the bucket go through once it is full
+        needed = min(amount, self.capacity - reserve) + reserve
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) * 60 / self.rate
+
+    def take(self, amount):
+        self._refill()
+        self.level -= amount
+
+    def clamp(self, max_level):
+        self._refill()
+        self.level = min(self.level, max_level)
+
+
+class LLMScheduler:
+    """
+    Admits Gemini calls under a concurrency limit and requests-per-minute and tokens-per-minute
+    token buckets, interactive lane first. Background calls leave `interactive_reserve` of each
+    bucket and one concurrency slot free, so an insight request arriving during a bulk ingest
+    does not queue behind it. Quota errors pause admission with exponential backoff and halve
+    the request rate, which then recovers gradually as calls succeed.
+    """
+
+    def __init__(self, max_concurrency=4, requests_per_minute=60, tokens_per_minute=1_000_000,
+                 interactive_reserve=0.2, max_backoff=60.0):
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.interactive_reserve = interactive_reserve
+        self.max_backoff = max_backoff
+        self.running = 0
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._backoff = 0.0
+        self._timer = None
+        LLM_RATE_LIMIT.set(requests_per_minute)
+
+    def queued(self, lane=None):
+        return sum(1 for priority, _, _, future in self._waiting
+                   if not future.done() and (lane is None or priority == lane))
+
+    @asynccontextmanager
+    async def slot(self, priority=INTERACTIVE, tokens=0):
+        """Wait for admission in the given lane, charging `tokens` estimated prompt tokens"""
+        lane = LANE_NAMES[priority]
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._sequence), tokens, future))
+        start = time.perf_counter()
+        LLM_QUEUE_DEPTH.inc(lane=lane)
+        try:
+            self._dispatch()
+            await future
+        except asyncio.CancelledError:
+            # Admitted just as the waiter was cancelled: hand the slot back
+            if future.done() and not future.cancelled():
+                self._release()
+            else:
+                future.cancel()
+            raise
+        finally:
+            LLM_QUEUE_DEPTH.dec(lane=lane)
+        LLM_QUEUE_WAIT.observe(time.perf_counter() - start, lane=lane)
+        try:
+            yield self
+        finally:
+            self._release()
+
+    def charge(self, tokens):
+        """Debit tokens used beyond the admission estimate, such as the completion"""
+        if tokens > 0:
+            self.tokens.take(tokens)
+
+    def succeeded(self):
+        self._backoff = 0.0
+        if self.requests.rate < self.requests_per_minute:
+            # Additive recovery towards the configured rate
+            self.requests.rate = min(self.requests_per_minute, self.requests.rate + self.requests_per_minute / 20)
+            LLM_RATE_LIMIT.set(self.requests.rate)
+
+    def throttled(self):
+        """Record a quota / 429 response: back off exponentially and halve the request rate"""
+        LLM_THROTTLED.inc()
+        self._backoff = min(self.max_backoff, max(1.0, self._backoff * 2))
+        self._paused_until = max(self._paused_until, time.monotonic() + self._backoff)
+        self.requests.rate = max(1.0, self.requests.rate / 2)
+        # Drop any saved-up burst beyond the interactive reserve, so background calls resume
+        # at the reduced rate while insight requests can still start right after the pause
+        self.requests.clamp(self.interactive_reserve * self.requests.capacity)
+        LLM_RATE_LIMIT.set(self.requests.rate)
+        return self._backoff
+
+    def _release(self):
+        self.running -= 1
+        self._dispatch()
+
+    def _wait_time(self, priority, tokens):
+        background = priority != INTERACTIVE
+        if self.running >= self.max_concurrency - (1 if background and self.max_concurrency > 1 else 0):
+            return None
+        reserve = self.interactive_reserve if background else 0.0
+        return max(
+            self._paused_until - time.monotonic(),
+            self.requests.wait_time(1, reserve * self.requests.capacity),
+            self.tokens.wait_time(tokens, reserve * self.tokens.capacity),
+            0.0,
+        )
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiting:
+            priority, _, tokens, future = self._waiting[0]
+            if future.done():
+                heapq.heappop(self._waiting)
+                continue
+            wait = self._wait_time(priority, tokens)
+            if wait is None:
+                # No free slot; a finishing call dispatches again
+                return
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._waiting)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self.running += 1
+            future.set_result(None)
@@ -1,21 +1,54 @@
-from fastapi import FastAPI, UploadFile, Form, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict
+from fastapi import FastAPI, UploadFile, Form, HTTPException, Request, Query
+from fastapi.responses import StreamingResponse, JSONResponse, Response
+from pydantic import BaseModel, Field
+from typing import List, Dict, Optional
 import uvicorn
 import uuid
+import asyncio
 import os
 import time
 from pathlib import Path
 import google.generativeai as genai
-import PyPDF2
-import io
+import zipfile
 from dotenv import load_dotenv
 import json
+import inspect
+from llm_client import create_llm_client, classify_llm_error, CHARS_PER_TOKEN
+from llm_scheduler import BACKGROUND
+from singleflight import SingleFlight, prompt_key
+from metrics import registry
+from responses import FastJSONResponse, SelectiveGZipMiddleware, parse_fields, project, truncate_text, with_keepalive
+from skill_index import SkillIndex
+from skills import SkillNormalizer, DEFAULT_ALIASES
+from retrieval import HybridSearchEngine
+from embeddings import create_vector_stores, embed_texts
+from parse_cache import create_parse_cache, make_cache_key
+from insights_cache import create_insights_cache
+from ingest_queue import create_ingest_queue
+from pdf_extract import create_pdf_extractor, PDFExtractionError
+from storage import create_storage
+from matching import MatchMatrix
+from preparse import SkillGazetteer, preparse_resume
+from resume_schema import ResumeParseError, ParseMetrics, ParsedResume, RESUME_JSON_SCHEMA, extract_json, validate_resume
+from uploads import save_upload, file_sha256, safe_filename, iter_zip_resumes, extract_zip_member, UploadTooLarge, EmptyUpload
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI()
+# orjson-encoded responses, gzipped above GZIP_MIN_BYTES (server-sent event streams excepted)
+app = FastAPI(default_response_class=FastJSONResponse)
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=int(os.getenv("GZIP_MIN_BYTES", "1000")))
+
+HTTP_REQUESTS = registry.counter("http_requests_total", "HTTP requests by route and status", ["method", "path", "status"])
+HTTP_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Time until the response starts, by route", ["method", "path"]
+)
+HTTP_IN_FLIGHT = registry.gauge("http_requests_in_flight", "HTTP requests currently being handled")
+RESUME_STAGE_SECONDS = registry.histogram(
+    "resume_stage_duration_seconds",
+    "Time spent per resume processing stage (disk_write, extract, preparse, llm, json_parse, store)",
+    ["stage"],
+)
 
 # Configure Gemini API using environment variables for security
 # Important: Never hardcode API keys in your code
@@ -26,12 +59,70 @@ if not GEMINI_API_KEY:
 
 genai.configure(api_key=GEMINI_API_KEY)
 # Update the model name from gemini-pro to gemini-1.5-flash
-model = genai.GenerativeModel('gemini-1.5-flash')
-print(f"Initialized Gemini model: gemini-1.5-flash")
+GEMINI_MODEL_NAME = "gemini-1.5-flash"
+model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+print(f"Initialized Gemini model: {GEMINI_MODEL_NAME}")
+
+# Newer google-generativeai releases can constrain output to JSON; older ones rely on the prompt's schema
+JSON_MODE_SUPPORTED = "response_mime_type" in inspect.signature(genai.types.GenerationConfig).parameters
+
+# Async client so slow LLM calls don't block the event loop; its scheduler admits career
+# insights ahead of resume parsing and keeps calls within the Gemini rate limits
+llm_client = create_llm_client(model)
+
+# Canonical skill IDs shared by storage, the skill index and match matrix; seeded on startup
+skill_normalizer = SkillNormalizer()
+
+# Persistent storage shared by all workers (SQLite in WAL mode by default)
+storage = create_storage(skill_normalizer)
+
+# Memory-mapped embeddings of resumes and job postings, shared between workers on disk
+candidate_vectors, job_vectors = create_vector_stores()
+
+# Known job skills recognized by the local resume pre-parser; seeded on startup
+skill_gazetteer = SkillGazetteer(skill_normalizer)
 
-# In-memory storage (replace with database in production)
-resumes = {}
-jobs = {}
+# In-memory search indexes, kept in sync with storage by sync_indexes()
+skill_index = SkillIndex(skill_normalizer)
+indexed_seq = 0
+# Last skill alias from storage applied to skill_normalizer, kept in sync by sync_aliases()
+alias_seq = 0
+# Ranked BM25 + vector retrieval over resume text; the vectors are the resume embeddings
+search_engine = HybridSearchEngine(candidate_vectors, lambda text: embed_texts([text], candidate_vectors.dim)[0])
+# Candidate-by-job match scores, extended by a row per resume and a column per job
+match_matrix = MatchMatrix(skill_normalizer)
+# Score at which a candidate counts as a match for a job on the dashboard
+MATCH_THRESHOLD = float(os.getenv("MATCH_THRESHOLD", "0.6"))
+# Concurrent identical parses (with their retries) and insights streams, keyed by prompt hash,
+# share one Gemini call; single insights calls are already shared inside llm_client
+parse_flight = SingleFlight("resume_parse")
+insights_stream_flight = SingleFlight("insights_stream")
+
+# Persistent cache of parse results keyed by resume content, so re-uploads skip Gemini
+parse_cache = create_parse_cache()
+# Generated career insights keyed by profile hash; a changed profile misses automatically
+insights_cache = create_insights_cache()
+
+# Persistent queue and worker pool for batch resume uploads
+ingest_queue = create_ingest_queue()
+ingest_workers = []
+# Streamed uploads that keep processing after their client disconnects
+background_tasks = set()
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "4"))
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "10000"))
+RESUME_EXTENSIONS = (".pdf", ".txt")
+
+# Upload size limits; requests are rejected from Content-Length before the body is read
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "10")) * 1024 * 1024
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv("MAX_BATCH_UPLOAD_MB", "500")) * 1024 * 1024
+# Total size of a batch's resumes once its archives are unpacked
+MAX_BATCH_INFLATED_BYTES = int(os.getenv("MAX_BATCH_INFLATED_MB", "2048")) * 1024 * 1024
+UPLOAD_SIZE_LIMITS = {
+    # Allow for multipart framing around the file
+    "/upload-resume/": MAX_UPLOAD_BYTES + 64 * 1024,
+    "/upload-resume/stream": MAX_UPLOAD_BYTES + 64 * 1024,
+    "/upload-resumes/batch": MAX_BATCH_UPLOAD_BYTES,
+}
 
 # Models
 class JobPosting(BaseModel):
@@ -40,9 +131,26 @@ class JobPosting(BaseModel):
     description: str
     experience_level: str
 
+class SkillAlias(BaseModel):
+    alias: str
+    canonical: str
+
+class SimilarCandidatesQuery(BaseModel):
+    description: str
+    limit: int = Field(10, ge=1, le=100)
+    fields: Optional[List[str]] = None
+
 class CandidateSearchQuery(BaseModel):
     skills: List[str]
     experience_level: str
+    query: Optional[str] = None  # Free-text query used for ranking; defaults to the skills
+    limit: int = Field(20, ge=1, le=100)
+    offset: int = Field(0, ge=0)
+    fields: Optional[List[str]] = None  # Candidate detail fields to return; all by default
+
+# Fields a `fields=` projection can select on candidate details and job postings
+CANDIDATE_FIELDS = list(ParsedResume.model_fields)
+JOB_FIELDS = list(JobPosting.model_fields)
 
 # Sample job postings from different fields to populate the system
 sample_jobs = [
@@ -119,9 +227,14 @@ sample_jobs.extend([
 ])
 
 # Helper functions
-def parse_resume_with_gemini(file_content, file_type):
-    """Extract structured information from resume using Gemini API"""
-    prompt = f"""
+# Characters of resume text sent to Gemini; PDF extraction stops once it has this much
+RESUME_CHAR_BUDGET = 5000
+
+# Process pool for PDF text extraction
+pdf_extractor = create_pdf_extractor(char_budget=RESUME_CHAR_BUDGET)
+
+# Prompts used to parse resumes are part of the parse cache key, so editing them invalidates cached parses
+RESUME_PARSE_PROMPT = """
     Extract the following information from this {file_type} resume:
     1. Name
     2. Skills (as a list)
@@ -129,61 +242,209 @@ def parse_resume_with_gemini(file_content, file_type):
     4. Education
     5. Experience Level (Entry, Mid, Senior)
     
-    Return the information in a structured JSON format with the following keys:
-    {{"name": "", "skills": [], "experience": "", "education": "", "experience_level": ""}}
+    Return only a JSON object with these properties (JSON Schema):
+    {schema}
     
     Resume content:
-    {file_content[:5000]}  # Limiting content size for API constraints
+    {resume_content}
     """
+
+# Prompt used to parse several resumes in one request; documents are tagged with short IDs
+RESUME_BATCH_PARSE_PROMPT = """
+    Extract the following information from each resume below:
+    1. Name
+    2. Skills (as a list)
+    3. Experience (in years)
+    4. Education
+    5. Experience Level (Entry, Mid, Senior)
+    
+    Return only a JSON array with exactly one object per resume. Each object has an "id" property
+    holding the ID from the resume's header, plus these properties (JSON Schema):
+    {schema}
     
+    {documents}
+    """
+
+# Attempts per resume before it is sent to the re-parse queue, with exponential backoff between them
+PARSE_MAX_ATTEMPTS = int(os.getenv("PARSE_MAX_ATTEMPTS", "3"))
+PARSE_RETRY_BACKOFF_SECONDS = float(os.getenv("PARSE_RETRY_BACKOFF_SECONDS", "1.0"))
+parse_metrics = ParseMetrics()
+
+# hybrid: pre-parse locally and call Gemini only when some field is uncertain;
+# llm: always call Gemini; offline: never call Gemini
+PARSE_MODE = os.getenv("PARSE_MODE", "hybrid").lower()
+if PARSE_MODE not in ("hybrid", "llm", "offline"):
+    raise ValueError(f"Unknown PARSE_MODE: {PARSE_MODE}")
+PREPARSE_MIN_CONFIDENCE = float(os.getenv("PREPARSE_MIN_CONFIDENCE", "0.75"))
+
+# Stages reported by /upload-resume/stream, in order
+UPLOAD_STAGES = ["received", "extracted", "parsed", "indexed"]
+
+# Prompt-size budget used to pack batches, estimated with CHARS_PER_TOKEN
+BATCH_PARSE_TOKEN_BUDGET = int(os.getenv("BATCH_PARSE_TOKEN_BUDGET", "12000"))
+BATCH_PARSE_MAX_DOCS = int(os.getenv("BATCH_PARSE_MAX_DOCS", "8"))
+
+def resume_generation_config(max_output_tokens=2048):
+    """Generation parameters for resume parsing"""
+    # Configure parameters suitable for gemini-1.5-flash
+    params = dict(temperature=0.2, top_p=0.8, top_k=40, max_output_tokens=max_output_tokens)
+    if JSON_MODE_SUPPORTED:
+        params["response_mime_type"] = "application/json"
+    return genai.types.GenerationConfig(**params)
+
+def parse_failure_reason(e):
+    """Metric label for a failed parse attempt"""
+    if isinstance(e, ResumeParseError):
+        return e.reason
+    if isinstance(e, asyncio.TimeoutError):
+        return "timeout"
+    return "llm_error"
+
+async def parse_resume_with_gemini(file_content, file_type):
+    """
+    Extract structured information from resume using Gemini API. Retries up to
+    PARSE_MAX_ATTEMPTS times with backoff, then raises ResumeParseError.
+    """
+    # Limiting content size for API constraints
+    prompt = RESUME_PARSE_PROMPT.format(
+        file_type=file_type, schema=RESUME_JSON_SCHEMA, resume_content=file_content[:RESUME_CHAR_BUDGET]
+    )
+    # Concurrent uploads of the same resume share one run of the retry loop below
+    return await parse_flight.do(prompt_key(prompt), lambda: parse_prompt_with_retries(prompt))
+
+async def parse_prompt_with_retries(prompt):
+    for attempt in range(PARSE_MAX_ATTEMPTS):
+        if attempt:
+            parse_metrics.retries += 1
+            await asyncio.sleep(PARSE_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        parse_metrics.attempts += 1
+        try:
+            with RESUME_STAGE_SECONDS.time(stage="llm"):
+                response = await llm_client.generate(
+                    prompt, generation_config=resume_generation_config(), priority=BACKGROUND
+                )
+            with RESUME_STAGE_SECONDS.time(stage="json_parse"):
+                parsed_data = validate_resume(extract_json(response.text))
+        except Exception as e:
+            reason = parse_failure_reason(e)
+            parse_metrics.failures[reason] += 1
+            print(f"Error parsing resume (attempt {attempt + 1}/{PARSE_MAX_ATTEMPTS}, {reason}): {str(e)}")
+            continue
+        parse_metrics.successes += 1
+        return parsed_data
+    raise ResumeParseError("exhausted", f"Resume could not be parsed after {PARSE_MAX_ATTEMPTS} attempts")
+
+def preparse(file_content):
+    """
+    Run the local pre-parser. Returns (pre_parse, resolved) where resolved is the final parsed
+    data when Gemini is not needed, or None.
+    """
+    if PARSE_MODE == "llm":
+        return None, None
+    with RESUME_STAGE_SECONDS.time(stage="preparse"):
+        local = preparse_resume(file_content[:RESUME_CHAR_BUDGET], skill_gazetteer)
+    if PARSE_MODE == "offline" or not local.uncertain_fields(PREPARSE_MIN_CONFIDENCE):
+        parse_metrics.local_parses += 1
+        return local, validate_resume(local.resolve())
+    return local, None
+
+def merge_preparse(local, parsed_data):
+    """Combine Gemini's parse with the pre-parser's confident fields"""
+    if local is None:
+        return parsed_data
+    return validate_resume(local.merge(parsed_data, PREPARSE_MIN_CONFIDENCE))
+
+async def parse_resume(file_content, file_type):
+    """Parse one resume, calling Gemini only when the local pre-parse is not confident enough"""
+    local, resolved = preparse(file_content)
+    if resolved is not None:
+        return resolved
+    return merge_preparse(local, await parse_resume_with_gemini(file_content, file_type))
+
+def plan_parse_batches(documents, token_budget=None, max_docs=None):
+    """
+    Greedily pack (doc_id, file_content, file_type) documents into batches whose
+    estimated prompt size stays within the token budget.
+    """
+    token_budget = token_budget or BATCH_PARSE_TOKEN_BUDGET
+    max_docs = max_docs or BATCH_PARSE_MAX_DOCS
+    overhead = len(RESUME_BATCH_PARSE_PROMPT) // CHARS_PER_TOKEN
+    batches = []
+    current, current_tokens = [], overhead
+    for document in documents:
+        tokens = len(document[1][:RESUME_CHAR_BUDGET]) // CHARS_PER_TOKEN + 20
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_docs):
+            batches.append(current)
+            current, current_tokens = [], overhead
+        current.append(document)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+async def parse_resume_batch_with_gemini(documents):
+    """
+    Parse several (doc_id, file_content, file_type) resumes with one Gemini request.
+    Returns {doc_id: parsed_data or ResumeParseError}; documents missing or invalid in the
+    batch response are retried individually with parse_resume_with_gemini.
+    """
+    if len(documents) == 1:
+        doc_id, file_content, file_type = documents[0]
+        try:
+            return {doc_id: await parse_resume_with_gemini(file_content, file_type)}
+        except ResumeParseError as e:
+            return {doc_id: e}
+    
+    # Short positional IDs keep the prompt small; map them back afterwards
+    short_ids = {str(n): document for n, document in enumerate(documents, start=1)}
+    sections = "\n".join(
+        f"=== Resume ID: {short_id} ({file_type}) ===\n{file_content[:RESUME_CHAR_BUDGET]}\n"
+        for short_id, (_, file_content, file_type) in short_ids.items()
+    )
+    prompt = RESUME_BATCH_PARSE_PROMPT.format(schema=RESUME_JSON_SCHEMA, documents=sections)
+    
+    results = {}
+    parse_metrics.attempts += len(documents)
     try:
-        # Configure parameters suitable for gemini-1.5-flash
-        response = model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.2,
-                top_p=0.8,
-                top_k=40,
-                max_output_tokens=2048,
+        with RESUME_STAGE_SECONDS.time(stage="llm_batch"):
+            response = await llm_client.generate(
+                prompt,
+                generation_config=resume_generation_config(max_output_tokens=min(8192, 512 * len(documents))),
+                priority=BACKGROUND,
             )
-        )
-        response_text = response.text
-        
-        # Try to extract JSON from the response
-        # Look for JSON content between triple backticks if present
-        import re
-        json_match = re.search(r"```json\s*([\\s\S]*?)\s*```", response_text)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            # If no JSON formatting, use the whole response
-            json_str = response_text
-        
-        # Clean up and parse the JSON
-        json_str = json_str.replace("```", "").strip()
-        parsed_data = json.loads(json_str)
-        
-        # Ensure required fields exist
-        required_fields = ["name", "skills", "experience", "education", "experience_level"]
-        for field in required_fields:
-            if field not in parsed_data:
-                parsed_data[field] = "Not specified" if field != "skills" else []
-                
-        return parsed_data
+        with RESUME_STAGE_SECONDS.time(stage="json_parse_batch"):
+            parsed_items = extract_json(response.text)
+            if not isinstance(parsed_items, list):
+                raise ValueError("Batch response is not a JSON array")
+            for item in parsed_items:
+                document = short_ids.get(str(item.pop("id", ""))) if isinstance(item, dict) else None
+                if document is None or document[0] in results:
+                    continue
+                try:
+                    results[document[0]] = validate_resume(item)
+                except ResumeParseError as e:
+                    parse_metrics.failures[e.reason] += 1
     except Exception as e:
-        print(f"Error parsing resume: {str(e)}")
-        # Fallback to default values
-        return {
-            "name": "Candidate",
-            "skills": ["Not specified"],
-            "experience": "Not specified",
-            "education": "Not specified",
-            "experience_level": "Not specified"
-        }
-
-def generate_insights_with_gemini(candidate_data):
-    """Generate career insights using Gemini API"""
-    prompt = f"""
+        print(f"Error parsing resume batch: {str(e)}")
+        parse_metrics.failures[parse_failure_reason(e)] += len(documents)
+    parse_metrics.successes += len(results)
+    
+    # Retry only the documents the batch did not cover, one request each
+    missing = [document for document in documents if document[0] not in results]
+    if missing:
+        print(f"Batch parse returned {len(documents) - len(missing)}/{len(documents)} resumes; parsing the rest individually")
+        parse_metrics.retries += len(missing)
+        parsed = await asyncio.gather(
+            *(parse_resume_with_gemini(content, file_type) for _, content, file_type in missing),
+            return_exceptions=True,
+        )
+        for (doc_id, _, _), parsed_data in zip(missing, parsed):
+            results[doc_id] = parsed_data
+    return results
+
+def build_insights_prompt(candidate_data):
+    """Career insights prompt for a parsed candidate profile"""
+    return f"""
     As an AI career advisor, provide comprehensive professional insights for this candidate.
     
     Based on the following candidate profile:
@@ -212,18 +473,37 @@ def generate_insights_with_gemini(candidate_data):
     
     Format your response using proper markdown formatting with headings, bullet points, and brief explanations.
     """
-    
+
+# User-facing messages for each classify_llm_error class
+INSIGHTS_ERROR_MESSAGES = {
+    "timeout": "Unable to generate career insights because the AI model took too long to respond. Please try again later.",
+    "quota": "Unable to generate career insights due to API quota limitations. Please try again later.",
+    "permission": "Unable to generate career insights due to API access restrictions. Please check your API key configuration.",
+    "filter": "Unable to generate career insights due to content filtering. Please modify the candidate profile and try again.",
+    "not_found": "Model 'gemini-1.5-flash' was not found. Please check that you're using a valid model name and that the API key has access to this model.",
+}
+
+def insights_error_message(e):
+    """User-facing message for an error raised while generating insights"""
+    return INSIGHTS_ERROR_MESSAGES.get(
+        classify_llm_error(e), f"Unable to generate career insights at this time. Error: {str(e)}"
+    )
+
+def insights_generation_config():
+    """Generation parameters for career insights"""
+    # Configure parameters suitable for gemini-1.5-flash
+    return genai.types.GenerationConfig(
+        temperature=0.2,
+        top_p=0.8,
+        top_k=40,
+        max_output_tokens=2048,
+    )
+
+async def generate_insights_with_gemini(candidate_data):
+    """Generate career insights using Gemini API; concurrent requests for the same profile share one call"""
+    prompt = build_insights_prompt(candidate_data)
     try:
-        # Configure parameters suitable for gemini-1.5-flash
-        response = model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.2,
-                top_p=0.8,
-                top_k=40,
-                max_output_tokens=2048,
-            )
-        )
+        response = await llm_client.generate(prompt, generation_config=insights_generation_config())
         
         # Check if we have a valid response
         if not response or not hasattr(response, 'text') or not response.text:
@@ -232,109 +512,777 @@ def generate_insights_with_gemini(candidate_data):
         
         return response.text
     except Exception as e:
-        error_message = str(e)
-        print(f"Error generating insights: {error_message}")
+        print(f"Error generating insights: {str(e)}")
+        return insights_error_message(e)
+
+async def stream_insights_with_gemini(candidate_data):
+    """
+    Yield career insights text chunks as Gemini generates them. Viewers of the same profile
+    share one stream; those arriving late first get the text generated so far. The finished
+    text is cached by the shared stream itself, so it is kept even if every viewer has left.
+    """
+    prompt = build_insights_prompt(candidate_data)
+    
+    async def generate_and_cache():
+        chunks = []
+        async for chunk in llm_client.stream(prompt, generation_config=insights_generation_config()):
+            chunks.append(chunk)
+            yield chunk
+        insights = "".join(chunks)
+        if len(insights) >= 50:  # Basic validation
+            insights_cache.put(candidate_data, insights)
+    
+    stream = insights_stream_flight.stream(prompt_key(prompt), generate_and_cache)
+    async for chunk in stream:
+        yield chunk
+
+def is_insights_error(insights):
+    """True if generate_insights_with_gemini returned one of its error messages"""
+    return insights.startswith(("Unable to generate", "Model '"))
+
+def resume_search_text(file_content, parsed_data):
+    """Text indexed for candidate search: the resume itself plus the parsed fields"""
+    skills = parsed_data.get("skills", [])
+    if isinstance(skills, str):
+        skills = [skills]
+    return " ".join([file_content, str(parsed_data.get("name", "")), " ".join(map(str, skills))])
+
+def resume_cache_key(content_hash):
+    """Parse cache key for an uploaded file's sha256; covers both parse prompts, the model and the parse mode"""
+    return make_cache_key(content_hash, RESUME_PARSE_PROMPT + RESUME_BATCH_PARSE_PROMPT, f"{GEMINI_MODEL_NAME}/{PARSE_MODE}")
+
+async def extract_resume_text(filename, path):
+    """Extract plain text from a saved resume; returns (file_content, file_type)"""
+    # Parse content based on file type
+    if filename.endswith('.pdf'):
+        # CPU-bound, so it runs in the PDF process pool
+        file_content = await pdf_extractor.extract(path)
+        return file_content, "PDF"
+    else:  # Assume text file
+        return Path(path).read_text(encoding='utf-8'), "text"
+
+def sync_aliases():
+    """
+    Apply skill aliases stored since the last sync, including those added on other workers, and
+    re-index the candidates and jobs whose skills they remap
+    """
+    global alias_seq
+    rows = storage.skill_aliases_since(alias_seq)
+    if not rows:
+        return
+    remapped = set()
+    for seq, alias, canonical in rows:
+        previous = skill_normalizer.skill_id(alias, create=False)
+        skill_id = skill_normalizer.add_alias(alias, canonical)
+        if previous is not None and previous != skill_id:
+            remapped.add(previous)
+        skill_gazetteer.add_skills([canonical])
+        alias_seq = seq
+    reindex_skills(remapped)
+
+def sync_indexes():
+    """Add resumes stored since the last sync, including those written by other workers, to the search indexes"""
+    global indexed_seq
+    sync_aliases()
+    while True:
+        rows = storage.resumes_since(indexed_seq)
+        if not rows:
+            return
+        texts = {}
+        for seq, candidate_id, parsed_data, file_content in rows:
+            texts[candidate_id] = resume_search_text(file_content, parsed_data)
+            skill_index.add(candidate_id, parsed_data["skills"], parsed_data["experience_level"])
+            search_engine.add(candidate_id, texts[candidate_id])
+            match_matrix.add_candidate(candidate_id, parsed_data["skills"], parsed_data["experience_level"])
+            indexed_seq = seq
+        embed_documents(candidate_vectors, texts)
+
+def embed_documents(vector_store, texts):
+    """Embed {doc_id: text} in one batch, skipping documents another worker already embedded"""
+    missing = vector_store.missing(list(texts))
+    if missing:
+        vector_store.add(missing, embed_texts([texts[doc_id] for doc_id in missing], vector_store.dim))
+
+def job_embedding_text(job_data):
+    return " ".join([job_data["job_title"], job_data["description"], " ".join(job_data["required_skills"])])
+
+def sync_jobs():
+    """Add jobs stored by any worker that the match matrix and skill gazetteer have not seen yet"""
+    sync_aliases()
+    if storage.count_jobs() == match_matrix.job_count:
+        return
+    texts = {}
+    for job_id, job_data in storage.list_jobs():
+        if not match_matrix.has_job(job_id):
+            match_matrix.add_job(job_id, job_data["required_skills"], job_data["experience_level"])
+            skill_gazetteer.add_skills(job_data["required_skills"])
+            texts[job_id] = job_embedding_text(job_data)
+    embed_documents(job_vectors, texts)
+
+def reindex_skills(skill_ids):
+    """
+    Re-index the candidates and jobs holding any of skill_ids from their stored skills, after an
+    alias moved a spelling of those skills to another one; the rest of the indexes is unchanged
+    """
+    candidate_ids = {candidate_id for skill_id in skill_ids for candidate_id in match_matrix.candidates_with(skill_id)}
+    for candidate_id, parsed_data in storage.get_resumes(candidate_ids).items():
+        skill_index.add(candidate_id, parsed_data["skills"], parsed_data["experience_level"])
+        match_matrix.update_candidate(candidate_id, parsed_data["skills"], parsed_data["experience_level"])
+    job_ids = {job_id for skill_id in skill_ids for job_id in match_matrix.jobs_with(skill_id)}
+    if job_ids:
+        for job_id, job_data in storage.list_jobs():
+            if job_id in job_ids:
+                match_matrix.update_job(job_id, job_data["required_skills"], job_data["experience_level"])
+
+def store_resumes(records):
+    """Store (file_id, file_content, parsed_data) records in one write and index them"""
+    storage.add_resumes([(file_id, parsed_data, file_content) for file_id, file_content, parsed_data in records])
+    sync_indexes()
+
+async def process_resume(file_id, filename, path, content_hash, on_stage=None):
+    """
+    Extract, parse and index one saved resume; returns the parsed data.
+    on_stage, if given, is called with each UPLOAD_STAGES name as it completes.
+    """
+    report = on_stage or (lambda stage: None)
+    
+    # Identical uploads reuse the cached extraction and parse
+    cache_key = resume_cache_key(content_hash)
+    cached = parse_cache.get(cache_key)
+    if cached is not None:
+        file_content = cached["text"]
+        parsed_data = cached["parsed"]
+        report("extracted")
+        report("parsed")
+    else:
+        with RESUME_STAGE_SECONDS.time(stage="extract"):
+            file_content, file_type = await extract_resume_text(filename, path)
+        report("extracted")
+        parsed_data = await parse_resume(file_content, file_type)
+        report("parsed")
+        parse_cache.put(cache_key, {"parsed": parsed_data, "text": file_content})
+    
+    with RESUME_STAGE_SECONDS.time(stage="store"):
+        store_resumes([(file_id, file_content, parsed_data)])
+    report("indexed")
+    return parsed_data
+
+async def process_resume_batch(items):
+    """
+    Extract, parse and index several saved (file_id, filename, path) resumes, packing cache
+    misses the pre-parser cannot resolve into shared Gemini requests.
+    Returns {file_id: parsed_data or the Exception raised}.
+    """
+    results = {}
+    records = []
+    documents = []
+    pending = {}
+    for file_id, filename, path in items:
+        try:
+            cache_key = resume_cache_key(await asyncio.to_thread(file_sha256, path))
+            cached = parse_cache.get(cache_key)
+            if cached is not None:
+                records.append((file_id, cached["text"], cached["parsed"]))
+                results[file_id] = cached["parsed"]
+                continue
+            with RESUME_STAGE_SECONDS.time(stage="extract"):
+                file_content, file_type = await extract_resume_text(filename, path)
+            local, resolved = preparse(file_content)
+        except Exception as e:
+            results[file_id] = e
+            continue
+        if resolved is not None:
+            parse_cache.put(cache_key, {"parsed": resolved, "text": file_content})
+            records.append((file_id, file_content, resolved))
+            results[file_id] = resolved
+            continue
+        pending[file_id] = (cache_key, file_content, local)
+        documents.append((file_id, file_content, file_type))
+    
+    batch_results = await asyncio.gather(*(parse_resume_batch_with_gemini(batch) for batch in plan_parse_batches(documents)))
+    for parsed in batch_results:
+        for file_id, parsed_data in parsed.items():
+            results[file_id] = parsed_data
+            if isinstance(parsed_data, Exception):
+                continue
+            cache_key, file_content, local = pending[file_id]
+            try:
+                parsed_data = results[file_id] = merge_preparse(local, parsed_data)
+            except ResumeParseError as e:
+                results[file_id] = e
+                continue
+            parse_cache.put(cache_key, {"parsed": parsed_data, "text": file_content})
+            records.append((file_id, file_content, parsed_data))
+    
+    # One batched write for the whole group
+    with RESUME_STAGE_SECONDS.time(stage="store_batch"):
+        store_resumes(records)
+    return results
+
+async def ingest_worker():
+    """Background worker that parses queued batch uploads, several resumes per Gemini request"""
+    while True:
+        items = await ingest_queue.get_many(BATCH_PARSE_MAX_DOCS)
+        loaded = [(item["item_id"], item["filename"], item["path"]) for item in items]
         
-        # Provide more helpful error message based on the type of error
-        if "quota" in error_message.lower():
-            return "Unable to generate career insights due to API quota limitations. Please try again later."
-        elif "permission" in error_message.lower() or "access" in error_message.lower():
-            return "Unable to generate career insights due to API access restrictions. Please check your API key configuration."
-        elif "content" in error_message.lower() and "filtered" in error_message.lower():
-            return "Unable to generate career insights due to content filtering. Please modify the candidate profile and try again."
-        elif "not found" in error_message.lower() or "404" in error_message:
-            return "Model 'gemini-1.5-flash' was not found. Please check that you're using a valid model name and that the API key has access to this model."
-        else:
-            return f"Unable to generate career insights at this time. Error: {error_message}"
+        try:
+            results = await process_resume_batch(loaded)
+        except Exception as e:
+            print(f"Error ingesting batch: {str(e)}")
+            results = {file_id: e for file_id, _, _ in loaded}
+        
+        for file_id, filename, _ in loaded:
+            result = results.get(file_id)
+            if isinstance(result, Exception) or result is None:
+                print(f"Error ingesting {filename}: {str(result)}")
+                ingest_queue.fail(file_id, str(result))
+            else:
+                ingest_queue.complete(file_id, result)
+
+@app.on_event("startup")
+async def load_stored_data():
+    # Rebuild the in-memory search indexes from storage and make sure sample jobs exist
+    initialize_sample_jobs()
+    jobs = sample_jobs + [job for _, job in storage.list_jobs()]
+    skill_normalizer.seed(jobs)
+    skill_gazetteer.add_skills([skill for job in jobs for skill in job["required_skills"]])
+    skill_gazetteer.add_skills(DEFAULT_ALIASES)
+    # Aliases added through the API, by this or any other worker, on top of the seeded ones
+    sync_aliases()
+    sync_jobs()
+    sync_indexes()
+    print(f"Loaded {storage.count_resumes()} resumes and {storage.count_jobs()} jobs from storage")
+
+async def ingest_lease_keeper():
+    """Keep this process's ingest leases alive and take over items from processes that stopped"""
+    while True:
+        await asyncio.sleep(ingest_queue.lease_seconds / 3)
+        ingest_queue.renew_leases()
+        recovered = ingest_queue.recover()
+        if recovered:
+            print(f"Took over {recovered} resumes from a stopped ingest worker")
+
+@app.on_event("startup")
+async def start_ingest_workers():
+    # Resume any batch work interrupted by a restart, then start the worker pool
+    recovered = ingest_queue.recover()
+    if recovered:
+        print(f"Requeued {recovered} resumes from unfinished batches")
+    for _ in range(INGEST_WORKERS):
+        ingest_workers.append(asyncio.create_task(ingest_worker()))
+    ingest_workers.append(asyncio.create_task(ingest_lease_keeper()))
+
+@app.on_event("shutdown")
+async def stop_pdf_workers():
+    pdf_extractor.shutdown()
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    # Reject oversized uploads from their Content-Length before the body is read
+    limit = UPLOAD_SIZE_LIMITS.get(request.url.path)
+    content_length = request.headers.get("content-length")
+    if limit and content_length and content_length.isdigit() and int(content_length) > limit:
+        return JSONResponse(status_code=413, content={"detail": f"Upload is larger than {limit} bytes"})
+    return await call_next(request)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    # Label by route template so candidate and job IDs don't create a series each
+    start = time.perf_counter()
+    status = 500
+    with HTTP_IN_FLIGHT.track_inprogress():
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            HTTP_LATENCY.observe(time.perf_counter() - start, method=request.method, path=path)
+            HTTP_REQUESTS.inc(method=request.method, path=path, status=str(status))
+
+def queue_reparse(file_id, filename, path):
+    """Hand a resume that failed parsing to the ingest queue instead of storing a placeholder; returns the batch ID"""
+    parse_metrics.requeued += 1
+    return ingest_queue.create_batch([(file_id, safe_filename(filename), str(path))])
+
+def new_resume_path(file_id, filename):
+    file_path = Path(f"resumes/{file_id}_{safe_filename(filename)}")
+    os.makedirs(file_path.parent, exist_ok=True)
+    return file_path
 
 # Endpoints
 @app.post("/upload-resume/")
 async def upload_resume(file: UploadFile):
     file_id = str(uuid.uuid4())
-    file_path = Path(f"resumes/{file_id}_{file.filename}")
-    os.makedirs(file_path.parent, exist_ok=True)
+    file_path = new_resume_path(file_id, file.filename)
     
-    # Read file content
-    content = await file.read()
+    # Stream the upload to disk in chunks instead of reading it into memory
+    try:
+        with RESUME_STAGE_SECONDS.time(stage="disk_write"):
+            content_hash = await save_upload(file, file_path, MAX_UPLOAD_BYTES)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except EmptyUpload as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Save file
-    with open(file_path, "wb") as f:
-        f.write(content)
+    try:
+        await process_resume(file_id, file.filename, file_path, content_hash)
+    except PDFExtractionError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ResumeParseError:
+        batch_id = queue_reparse(file_id, file.filename, file_path)
+        return JSONResponse(status_code=202, content={
+            "message": "Resume could not be parsed yet and was queued for re-parsing",
+            "candidate_id": file_id,
+            "batch_id": batch_id,
+        })
     
-    # Parse content based on file type
-    file_content = ""
-    if file.filename.endswith('.pdf'):
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-        file_content = " ".join(page.extract_text() for page in pdf_reader.pages)
-        file_type = "PDF"
-    else:  # Assume text file
-        file_content = content.decode('utf-8')
-        file_type = "text"
+    return {"message": "Resume uploaded successfully", "candidate_id": file_id}
+
+@app.post("/upload-resume/stream")
+async def upload_resume_stream(file: UploadFile):
+    """
+    Upload a resume and stream its progress as server-sent events: a `status` event for each
+    of UPLOAD_STAGES as it completes, then a `done` event with the candidate ID, or an
+    `error` event on failure.
+    """
+    file_id = str(uuid.uuid4())
+    file_path = new_resume_path(file_id, file.filename)
     
-    parsed_data = parse_resume_with_gemini(file_content, file_type)
-    resumes[file_id] = parsed_data
+    try:
+        with RESUME_STAGE_SECONDS.time(stage="disk_write"):
+            content_hash = await save_upload(file, file_path, MAX_UPLOAD_BYTES)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except EmptyUpload as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return {"message": "Resume uploaded successfully", "candidate_id": file_id}
+    # Started before the response so the upload is processed, and a parse failure requeued,
+    # even if the client disconnects; the queue ends with the final event and then None
+    events_queue = asyncio.Queue()
+    
+    async def run():
+        try:
+            await process_resume(file_id, file.filename, file_path, content_hash,
+                                 lambda stage: events_queue.put_nowait(sse_event({"stage": stage}, event="status")))
+            final = sse_event({"message": "Resume uploaded successfully", "candidate_id": file_id}, event="done")
+        except PDFExtractionError as e:
+            final = sse_event({"message": str(e), "status_code": 422}, event="error")
+        except ResumeParseError:
+            batch_id = queue_reparse(file_id, file.filename, file_path)
+            final = sse_event({"message": "Resume could not be parsed yet and was queued for re-parsing", "candidate_id": file_id, "batch_id": batch_id}, event="queued")
+        except Exception as e:
+            print(f"Error processing resume: {str(e)}")
+            final = sse_event({"message": "Failed to process resume", "status_code": 500}, event="error")
+        events_queue.put_nowait(final)
+        events_queue.put_nowait(None)
+    
+    task = asyncio.create_task(run())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    
+    async def events():
+        yield sse_event({"stage": "received"}, event="status")
+        while (event := await events_queue.get()) is not None:
+            yield event
+    
+    return StreamingResponse(
+        with_keepalive(events(), SSE_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/upload-resumes/batch")
+async def upload_resumes_batch(files: List[UploadFile]):
+    """
+    Queue many resumes (PDF/TXT files or zip archives of them) for background parsing.
+    Returns a batch ID to poll at /batches/{batch_id}.
+    """
+    queued = []
+    # Bytes of resumes saved or unpacked so far
+    inflated = 0
+    
+    def check_batch_size():
+        if len(queued) >= MAX_BATCH_FILES:
+            raise HTTPException(status_code=413, detail=f"A batch can contain at most {MAX_BATCH_FILES} resumes")
+    
+    def batch_too_large():
+        return UploadTooLarge(f"The batch expands to more than {MAX_BATCH_INFLATED_BYTES} bytes of resumes")
+    
+    def unpack_archive(archive_path):
+        # Runs in a thread: decompressing a large archive would stall the event loop
+        nonlocal inflated
+        with zipfile.ZipFile(archive_path) as archive:
+            for filename, member in iter_zip_resumes(archive, RESUME_EXTENSIONS):
+                check_batch_size()
+                remaining = MAX_BATCH_INFLATED_BYTES - inflated
+                if member.file_size > remaining:
+                    raise batch_too_large()
+                file_id = str(uuid.uuid4())
+                file_path = new_resume_path(file_id, filename)
+                queued.append((file_id, filename, str(file_path)))
+                # The declared size can lie, so extraction itself stops at the remaining budget
+                try:
+                    extract_zip_member(archive, member, file_path, min(MAX_UPLOAD_BYTES, remaining))
+                except UploadTooLarge:
+                    if remaining < MAX_UPLOAD_BYTES:
+                        raise batch_too_large() from None
+                    raise
+                inflated += file_path.stat().st_size
+    
+    try:
+        for file in files:
+            if not file.filename.lower().endswith(".zip"):
+                check_batch_size()
+                file_id = str(uuid.uuid4())
+                file_path = new_resume_path(file_id, file.filename)
+                await save_upload(file, file_path, MAX_UPLOAD_BYTES)
+                queued.append((file_id, safe_filename(file.filename), str(file_path)))
+                inflated += file_path.stat().st_size
+                if inflated > MAX_BATCH_INFLATED_BYTES:
+                    raise batch_too_large()
+                continue
+            
+            # Unpack archives member by member from a temporary copy on disk
+            archive_path = new_resume_path(str(uuid.uuid4()), "upload.zip")
+            try:
+                await save_upload(file, archive_path, MAX_BATCH_UPLOAD_BYTES)
+                await asyncio.to_thread(unpack_archive, archive_path)
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"{file.filename} is not a valid zip archive")
+            finally:
+                archive_path.unlink(missing_ok=True)
+    except BaseException as e:
+        # Nothing was queued, so don't leave the files saved so far behind
+        for _, _, path in queued:
+            Path(path).unlink(missing_ok=True)
+        if isinstance(e, UploadTooLarge):
+            raise HTTPException(status_code=413, detail=str(e))
+        if isinstance(e, EmptyUpload):
+            raise HTTPException(status_code=400, detail=str(e))
+        raise
+    
+    if not queued:
+        raise HTTPException(status_code=400, detail="No PDF or TXT resumes found in the upload")
+    
+    batch_id = ingest_queue.create_batch(queued)
+    return {"message": "Batch queued successfully", "batch_id": batch_id, "total": len(queued)}
+
+@app.get("/batches/{batch_id}")
+async def get_batch(batch_id: str):
+    """
+    Progress and per-file results of a batch upload
+    """
+    status = ingest_queue.batch_status(batch_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return status
+
+@app.post("/batches/{batch_id}/retry")
+async def retry_batch(batch_id: str):
+    """
+    Queue a batch's failed resumes for another parse attempt
+    """
+    if ingest_queue.batch_status(batch_id) is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    requeued = ingest_queue.requeue_failed(batch_id)
+    parse_metrics.requeued += requeued
+    return {"message": f"Requeued {requeued} resumes", "batch_id": batch_id, "requeued": requeued}
 
 @app.post("/add-job/")
 async def add_job(job: JobPosting):
     job_id = str(uuid.uuid4())
-    jobs[job_id] = job.dict()
+    storage.add_job(job_id, job.dict())
+    match_matrix.add_job(job_id, job.required_skills, job.experience_level)
+    skill_gazetteer.add_skills(job.required_skills)
+    embed_documents(job_vectors, {job_id: job_embedding_text(job.dict())})
     return {"message": "Job added successfully", "job_id": job_id}
 
 @app.post("/search-candidates/")
 async def search_candidates(query: CandidateSearchQuery):
-    # Placeholder for hybrid search logic (BM25 + embeddings)
+    # Filter on skills and level with the inverted index, then rank with hybrid BM25 + vector search
+    fields = parse_fields(query.fields, CANDIDATE_FIELDS)
+    sync_indexes()
+    matched_ids = skill_index.search(query.skills, query.experience_level)
+    query_text = query.query or " ".join(query.skills)
+    total, ranked = search_engine.search(query_text, doc_ids=matched_ids, limit=query.limit, offset=query.offset)
+    details = storage.get_resumes(cid for cid, _ in ranked)
     matched_candidates = [
-        {"candidate_id": cid, "details": details}
-        for cid, details in resumes.items()
-        if any(skill in details["skills"] for skill in query.skills)
-        and details["experience_level"] == query.experience_level
+        {"candidate_id": cid, "score": round(score, 4), "details": project(details[cid], fields)}
+        for cid, score in ranked
     ]
-    return {"candidates": matched_candidates}
+    return {"candidates": matched_candidates, "total": total, "limit": query.limit, "offset": query.offset}
 
 @app.get("/career-insights/{candidate_id}")
-async def career_insights(candidate_id: str):
-    if candidate_id not in resumes:
+async def career_insights(candidate_id: str, refresh: bool = False):
+    candidate_data = storage.get_resume(candidate_id)
+    if candidate_data is None:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
     # Add validation for candidate data
-    candidate_data = resumes.get(candidate_id, {})
     if not candidate_data or not candidate_data.get("skills"):
         return {"insights": "Unable to generate insights: Incomplete candidate profile. Please ensure the resume was properly processed."}
     
+    # Serve repeated views from the cache unless a refresh is requested
+    if refresh:
+        insights_cache.invalidate(candidate_data)
+    else:
+        cached_insights = insights_cache.get(candidate_data)
+        if cached_insights is not None:
+            return {"insights": cached_insights, "cached": True}
+    
     try:
         # Generate insights with a timeout to prevent hanging requests
-        insights = generate_insights_with_gemini(candidate_data)
+        insights = await generate_insights_with_gemini(candidate_data)
         
         # Validate response
         if not insights or len(insights) < 50:  # Basic validation
             return {"insights": "The AI model returned insufficient insights. Please try again."}
+        
+        # Only successful generations are cached; error messages are retried next time
+        if not is_insights_error(insights):
+            insights_cache.put(candidate_data, insights)
             
-        return {"insights": insights}
+        return {"insights": insights, "cached": False}
     except Exception as e:
         error_message = str(e)
         print(f"Error in career insights endpoint: {error_message}")
         return {"insights": f"Unable to generate career insights: {error_message}. Please try again later."}
 
+# Comment lines sent on otherwise idle event streams; well below the frontend's 60 s read timeout
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+def sse_event(data, event=None):
+    """Format one server-sent event with a JSON payload"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+@app.get("/career-insights/{candidate_id}/stream")
+async def career_insights_stream(candidate_id: str, refresh: bool = False):
+    """
+    Stream career insights as server-sent events while Gemini generates them.
+    Emits `status` events (received, then cached or generating), `data: {"text": ...}` chunks,
+    then a `done` event, or an `error` event on failure.
+    """
+    candidate_data = storage.get_resume(candidate_id)
+    if candidate_data is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    async def events():
+        yield sse_event({"stage": "received"}, event="status")
+        if not candidate_data or not candidate_data.get("skills"):
+            yield sse_event({"message": "Unable to generate insights: Incomplete candidate profile. Please ensure the resume was properly processed."}, event="error")
+            return
+        
+        if refresh:
+            insights_cache.invalidate(candidate_data)
+        else:
+            cached_insights = insights_cache.get(candidate_data)
+            if cached_insights is not None:
+                yield sse_event({"stage": "cached"}, event="status")
+                yield sse_event({"text": cached_insights})
+                yield sse_event({"cached": True}, event="done")
+                return
+        
+        yield sse_event({"stage": "generating"}, event="status")
+        chunks = []
+        try:
+            async for chunk in stream_insights_with_gemini(candidate_data):
+                chunks.append(chunk)
+                yield sse_event({"text": chunk})
+        except Exception as e:
+            print(f"Error streaming insights: {str(e)}")
+            yield sse_event({"message": insights_error_message(e)}, event="error")
+            return
+        
+        insights = "".join(chunks)
+        if len(insights) < 50:  # Basic validation
+            yield sse_event({"message": "The AI model returned insufficient insights. Please try again."}, event="error")
+            return
+        
+        yield sse_event({"cached": False}, event="done")
+    
+    return StreamingResponse(
+        with_keepalive(events(), SSE_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/jobs/{job_id}/top-candidates")
+async def top_candidates_for_job(job_id: str, limit: int = Query(10, ge=1, le=100), fields: Optional[str] = None):
+    """
+    Best matching candidates for a job, from the precomputed match matrix
+    """
+    fields = parse_fields(fields, CANDIDATE_FIELDS)
+    sync_jobs()
+    sync_indexes()
+    if not match_matrix.has_job(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    ranked = match_matrix.top_candidates(job_id, limit)
+    details = storage.get_resumes(cid for cid, _ in ranked)
+    return {
+        "job_id": job_id,
+        "candidates": [
+            {"candidate_id": cid, "score": round(score, 4), "details": project(details[cid], fields)}
+            for cid, score in ranked
+        ]
+    }
+
+def similar_candidates_response(query_vector, limit, fields=None):
+    sync_indexes()
+    ranked = candidate_vectors.search(query_vector, limit)
+    details = storage.get_resumes(cid for cid, _ in ranked)
+    return [
+        {"candidate_id": cid, "similarity": round(score, 4), "details": project(details[cid], fields)}
+        for cid, score in ranked if cid in details
+    ]
+
+@app.get("/jobs/{job_id}/similar-candidates")
+async def similar_candidates_for_job(job_id: str, limit: int = Query(10, ge=1, le=100), fields: Optional[str] = None):
+    """
+    Candidates whose resumes are most similar to a job posting, by embedding similarity
+    """
+    fields = parse_fields(fields, CANDIDATE_FIELDS)
+    sync_jobs()
+    job_vector = job_vectors.vector(job_id)
+    if job_vector is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job_id": job_id, "candidates": similar_candidates_response(job_vector, limit, fields)}
+
+@app.post("/similar-candidates/")
+async def similar_candidates(query: SimilarCandidatesQuery):
+    """
+    Candidates whose resumes are most similar to a free-text job description
+    """
+    fields = parse_fields(query.fields, CANDIDATE_FIELDS)
+    query_vector = embed_texts([query.description], candidate_vectors.dim)[0]
+    return {"candidates": similar_candidates_response(query_vector, query.limit, fields)}
+
+@app.get("/candidates/{candidate_id}/top-jobs")
+async def top_jobs_for_candidate(candidate_id: str, limit: int = Query(10, ge=1, le=100), fields: Optional[str] = None):
+    """
+    Best matching jobs for a candidate, from the precomputed match matrix
+    """
+    fields = parse_fields(fields, JOB_FIELDS)
+    sync_jobs()
+    sync_indexes()
+    if not match_matrix.has_candidate(candidate_id):
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    ranked = match_matrix.top_jobs(candidate_id, limit)
+    jobs_by_id = dict(storage.list_jobs())
+    return {
+        "candidate_id": candidate_id,
+        "jobs": [
+            {"job_id": job_id, "score": round(score, 4), **project(jobs_by_id[job_id], fields)}
+            for job_id, score in ranked
+        ]
+    }
+
+@app.get("/matches/summary")
+async def matches_summary():
+    """
+    Number of candidate-job pairs scoring at least MATCH_THRESHOLD
+    """
+    sync_jobs()
+    sync_indexes()
+    return {
+        "matches": match_matrix.match_count(MATCH_THRESHOLD),
+        "threshold": MATCH_THRESHOLD,
+        "candidates": match_matrix.candidate_count,
+        "jobs": match_matrix.job_count
+    }
+
+@app.get("/skills")
+async def get_skills():
+    """
+    Canonical skills with the lookup keys (aliases) that map to them
+    """
+    sync_aliases()
+    return {"skills": [{"name": name, "aliases": keys} for name, keys in skill_normalizer.aliases().items() if keys]}
+
+@app.post("/skills/aliases")
+async def add_skill_alias(skill_alias: SkillAlias):
+    """
+    Map an alias to a canonical skill and re-index candidates and jobs with it. The alias is
+    stored, so it survives restarts and other workers apply it on their next sync.
+    """
+    storage.add_skill_alias(skill_alias.alias, skill_alias.canonical)
+    sync_aliases()
+    return {"message": "Alias added successfully", "canonical": skill_normalizer.canonical(skill_alias.canonical)}
+
 # Add a new endpoint to get all jobs
+def jobs_etag():
+    """Weak validator for job listings; changes whenever any job or skill alias is written"""
+    # Aliases change which jobs a skill filter matches
+    sync_aliases()
+    return f'W/"jobs-{storage.jobs_revision()}-{alias_seq}"'
+
+def not_modified(request, etag):
+    """304 response if the client's If-None-Match already matches etag, else None"""
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+def cached_json(content, etag):
+    return FastJSONResponse(content, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+def job_listing(job_id, job_data, fields=None, description_chars=None):
+    """A job as returned by /jobs, projected to fields and with the description shortened"""
+    listing = project(job_data, fields)
+    if "description" in listing and description_chars is not None:
+        listing = {**listing, "description": truncate_text(listing["description"], description_chars)}
+    return {"job_id": job_id, **listing}
+
 @app.get("/jobs")
-async def get_jobs():
+async def get_jobs(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    experience_level: Optional[str] = None,
+    skill: Optional[str] = None,
+    fields: Optional[str] = None,
+    description_chars: Optional[int] = Query(None, ge=1),
+):
+    """
+    Return a page of job postings, optionally filtered by experience level and required skill.
+    `fields` (comma-separated) limits each job to those fields; `description_chars` shortens
+    descriptions for list views.
     """
-    Return all job postings
+    fields = parse_fields(fields, JOB_FIELDS)
+    etag = jobs_etag()
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    jobs = storage.list_jobs(limit=limit, offset=offset, experience_level=experience_level, skill=skill)
+    return cached_json({
+        "jobs": [job_listing(job_id, job_data, fields, description_chars) for job_id, job_data in jobs],
+        "total": storage.count_jobs(experience_level=experience_level, skill=skill),
+        "limit": limit,
+        "offset": offset,
+    }, etag)
+
+@app.get("/jobs/count")
+async def get_job_count(request: Request, experience_level: Optional[str] = None, skill: Optional[str] = None):
+    """
+    Number of job postings, optionally filtered like /jobs
     """
-    jobs_list = [{"job_id": job_id, **job_data} for job_id, job_data in jobs.items()]
-    return {"jobs": jobs_list}
+    etag = jobs_etag()
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    return cached_json({"count": storage.count_jobs(experience_level=experience_level, skill=skill)}, etag)
 
 # Initialize sample job data
 def initialize_sample_jobs():
-    if not jobs:  # Only initialize if jobs dictionary is empty
-        for job in sample_jobs:
-            job_id = str(uuid.uuid4())
-            jobs[job_id] = job
+    # Only initialize if there are no stored jobs; safe when several workers start at once
+    if storage.seed_jobs([(str(uuid.uuid4()), job) for job in sample_jobs]):
         print(f"Initialized {len(sample_jobs)} sample job postings")
     else:
-        print(f"Jobs already initialized. {len(jobs)} jobs available.")
+        print(f"Jobs already initialized. {storage.count_jobs()} jobs available.")
 
 # Add a health check endpoint
 @app.get("/health")
@@ -344,9 +1292,48 @@ async def health_check():
     """
     return {"status": "ok", "message": "Server is running", "model": "gemini-1.5-flash"}
 
+@app.get("/cache-stats")
+async def cache_stats():
+    """
+    Hit/miss counters for the resume parse and career insights caches
+    """
+    return {"parse_cache": parse_cache.stats(), "insights_cache": insights_cache.stats()}
+
+def collect_app_metrics():
+    """Cache, parse and index counters that live outside the metrics registry"""
+    caches = {"parse": parse_cache.stats(), "insights": insights_cache.stats()}
+    parse_stats = parse_metrics.stats()
+    return [
+        ("cache_hits_total", "counter", "Cache hits", {(("cache", name),): stats["hits"] for name, stats in caches.items()}),
+        ("cache_misses_total", "counter", "Cache misses", {(("cache", name),): stats["misses"] for name, stats in caches.items()}),
+        ("cache_hit_ratio", "gauge", "Cache hits over lookups", {(("cache", name),): stats["hit_rate"] for name, stats in caches.items()}),
+        ("cache_entries", "gauge", "Entries held per cache", {(("cache", name),): stats["entries"] for name, stats in caches.items()}),
+        ("resume_parse_attempts_total", "counter", "Resume parse attempts sent to Gemini", {(): parse_stats["attempts"]}),
+        ("resume_parse_retries_total", "counter", "Resume parse retries", {(): parse_stats["retries"]}),
+        ("resume_parse_local_total", "counter", "Resumes parsed locally without Gemini", {(): parse_stats["local_parses"]}),
+        ("resume_parse_requeued_total", "counter", "Resumes handed to the re-parse queue", {(): parse_stats["requeued"]}),
+        ("resume_parse_failures_total", "counter", "Failed resume parse attempts by reason",
+         {(("reason", reason),): count for reason, count in parse_stats["failures"].items()}),
+        ("candidates_indexed", "gauge", "Candidates in the in-memory search indexes", {(): len(skill_index)}),
+    ]
+
+registry.add_collector(collect_app_metrics)
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Metrics for this worker in the Prometheus text format
+    """
+    # Starlette appends "; charset=utf-8" to text/ media types
+    return Response(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/parse-stats")
+async def parse_stats():
+    """
+    Resume parse attempts, retries, re-parse queue handoffs and failures by reason
+    """
+    return parse_metrics.stats()
+
 if __name__ == "__main__":
-    # Initialize sample data
-    initialize_sample_jobs()
-    print(f"Initialized {len(sample_jobs)} sample job postings")
-    
+    # Sample data is initialized by the startup event
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,190 @@
+import numpy as np
+
+from retrieval import top_k_indices
+
+EXPERIENCE_LEVELS = {"entry": 0, "mid": 1, "senior": 2}
+UNKNOWN_LEVEL = 3
+
+# Compatibility of a candidate's level (row) with a job's level (column): exact match
+# scores 1, one level off scores partially, and unknown levels get a neutral score
+LEVEL_COMPATIBILITY = np.array([
+    [1.0, 0.5, 0.0, 0.5],
+    [0.6, 1.0, 0.5, 0.5],
+    [0.3, 0.8, 1.0, 0.5],
+    [0.5, 0.5, 0.5, 0.5],
+], dtype=np.float32)
+
+
+def level_code(experience_level):
+    return EXPERIENCE_LEVELS.get(str(experience_level).strip().lower(), UNKNOWN_LEVEL)
+
+
+class MatchMatrix:
+    """
+    Precomputed candidate-by-job score matrix. Each score combines the fraction of the
+    job's required skills the candidate has with experience-level compatibility.
+    Adding a candidate fills one row and adding a job fills one column.
+    """
+
+    def __init__(self, normalizer, skill_weight=0.7, level_weight=0.3):
+        self.normalizer = normalizer
+        self.skill_weight = skill_weight
+        self.level_weight = level_weight
+
+        self._candidate_ids = []
+        self._candidate_rows = {}
+        self._candidate_levels = np.zeros(64, dtype=np.int8)
+        # row -> skill IDs, and col -> skill IDs, so an entry can be recomputed
+        self._candidate_skills = []
+        self._job_skills = []
+        # skill ID -> candidate rows / job columns that have it, as dicts used as ordered sets
+        self._candidate_postings = {}
+        self._job_postings = {}
+
+        self._job_ids = []
+        self._job_cols = {}
+        self._job_levels = np.zeros(16, dtype=np.int8)
+        self._job_skill_counts = np.zeros(16, dtype=np.float32)
+
+        self._scores = np.zeros((64, 16), dtype=np.float32)
+
+    @property
+    def candidate_count(self):
+        return len(self._candidate_ids)
+
+    @property
+    def job_count(self):
+        return len(self._job_ids)
+
+    def has_candidate(self, candidate_id):
+        return candidate_id in self._candidate_rows
+
+    def has_job(self, job_id):
+        return job_id in self._job_cols
+
+    def _ensure_capacity(self, rows, cols):
+        capacity_rows, capacity_cols = self._scores.shape
+        if rows <= capacity_rows and cols <= capacity_cols:
+            return
+        while capacity_rows < rows:
+            capacity_rows *= 2
+        while capacity_cols < cols:
+            capacity_cols *= 2
+        scores = np.zeros((capacity_rows, capacity_cols), dtype=np.float32)
+        n, m = self.candidate_count, self.job_count
+        scores[:n, :m] = self._scores[:n, :m]
+        self._scores = scores
+        self._candidate_levels = _grow(self._candidate_levels, capacity_rows)
+        self._job_levels = _grow(self._job_levels, capacity_cols)
+        self._job_skill_counts = _grow(self._job_skill_counts, capacity_cols)
+
+    def candidates_with(self, skill_id):
+        """IDs of the candidates with a skill"""
+        return [self._candidate_ids[row] for row in self._candidate_postings.get(skill_id, ())]
+
+    def jobs_with(self, skill_id):
+        """IDs of the jobs requiring a skill"""
+        return [self._job_ids[col] for col in self._job_postings.get(skill_id, ())]
+
+    def add_candidate(self, candidate_id, skills, experience_level):
+        """Add a candidate and compute their score row against every job"""
+        if candidate_id in self._candidate_rows:
+            return
+        row = self.candidate_count
+        self._ensure_capacity(row + 1, self.job_count)
+        self._candidate_ids.append(candidate_id)
+        self._candidate_rows[candidate_id] = row
+        self._candidate_skills.append(frozenset())
+        self._fill_candidate(row, skills, experience_level)
+
+    def update_candidate(self, candidate_id, skills, experience_level):
+        """Recompute a candidate's score row, e.g. after a skill alias changed what their skills map to"""
+        row = self._candidate_rows[candidate_id]
+        _unpost(self._candidate_postings, self._candidate_skills[row], row)
+        self._fill_candidate(row, skills, experience_level)
+
+    def _fill_candidate(self, row, skills, experience_level):
+        self._candidate_levels[row] = level_code(experience_level)
+        skill_ids = frozenset(self.normalizer.skill_ids(skills))
+        self._candidate_skills[row] = skill_ids
+
+        m = self.job_count
+        overlap = np.zeros(m, dtype=np.float32)
+        for skill_id in skill_ids:
+            self._candidate_postings.setdefault(skill_id, {})[row] = None
+            cols = self._job_postings.get(skill_id)
+            if cols:
+                overlap[list(cols)] += 1
+        self._scores[row, :m] = self._combine(
+            overlap, self._job_skill_counts[:m], self._candidate_levels[row], self._job_levels[:m]
+        )
+
+    def add_job(self, job_id, required_skills, experience_level):
+        """Add a job and compute its score column against every candidate"""
+        if job_id in self._job_cols:
+            return
+        col = self.job_count
+        self._ensure_capacity(self.candidate_count, col + 1)
+        self._job_ids.append(job_id)
+        self._job_cols[job_id] = col
+        self._job_skills.append(frozenset())
+        self._fill_job(col, required_skills, experience_level)
+
+    def update_job(self, job_id, required_skills, experience_level):
+        """Recompute a job's score column, e.g. after a skill alias changed what its skills map to"""
+        col = self._job_cols[job_id]
+        _unpost(self._job_postings, self._job_skills[col], col)
+        self._fill_job(col, required_skills, experience_level)
+
+    def _fill_job(self, col, required_skills, experience_level):
+        self._job_levels[col] = level_code(experience_level)
+        skill_ids = frozenset(self.normalizer.skill_ids(required_skills))
+        self._job_skills[col] = skill_ids
+        self._job_skill_counts[col] = len(skill_ids)
+
+        n = self.candidate_count
+        overlap = np.zeros(n, dtype=np.float32)
+        for skill_id in skill_ids:
+            self._job_postings.setdefault(skill_id, {})[col] = None
+            rows = self._candidate_postings.get(skill_id)
+            if rows:
+                overlap[list(rows)] += 1
+        self._scores[:n, col] = self._combine(
+            overlap, self._job_skill_counts[col], self._candidate_levels[:n], self._job_levels[col]
+        )
+
+    def _combine(self, overlap, skill_counts, candidate_levels, job_levels):
+        coverage = np.divide(overlap, skill_counts, out=np.zeros_like(overlap), where=skill_counts > 0)
+        return self.skill_weight * coverage + self.level_weight * LEVEL_COMPATIBILITY[candidate_levels, job_levels]
+
+    def top_candidates(self, job_id, limit=10):
+        """[(candidate_id, score)] best matches for a job, highest first"""
+        col = self._job_cols[job_id]
+        ranked = top_k_indices(self._scores[:self.candidate_count, col], limit)
+        return [(self._candidate_ids[i], float(self._scores[i, col])) for i in ranked]
+
+    def top_jobs(self, candidate_id, limit=10):
+        """[(job_id, score)] best matching jobs for a candidate, highest first"""
+        row = self._candidate_rows[candidate_id]
+        ranked = top_k_indices(self._scores[row, :self.job_count], limit)
+        return [(self._job_ids[j], float(self._scores[row, j])) for j in ranked]
+
+    def match_count(self, threshold):
+        """Number of candidate-job pairs scoring at least threshold"""
+        return int(np.count_nonzero(self._scores[:self.candidate_count, :self.job_count] >= threshold))
+
+
+def _unpost(postings, skill_ids, position):
+    """Remove a row or column from the posting lists of its skills"""
+    for skill_id in skill_ids:
+        posting = postings[skill_id]
+        del posting[position]
+        if not posting:
+            del postings[skill_id]
+
+
+def _grow(array, size):
+    grown = np.zeros(size, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def make_cache_key(content_hash, prompt, model_name):
+    """Content-addressed key: sha256 hex digest of the uploaded bytes plus the prompt and model that parsed them"""
+    version_hash = hashlib.sha256(f"{model_name}\n{prompt}".encode("utf-8")).hexdigest()[:16]
+    return f"{content_hash}:{version_hash}"
+
+
+class ParseCache:
+    """
+    Persistent, size-bounded LRU cache of resume parse results backed by SQLite in WAL mode.
+    The LRU order is approximate: a hit only refreshes an entry's access time if it is older
+    than touch_interval, and refreshed times are written in batches instead of one commit per
+    hit, so cache reads from several workers don't serialize on writes.
+    """
+
+    def __init__(self, path, max_entries=10000, touch_interval=60.0, touch_batch=100):
+        self.path = path
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.touch_batch = touch_batch
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # key -> access time not yet written, flushed by _flush_touches()
+        self._touched = {}
+        self._last_flush = time.monotonic()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        # Readers don't block the writer (or each other) across workers
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parse_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS parse_cache_last_used ON parse_cache (last_used)")
+        self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            row = self._conn.execute("SELECT value, last_used FROM parse_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            now = time.time()
+            if now - row[1] >= self.touch_interval:
+                self._touched[key] = now
+            if self._touched and (
+                len(self._touched) >= self.touch_batch or time.monotonic() - self._last_flush >= self.touch_interval
+            ):
+                self._flush_touches()
+                self._conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def _flush_touches(self):
+        """Write pending access times; the caller holds the lock and commits"""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE parse_cache SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()],
+            )
+            self._touched.clear()
+        self._last_flush = time.monotonic()
+
+    def put(self, key, value):
+        """Store a value and evict least recently used entries beyond max_entries"""
+        with self._lock:
+            # Eviction below should see the latest access times
+            self._flush_touches()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, value, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time()),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+            if count > self.max_entries:
+                evicted = self._conn.execute(
+                    "DELETE FROM parse_cache WHERE key IN "
+                    "(SELECT key FROM parse_cache ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                ).rowcount
+                self.evictions += evicted
+            self._conn.commit()
+
+    def stats(self):
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def create_parse_cache():
+    """Build a ParseCache configured from environment variables"""
+    path = os.getenv("PARSE_CACHE_PATH", "cache/parse_cache.db")
+    max_entries = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "10000"))
+    touch_interval = float(os.getenv("PARSE_CACHE_TOUCH_SECONDS", "60"))
+    return ParseCache(path, max_entries=max_entries, touch_interval=touch_interval)
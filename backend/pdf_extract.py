@@ -0,0 +1,130 @@
+import asyncio
+import mmap
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import PyPDF2
+
+from metrics import registry
+
+PDF_WORKER_RESTARTS = registry.counter(
+    "pdf_worker_restarts_total", "PDF worker pools replaced after an extraction timed out"
+)
+
+
+# Workers are not forked from the server process, which runs an event loop and threads whose
+# locks a forked child could inherit mid-use; forkserver is cheaper than spawn where available
+WORKER_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+class PDFExtractionError(Exception):
+    """Raised when text cannot be extracted from a PDF within its time budget"""
+
+
+def extract_pdf_text(path, char_budget=None, time_budget=None):
+    """
+    Extract text from a PDF file page by page, stopping early once char_budget
+    characters are collected or time_budget seconds have passed. The file is
+    memory-mapped rather than copied into memory. Runs inside a worker process.
+    """
+    deadline = time.monotonic() + time_budget if time_budget else None
+    pages = []
+    collected = 0
+    # mmap cannot map an empty file, e.g. an empty member of an uploaded zip
+    if os.path.getsize(path) == 0:
+        raise ValueError("the file is empty")
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        reader = PyPDF2.PdfReader(mapped)
+        for page in reader.pages:
+            text = page.extract_text() or ""
+            pages.append(text)
+            collected += len(text) + 1
+            if char_budget and collected >= char_budget:
+                break
+            if deadline and time.monotonic() >= deadline:
+                break
+    return " ".join(pages)
+
+
+def _report_pid(pids):
+    """Pool worker initializer: publish the worker's PID so a stuck worker can be terminated"""
+    pids.put(os.getpid())
+
+
+class PDFExtractor:
+    """Runs CPU-bound PDF text extraction in a process pool so it never holds the event loop's GIL"""
+
+    def __init__(self, max_workers=2, timeout=20.0, char_budget=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.char_budget = char_budget
+        self._executor, self._worker_pids = self._new_pool()
+        # One call per worker at a time, so the timeout measures running time rather than time
+        # queued behind other files, and a timeout means the worker itself is stuck
+        self._slots = asyncio.Semaphore(max_workers)
+
+    async def extract(self, path, retry=True):
+        """Extract text from a PDF file, raising PDFExtractionError on failure or timeout"""
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._slots:
+                executor = self._executor
+                # Workers stop between pages at the soft budget; the hard timeout covers a single slow page
+                future = loop.run_in_executor(
+                    executor, extract_pdf_text, str(path), self.char_budget, self.timeout / 2
+                )
+                return await asyncio.wait_for(future, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._restart(executor)
+            raise PDFExtractionError(f"PDF text extraction took longer than {self.timeout:g} seconds")
+        except BrokenProcessPool as e:
+            # The pool was torn down because another file timed out: run this one again on the new pool
+            if retry and executor is not self._executor:
+                return await self.extract(path, retry=False)
+            raise PDFExtractionError(f"Could not read PDF: {str(e)}")
+        except Exception as e:
+            raise PDFExtractionError(f"Could not read PDF: {str(e)}")
+
+    def _new_pool(self):
+        """A process pool and the queue its workers report their PIDs on as they start"""
+        pids = WORKER_CONTEXT.SimpleQueue()
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=WORKER_CONTEXT, initializer=_report_pid, initargs=(pids,)
+        )
+        return executor, pids
+
+    def _restart(self, executor):
+        """
+        Replace a pool whose worker is stuck on a page: later extractions go to a fresh pool and
+        the old workers are terminated, so they don't keep burning CPU on the stuck page
+        """
+        if executor is not self._executor:
+            return
+        PDF_WORKER_RESTARTS.inc()
+        pids = self._worker_pids
+        self._executor, self._worker_pids = self._new_pool()
+        executor.shutdown(wait=False, cancel_futures=True)
+        # shutdown() cannot stop a running call; calls still running on the other old workers
+        # fail with BrokenProcessPool once their workers are gone and are retried on the new pool
+        while not pids.empty():
+            try:
+                os.kill(pids.get(), signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        pids.close()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_pdf_extractor(char_budget=None):
+    """Build a PDFExtractor configured from environment variables"""
+    max_workers = int(os.getenv("PDF_WORKERS", "2"))
+    timeout = float(os.getenv("PDF_TIMEOUT_SECONDS", "20"))
+    return PDFExtractor(max_workers=max_workers, timeout=timeout, char_budget=char_budget)
@@ -0,0 +1,272 @@
+import re
+import time
+
+from candidate_store import EXPERIENCE_LEVEL_NAMES
+from resume_schema import NOT_SPECIFIED
+
+PREPARSE_FIELDS = ("name", "skills", "experience", "education", "experience_level")
+
+# Words of up to three tokens are looked up in the gazetteer ("machine learning", "node js")
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9+#]+")
+MAX_SKILL_TOKENS = 3
+
+SECTION_TITLES = {
+    "experience": ["experience", "work experience", "professional experience", "employment", "employment history",
+                   "work history", "career history"],
+    "education": ["education", "academic background", "qualifications", "academic qualifications"],
+    "skills": ["skills", "technical skills", "core skills", "key skills", "competencies", "core competencies",
+               "technologies", "tools"],
+    "summary": ["summary", "profile", "professional summary", "objective", "about me"],
+    "projects": ["projects"],
+    "certifications": ["certifications", "certificates", "licenses"],
+}
+SECTION_BY_TITLE = {title: section for section, titles in SECTION_TITLES.items() for title in titles}
+# A heading line, optionally followed by inline content: "Skills: Python, SQL"
+HEADING_PATTERN = re.compile(r"^\s*[#*•\-]*\s*([A-Za-z][A-Za-z &/]{2,40}?)\s*(?::\s*(.*)|\s*)$")
+
+EXPLICIT_YEARS_PATTERN = re.compile(
+    r"(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b(?:\s+of)?(?:\s+[A-Za-z-]+){0,3}?\s+experience",
+    re.IGNORECASE,
+)
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+_DATE = r"(?:(?P<{p}month>{months})[a-z]*\.?\s+|(?P<{p}num>\d{{1,2}})\s*/\s*)?(?P<{p}year>(?:19|20)\d{{2}})"
+DATE_RANGE_PATTERN = re.compile(
+    _DATE.format(p="start_", months="|".join(MONTHS))
+    + r"\s*(?:-|–|—|to|until)\s*(?:"
+    + _DATE.format(p="end_", months="|".join(MONTHS))
+    + r"|(?P<ongoing>present|current|now|today))",
+    re.IGNORECASE,
+)
+DEGREE_PATTERN = re.compile(
+    r"\b(ph\.?\s?d|doctorate|master'?s?|m\.?\s?sc?|mba|m\.?\s?eng|m\.?\s?tech|bachelor'?s?|b\.?\s?sc?|b\.?\s?a|"
+    r"b\.?\s?eng|b\.?\s?tech|b\.?\s?com|bsn|associate'?s? degree|diploma)\b\.?",
+    re.IGNORECASE,
+)
+LIST_SEPARATOR_PATTERN = re.compile(r"[,;|•·\n]+")
+NAME_WORD_PATTERN = re.compile(r"^[A-Z][A-Za-z'\-.]*$")
+CONTACT_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+|\+?\d[\d ()\-]{7,}\d")
+# Header lines that look like a name but are a document title, section title or job title
+NOT_NAME_TITLES = {"resume", "cv", "curriculum vitae", *SECTION_BY_TITLE}
+JOB_TITLE_WORDS = {
+    "engineer", "developer", "programmer", "manager", "analyst", "designer", "specialist", "consultant",
+    "scientist", "architect", "administrator", "director", "coordinator", "assistant", "intern", "officer",
+    "generalist", "accountant", "technician", "nurse", "teacher", "lead", "head", "executive", "recruiter",
+    "representative", "associate", "senior", "junior", "principal", "staff",
+}
+
+# Level thresholds on years of experience: below 3 is Entry, below 7 is Mid, otherwise Senior
+LEVEL_YEARS = [(3, 0), (7, 1)]
+
+
+class SkillGazetteer:
+    """
+    Known skills (job requirements and common aliases) matched against resume text by looking up
+    token n-grams through the SkillNormalizer's key table.
+    """
+
+    def __init__(self, normalizer):
+        self.normalizer = normalizer
+        self._known = set()
+
+    def __len__(self):
+        return len(self._known)
+
+    def add_skills(self, skills):
+        self._known |= self.normalizer.skill_ids(skills)
+
+    def find(self, text):
+        """Canonical names of the known skills mentioned in text, in order of first mention"""
+        tokens = TOKEN_PATTERN.findall(text)
+        found = {}
+        for start in range(len(tokens)):
+            for size in range(MAX_SKILL_TOKENS, 0, -1):
+                if start + size > len(tokens):
+                    continue
+                phrase = " ".join(tokens[start:start + size])
+                # Single letters ("R", "C") only count when written in upper case
+                if len(phrase) == 1 and not phrase.isupper():
+                    continue
+                skill_id = self.normalizer.skill_id(phrase, create=False)
+                if skill_id in self._known:
+                    found.setdefault(skill_id, self.normalizer.name(skill_id))
+                    break
+        return list(found.values())
+
+
+class PreParse:
+    """Locally extracted resume fields with a 0-1 confidence for each"""
+
+    def __init__(self, fields, confidence):
+        self.fields = fields
+        self.confidence = confidence
+
+    def uncertain_fields(self, threshold):
+        return [field for field in PREPARSE_FIELDS if self.confidence.get(field, 0.0) < threshold]
+
+    def resolve(self):
+        """
+        Fields as a parsed resume, with anything not found marked as not specified. A missing
+        name or skills are left empty, so validation rejects the resume instead of storing a placeholder.
+        """
+        data = {field: self.fields.get(field) or NOT_SPECIFIED for field in PREPARSE_FIELDS}
+        data["name"] = self.fields.get("name")
+        data["skills"] = self.fields.get("skills") or []
+        return data
+
+    def merge(self, parsed_data, threshold):
+        """
+        Model output with the confident local fields taking precedence, except the name: the
+        header heuristic only fills it in when the model found none
+        """
+        merged = dict(parsed_data)
+        for field in PREPARSE_FIELDS:
+            if self.confidence.get(field, 0.0) >= threshold and self.fields.get(field):
+                if field == "name" and merged.get("name") not in (None, "", NOT_SPECIFIED):
+                    continue
+                merged[field] = self.fields[field]
+        return merged
+
+
+def split_sections(text):
+    """{section: text} for recognized headings; text before the first heading is the "header" section"""
+    sections = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        match = HEADING_PATTERN.match(line)
+        section = SECTION_BY_TITLE.get(" ".join(match.group(1).lower().split())) if match else None
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            if match.group(2):
+                sections[current].append(match.group(2))
+            continue
+        sections[current].append(line)
+    return {section: "\n".join(lines).strip() for section, lines in sections.items()}
+
+
+def _month_index(match, prefix, default):
+    month = match.group(f"{prefix}month")
+    if month:
+        return int(match.group(f"{prefix}year")) * 12 + MONTHS.index(month[:3].lower())
+    number = match.group(f"{prefix}num")
+    month = int(number) - 1 if number and 1 <= int(number) <= 12 else default
+    return int(match.group(f"{prefix}year")) * 12 + month
+
+
+def years_from_date_ranges(text, now=None):
+    """
+    Total years covered by date ranges in text, counting overlapping ranges once. A range
+    given in years only counts whole years: "2015 - 2021" is 6 years, not January to December.
+    """
+    now = now or time.localtime()
+    current = now.tm_year * 12 + now.tm_mon - 1
+    spans = []
+    for match in DATE_RANGE_PATTERN.finditer(text):
+        start = _month_index(match, "start_", 0)
+        # Month indexes past the end of each range
+        if match.group("ongoing"):
+            end = current + 1
+        elif match.group("end_month") or match.group("end_num"):
+            end = _month_index(match, "end_", 0) + 1
+        else:
+            end = int(match.group("end_year")) * 12
+        if start <= end <= current + 1:
+            spans.append((start, end))
+    months = 0
+    covered_until = None
+    for start, end in sorted(spans):
+        if covered_until is not None and start < covered_until:
+            start = covered_until
+        if end > start:
+            months += end - start
+            covered_until = end
+    return months / 12 if spans else None
+
+
+def _looks_like_name(line):
+    words = line.split()
+    if not 2 <= len(words) <= 4 or not all(NAME_WORD_PATTERN.match(word) for word in words):
+        return False
+    lowered = [word.lower().strip(".") for word in words]
+    return " ".join(lowered) not in NOT_NAME_TITLES and JOB_TITLE_WORDS.isdisjoint(lowered)
+
+
+def extract_name(sections):
+    """
+    A capitalized 2-4 word line near the top of the header. It is only a guess: confident enough
+    to skip the model when it is the first line and contact details follow, low otherwise.
+    """
+    header = sections.get("header", "")
+    lines = [line.strip() for line in header.splitlines() if line.strip()][:5]
+    for index, line in enumerate(lines):
+        if _looks_like_name(line):
+            confident = index == 0 and CONTACT_PATTERN.search(header)
+            return line, 0.8 if confident else 0.6
+    return None, 0.0
+
+
+def extract_skills(sections, text, gazetteer):
+    listed = sections.get("skills")
+    if listed:
+        items = []
+        for item in LIST_SEPARATOR_PATTERN.split(listed):
+            item = item.strip(" -*\t")
+            if item and len(item.split()) <= 4:
+                skill_id = gazetteer.normalizer.skill_id(item, create=False)
+                items.append(gazetteer.normalizer.name(skill_id) if skill_id is not None else item)
+        if len(items) >= 2:
+            return list(dict.fromkeys(items)), 0.9
+    found = gazetteer.find(text)
+    if len(found) >= 3:
+        return found, 0.7
+    return found, 0.4 if found else 0.0
+
+
+def extract_experience(sections, text):
+    # "N years of experience" is only about the candidate in their summary or experience section;
+    # elsewhere it may describe a job they applied for or a project requirement
+    for section, confidence in (("summary", 0.9), ("experience", 0.85)):
+        match = EXPLICIT_YEARS_PATTERN.search(sections.get(section, ""))
+        if match:
+            return float(match.group(1)), confidence
+    if sections.get("experience"):
+        years = years_from_date_ranges(sections["experience"])
+        if years is not None:
+            return years, 0.8
+    years = years_from_date_ranges(text)
+    return (years, 0.5) if years is not None else (None, 0.0)
+
+
+def extract_education(sections, text):
+    for source, confidence in ((sections.get("education", ""), 0.85), (text, 0.6)):
+        for line in source.splitlines():
+            if DEGREE_PATTERN.search(line):
+                return " ".join(line.split())[:120], confidence
+    return None, 0.0
+
+
+def experience_level(years):
+    for limit, code in LEVEL_YEARS:
+        if years < limit:
+            return EXPERIENCE_LEVEL_NAMES[code]
+    return EXPERIENCE_LEVEL_NAMES[2]
+
+
+def preparse_resume(text, gazetteer):
+    """Extract resume fields with regexes, section detection and the skill gazetteer"""
+    sections = split_sections(text)
+    fields = {}
+    confidence = {}
+    fields["name"], confidence["name"] = extract_name(sections)
+    fields["skills"], confidence["skills"] = extract_skills(sections, text, gazetteer)
+    years, confidence["experience"] = extract_experience(sections, text)
+    fields["education"], confidence["education"] = extract_education(sections, text)
+    if years is not None:
+        fields["experience"] = f"{round(years, 1):g}"
+        fields["experience_level"] = experience_level(years)
+        # Levels near a threshold are less certain than the years themselves
+        confidence["experience_level"] = confidence["experience"] * 0.9
+    else:
+        fields["experience"] = fields["experience_level"] = None
+        confidence["experience_level"] = 0.0
+    return PreParse(fields, confidence)
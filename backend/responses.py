@@ -0,0 +1,101 @@
+import asyncio
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.middleware.gzip import GZipMiddleware
+
+try:
+    import orjson
+except ImportError:  # falls back to the standard library encoder
+    orjson = None
+
+if orjson is not None:
+    # Dict keys that are not strings and numpy scalars are serialized like json.dumps would
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson when it is installed"""
+
+    def render(self, content):
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZip for responses over minimum_size, except paths with excluded suffixes: the gzip stream
+    is only flushed when the response ends, which would hold back server-sent events.
+    """
+
+    def __init__(self, app, minimum_size=1000, compresslevel=6, excluded_suffixes=("/stream",)):
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.excluded_suffixes = tuple(excluded_suffixes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].rstrip("/").endswith(self.excluded_suffixes):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+def parse_fields(fields, allowed):
+    """
+    Field names requested with a `fields=` projection (a comma-separated string or a list),
+    or None for all fields. Unknown names are a 400 error.
+    """
+    if fields is None:
+        return None
+    names = fields.split(",") if isinstance(fields, str) else fields
+    names = [name.strip() for name in names if name.strip()]
+    unknown = sorted(set(names) - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(allowed)}",
+        )
+    return names or None
+
+
+def project(data, fields):
+    """Copy of data with only the given fields; data itself when fields is None"""
+    if fields is None:
+        return data
+    return {name: data[name] for name in fields if name in data}
+
+
+def truncate_text(text, max_chars):
+    if max_chars is None or not isinstance(text, str) or len(text) <= max_chars:
+        return text
+    return text[:max_chars]
+
+
+async def with_keepalive(events, interval):
+    """
+    Pass server-sent events through, sending a `: keepalive` comment whenever none was sent for
+    `interval` seconds, so clients and proxies with a read timeout keep waiting on a slow event
+    (a call queued behind others at the Gemini scheduler)
+    """
+    events = events.__aiter__()
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(events.__anext__())
+            done, _ = await asyncio.wait({pending}, timeout=interval)
+            if not done:
+                yield ": keepalive\n\n"
+                continue
+            next_event, pending = pending, None
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                return
+            yield event
+    finally:
+        # The client disconnected: stop the event source too
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        await events.aclose()
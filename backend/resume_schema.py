@@ -0,0 +1,120 @@
+import json
+import re
+from collections import Counter
+from typing import Annotated, List
+
+from pydantic import BaseModel, Field, StringConstraints, ValidationError, field_validator
+
+from candidate_store import EXPERIENCE_LEVEL_NAMES
+from matching import UNKNOWN_LEVEL, level_code
+
+# JSON wrapped in markdown code fences, with or without a language tag
+JSON_BLOCK_PATTERN = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```")
+
+NOT_SPECIFIED = "Not specified"
+# Names a model writes when it found none; a resume without a name is re-parsed, not stored
+PLACEHOLDER_NAMES = frozenset({"not specified", "unknown", "n/a", "none", "null"})
+
+
+class ResumeParseError(Exception):
+    """A model response that could not be turned into a valid resume; reason is a short metric label"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+class ParsedResume(BaseModel):
+    """Structured resume fields returned by the model"""
+
+    # Required: stripped before the length check, so a missing or blank name fails validation
+    name: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+    skills: List[str] = Field(min_length=1)
+    experience: str = NOT_SPECIFIED
+    education: str = NOT_SPECIFIED
+    experience_level: str = NOT_SPECIFIED
+
+    @field_validator("name", "experience", "education", "experience_level", mode="before")
+    @classmethod
+    def coerce_text(cls, value, info):
+        if value is None:
+            # A null name stays null and fails validation; other fields fall back to the placeholder
+            return value if info.field_name == "name" else NOT_SPECIFIED
+        if isinstance(value, (int, float)):
+            return str(value)
+        if isinstance(value, list):
+            return ", ".join(str(item) for item in value)
+        return value
+
+    @field_validator("name")
+    @classmethod
+    def real_name(cls, value):
+        if value.lower() in PLACEHOLDER_NAMES:
+            raise ValueError("name is a placeholder")
+        return value
+
+    @field_validator("skills", mode="before")
+    @classmethod
+    def split_skills(cls, value):
+        if isinstance(value, str):
+            value = value.split(",")
+        if isinstance(value, list):
+            # Blank entries don't count towards the required skill
+            return [skill.strip() if isinstance(skill, str) else skill
+                    for skill in value if not (isinstance(skill, str) and not skill.strip())]
+        return value
+
+    @field_validator("experience_level")
+    @classmethod
+    def canonical_level(cls, value):
+        # Search partitions on the exact label, so "mid" or "MID" become "Mid"
+        code = level_code(value)
+        return NOT_SPECIFIED if code == UNKNOWN_LEVEL else EXPERIENCE_LEVEL_NAMES[code]
+
+
+# Embedded in prompts so the model sees the exact shape it must return
+RESUME_JSON_SCHEMA = json.dumps(ParsedResume.model_json_schema()["properties"])
+
+
+def extract_json(response_text):
+    """Parse the JSON payload of a model response, with or without markdown code fences"""
+    match = JSON_BLOCK_PATTERN.search(response_text)
+    json_str = match.group(1) if match else response_text.strip()
+    try:
+        return json.loads(json_str)
+    except json.JSONDecodeError as e:
+        raise ResumeParseError("invalid_json", f"Response is not valid JSON: {e}")
+
+
+def validate_resume(data):
+    """Validate one parsed resume object; returns a plain dict"""
+    if not isinstance(data, dict):
+        raise ResumeParseError("invalid_shape", f"Expected a JSON object, got {type(data).__name__}")
+    try:
+        return ParsedResume.model_validate(data).model_dump()
+    except ValidationError as e:
+        raise ResumeParseError("validation", f"Resume failed validation: {e.error_count()} errors")
+
+
+class ParseMetrics:
+    """Counters for resume parse attempts, retries and failures by reason"""
+
+    def __init__(self):
+        self.attempts = 0
+        self.successes = 0
+        self.retries = 0
+        self.requeued = 0
+        # Resumes resolved by the local pre-parser without a Gemini call
+        self.local_parses = 0
+        self.failures = Counter()
+
+    def stats(self):
+        return {
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "retries": self.retries,
+            "requeued": self.requeued,
+            "local_parses": self.local_parses,
+            "failures": dict(self.failures),
+            "failure_rate": round(sum(self.failures.values()) / self.attempts, 4) if self.attempts else 0.0,
+        }
@@ -0,0 +1,172 @@
+import hashlib
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def tokenize(text):
+    """Lowercase word tokens, keeping symbols used in skill names (c++, c#, node.js)"""
+    return [token.rstrip(".") for token in TOKEN_PATTERN.findall(str(text).lower())]
+
+
+def hashed_embedding(tokens, dim):
+    """Signed feature-hashing embedding, L2-normalized"""
+    vector = np.zeros(dim, dtype=np.float32)
+    for token, count in Counter(tokens).items():
+        digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+        sign = 1.0 if digest & 1 else -1.0
+        vector[(digest >> 1) % dim] += sign * (1.0 + math.log(count))
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+class HybridSearchEngine:
+    """
+    In-memory BM25 over resume text fused with dense similarity, with top-k scoring. Dense
+    vectors are not kept here: they are read from the shared VectorStore of resume embeddings,
+    and embed_fn embeds the query text the same way.
+    """
+
+    def __init__(self, vector_store, embed_fn, k1=1.5, b=0.75, alpha=0.5):
+        self.vector_store = vector_store
+        self.embed_fn = embed_fn
+        self.k1 = k1
+        self.b = b
+        # Weight of the BM25 score in the fused score; the rest goes to the dense score
+        self.alpha = alpha
+
+        self._ids = []
+        self._rows = {}
+        # term -> {row: term frequency}
+        self._postings = {}
+        self._doc_len = np.zeros(64, dtype=np.float32)
+        self._alive = np.zeros(64, dtype=bool)
+        # Row of each document's vector in vector_store, or -1 until it has been looked up
+        self._vector_rows = np.full(64, -1, dtype=np.int64)
+        self._total_len = 0.0
+        self._live_count = 0
+
+    def __len__(self):
+        return self._live_count
+
+    def _grow(self):
+        capacity = self._doc_len.shape[0] * 2
+        self._doc_len = np.resize(self._doc_len, capacity)
+        self._doc_len[len(self._ids):] = 0
+        self._alive = np.resize(self._alive, capacity)
+        self._alive[len(self._ids):] = False
+        self._vector_rows = np.resize(self._vector_rows, capacity)
+        self._vector_rows[len(self._ids):] = -1
+
+    def add(self, doc_id, text):
+        """Index a document, replacing any previous version with the same ID"""
+        self.remove(doc_id)
+        if len(self._ids) == self._doc_len.shape[0]:
+            self._grow()
+
+        tokens = tokenize(text)
+        row = len(self._ids)
+        self._ids.append(doc_id)
+        self._rows[doc_id] = row
+        for term, count in Counter(tokens).items():
+            self._postings.setdefault(term, {})[row] = count
+        self._doc_len[row] = len(tokens)
+        self._alive[row] = True
+        self._total_len += len(tokens)
+        self._live_count += 1
+
+    def remove(self, doc_id):
+        """Tombstone a document; its postings are skipped at query time"""
+        row = self._rows.pop(doc_id, None)
+        if row is None:
+            return
+        self._alive[row] = False
+        self._total_len -= float(self._doc_len[row])
+        self._live_count -= 1
+
+    def bm25_scores(self, query_tokens, rows):
+        """BM25 score of each of the given rows (ascending row numbers) for the query"""
+        scores = np.zeros(len(rows), dtype=np.float32)
+        if not self._live_count or not len(rows):
+            return scores
+        avgdl = self._total_len / self._live_count or 1.0
+        norm = self.k1 * (1 - self.b + self.b * self._doc_len[rows] / avgdl)
+        for term in set(query_tokens):
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            posting_rows = np.fromiter(posting.keys(), dtype=np.int64, count=len(posting))
+            tfs = np.fromiter(posting.values(), dtype=np.float32, count=len(posting))
+            live = self._alive[posting_rows]
+            df = int(live.sum())
+            if not df:
+                continue
+            idf = math.log(1 + (self._live_count - df + 0.5) / (df + 0.5))
+            # Positions of the posting rows among the rows being scored
+            positions = np.minimum(np.searchsorted(rows, posting_rows), len(rows) - 1)
+            hit = live & (rows[positions] == posting_rows)
+            positions, tfs = positions[hit], tfs[hit]
+            scores[positions] += idf * tfs * (self.k1 + 1) / (tfs + norm[positions])
+        return scores
+
+    def dense_scores(self, query_vector, rows):
+        """Cosine similarity of the query vector to each of the given rows; 0 for rows not embedded yet"""
+        # Vectors are appended after their document is indexed, so rows not found yet are looked up again
+        unresolved = rows[self._vector_rows[rows] < 0]
+        if len(unresolved):
+            self._vector_rows[unresolved] = self.vector_store.row_indexes([self._ids[row] for row in unresolved])
+        return self.vector_store.scores(self._vector_rows[rows], query_vector)
+
+    def search(self, query_text, doc_ids=None, limit=20, offset=0):
+        """
+        Rank documents for a query and return (total, [(doc_id, score), ...]) for one page.
+        If doc_ids is given, only those documents are ranked.
+        """
+        n = len(self._ids)
+        if doc_ids is None:
+            rows = np.flatnonzero(self._alive[:n])
+        else:
+            rows = np.unique(np.fromiter((self._rows[d] for d in doc_ids if d in self._rows), dtype=np.int64))
+        total = len(rows)
+        if not total or offset >= total:
+            return total, []
+
+        tokens = tokenize(query_text)
+        lexical = self.bm25_scores(tokens, rows)
+        dense = self.dense_scores(self.embed_fn(query_text), rows)
+        fused = self.alpha * _min_max_normalize(lexical) + (1 - self.alpha) * _min_max_normalize(dense)
+
+        top = top_k_indices(fused, offset + limit)[offset:]
+        return total, [(self._ids[rows[i]], float(fused[i])) for i in top]
+
+
+def top_k_indices(scores, k):
+    """
+    Indices of the k highest scores, best first, with ties in index order. Every score tied
+    with the k-th is kept through the partition, so the cut at k (and each page of a ranking)
+    is the same on every call.
+    """
+    if k <= 0:
+        return np.arange(0)
+    if k < len(scores):
+        cutoff = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= cutoff)
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+
+
+def _min_max_normalize(scores):
+    """Scale scores to [0, 1]; all-equal scores map to 1 if positive, else 0"""
+    if not len(scores):
+        return scores
+    low, high = scores.min(), scores.max()
+    if high <= low:
+        return np.full_like(scores, 1.0 if high > 0 else 0.0)
+    return (scores - low) / (high - low)
@@ -0,0 +1,103 @@
+import asyncio
+import hashlib
+
+from metrics import registry
+
+SINGLE_FLIGHT_CALLS = registry.counter(
+    "singleflight_calls_total", "Single-flight calls by whether they started the work or joined one in flight",
+    ["flight", "role"]
+)
+
+
+def prompt_key(*parts):
+    """sha256 of the prompt (and anything else that changes the result, such as the generation config)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class _Broadcast:
+    """Chunks produced so far by one streaming call, replayed to every subscriber"""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.changed = asyncio.Event()
+
+    def _notify(self):
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+    async def run(self, iterator):
+        try:
+            async for chunk in iterator:
+                self.chunks.append(chunk)
+                self._notify()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._notify()
+
+    async def subscribe(self):
+        position = 0
+        while True:
+            changed = self.changed
+            while position < len(self.chunks):
+                yield self.chunks[position]
+                position += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await changed.wait()
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first caller starts the work
+    as a task and later callers await the same task until it finishes. The work is shielded,
+    so a caller that goes away (a closed browser tab) does not cancel it for the others.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    def _start(self, key, start):
+        """The in-flight entry for key, created with start() -> (entry, task) when there is none"""
+        entry = self._calls.get(key)
+        if entry is not None:
+            SINGLE_FLIGHT_CALLS.inc(flight=self.name, role="shared")
+            return entry
+        SINGLE_FLIGHT_CALLS.inc(flight=self.name, role="leader")
+        entry, task = start()
+        self._calls[key] = entry
+        task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return entry
+
+    async def do(self, key, fn):
+        """Result of fn() (a coroutine function), shared with concurrent callers using the same key"""
+        def start():
+            task = asyncio.ensure_future(fn())
+            return task, task
+
+        return await asyncio.shield(self._start(key, start))
+
+    async def stream(self, key, fn):
+        """
+        Yield the chunks of fn() (an async iterator factory), shared with concurrent callers
+        using the same key; callers joining late first receive the chunks produced so far.
+        """
+        def start():
+            broadcast = _Broadcast()
+            return broadcast, asyncio.ensure_future(broadcast.run(fn()))
+
+        async for chunk in self._start(key, start).subscribe():
+            yield chunk
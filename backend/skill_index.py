@@ -0,0 +1,60 @@
+from collections import defaultdict
+
+
+class SkillIndex:
+    """Inverted index from canonical skill ID to candidate IDs, partitioned by experience level"""
+
+    def __init__(self, normalizer):
+        self.normalizer = normalizer
+        # experience_level -> skill ID -> set of candidate IDs
+        self._postings = defaultdict(lambda: defaultdict(set))
+        # candidate_id -> (experience_level, skill IDs), used for removal
+        self._entries = {}
+        # candidate_id -> insertion sequence, keeps results in upload order
+        self._order = {}
+        self._next_seq = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, candidate_id, skills, experience_level):
+        """Index a candidate, replacing any previous entry for the same ID but keeping its place in upload order"""
+        seq = self._order.get(candidate_id)
+        if candidate_id in self._entries:
+            self.remove(candidate_id)
+        skill_ids = frozenset(self.normalizer.skill_ids(skills))
+        partition = self._postings[experience_level]
+        for skill_id in skill_ids:
+            partition[skill_id].add(candidate_id)
+        self._entries[candidate_id] = (experience_level, skill_ids)
+        if seq is None:
+            seq = self._next_seq
+            self._next_seq += 1
+        self._order[candidate_id] = seq
+
+    def remove(self, candidate_id):
+        """Drop a candidate from every posting list it appears in"""
+        entry = self._entries.pop(candidate_id, None)
+        if entry is None:
+            return
+        self._order.pop(candidate_id, None)
+        experience_level, skill_ids = entry
+        partition = self._postings[experience_level]
+        for skill_id in skill_ids:
+            posting = partition.get(skill_id)
+            if posting is not None:
+                posting.discard(candidate_id)
+                if not posting:
+                    del partition[skill_id]
+
+    def search(self, skills, experience_level):
+        """Return IDs of candidates at the given level with any of the skills, in upload order"""
+        partition = self._postings.get(experience_level)
+        if not partition:
+            return []
+        matched = set()
+        for skill_id in self.normalizer.skill_ids(skills, create=False):
+            posting = partition.get(skill_id)
+            if posting:
+                matched |= posting
+        return sorted(matched, key=self._order.__getitem__)
@@ -0,0 +1,122 @@
+import re
+
+# Parenthesized qualifiers like "Python (5 years)" and separators that vary between spellings
+QUALIFIER_PATTERN = re.compile(r"\([^)]*\)")
+SEPARATOR_PATTERN = re.compile(r"[\s.\-_/]+")
+
+# Common aliases for canonical skill names; canonicals not used by any job are added as well
+DEFAULT_ALIASES = {
+    "JavaScript": ["JS", "ECMAScript"],
+    "TypeScript": ["TS"],
+    "Node.js": ["Node", "NodeJS"],
+    "React": ["ReactJS", "React.js"],
+    "Python": ["Python3", "Python 3"],
+    "Machine Learning": ["ML"],
+    "Kubernetes": ["K8s"],
+    "CI/CD": ["Continuous Integration", "Continuous Delivery"],
+    "AWS": ["Amazon Web Services"],
+    "MongoDB": ["Mongo"],
+    "PostgreSQL": ["Postgres"],
+    "PowerBI": ["Power BI"],
+    "Excel": ["Microsoft Excel", "MS Excel"],
+    "SEO": ["Search Engine Optimization"],
+    "SEM": ["Search Engine Marketing"],
+    "3D Modeling": ["3D Modelling"],
+    "Adobe XD": ["XD"],
+    "HRIS": ["Human Resources Information System"],
+}
+
+
+def normalize_skill(skill):
+    """Normalize a skill string for lookups: lowercase, whitespace collapsed"""
+    return " ".join(str(skill).lower().split())
+
+
+def skill_key(skill):
+    """Lookup key that treats "Node.js", "NodeJS" and "node js" as the same skill"""
+    key = QUALIFIER_PATTERN.sub("", normalize_skill(skill))
+    return SEPARATOR_PATTERN.sub("", key)
+
+
+class SkillNormalizer:
+    """
+    Canonicalizes free-form skill strings to interned integer IDs through an alias table.
+    Unknown skills are interned on first sight so every distinct skill gets a stable ID.
+    """
+
+    def __init__(self):
+        # lookup key -> skill ID
+        self._ids = {}
+        # skill ID -> its lookup keys (a dict used as an ordered set), so spellings are found without a scan
+        self._keys = []
+        # skill ID -> canonical display name
+        self._names = []
+
+    def __len__(self):
+        return len(self._names)
+
+    def seed(self, jobs):
+        """Register the required skills of job postings as canonical names, plus the default aliases"""
+        for job in jobs:
+            for skill in job["required_skills"]:
+                self.add_skill(skill)
+        for canonical, aliases in DEFAULT_ALIASES.items():
+            self.add_skill(canonical, aliases)
+
+    def add_skill(self, canonical, aliases=()):
+        """Register a canonical skill and its aliases; returns its ID"""
+        skill_id = self.skill_id(canonical)
+        for alias in aliases:
+            key = skill_key(alias)
+            previous = self._ids.get(key)
+            if previous is not None:
+                self._keys[previous].pop(key, None)
+            self._ids[key] = skill_id
+            self._keys[skill_id][key] = None
+        return skill_id
+
+    def add_alias(self, alias, canonical):
+        """Point an alias at a canonical skill, creating the canonical if needed; returns its ID"""
+        return self.add_skill(canonical, [alias])
+
+    def skill_id(self, skill, create=True):
+        """ID for a skill string; None for unknown skills when create is False"""
+        key = skill_key(skill)
+        if not key:
+            return None
+        skill_id = self._ids.get(key)
+        if skill_id is None and create:
+            skill_id = len(self._names)
+            self._ids[key] = skill_id
+            self._keys.append({key: None})
+            self._names.append(str(skill).strip())
+        return skill_id
+
+    def skill_ids(self, skills, create=True):
+        """Set of IDs for a list of skill strings, skipping unknown ones when create is False"""
+        if isinstance(skills, str):
+            skills = [skills]
+        ids = (self.skill_id(skill, create) for skill in skills or [])
+        return {skill_id for skill_id in ids if skill_id is not None}
+
+    def name(self, skill_id):
+        return self._names[skill_id]
+
+    def canonical(self, skill):
+        """Canonical display name for a skill string"""
+        return self.name(self.skill_id(skill))
+
+    def lookup_keys(self, skill):
+        """Lookup keys of every spelling registered for the same skill, including skill's own key"""
+        key = skill_key(skill)
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            return {key} if key else set()
+        return set(self._keys[skill_id])
+
+    def aliases(self):
+        """{canonical name: [lookup keys]} for every registered skill"""
+        table = {name: [] for name in self._names}
+        for name, keys in zip(self._names, self._keys):
+            table[name].extend(keys)
+        return table
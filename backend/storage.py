@@ -0,0 +1,356 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from candidate_store import CandidateStore
+from skills import SkillNormalizer, skill_key
+
+
+class Storage(ABC):
+    """Interface for candidate and job persistence"""
+
+    @abstractmethod
+    def add_resumes(self, records):
+        """Store (candidate_id, parsed_data, text) records in one batch"""
+
+    def add_resume(self, candidate_id, parsed_data, text):
+        self.add_resumes([(candidate_id, parsed_data, text)])
+
+    @abstractmethod
+    def get_resume(self, candidate_id):
+        """Parsed data for a candidate, or None"""
+
+    @abstractmethod
+    def get_resumes(self, candidate_ids):
+        """{candidate_id: parsed_data} for the candidates that exist"""
+
+    @abstractmethod
+    def resumes_since(self, seq, limit=1000):
+        """[(seq, candidate_id, parsed_data, text)] stored after seq, in insertion order"""
+
+    @abstractmethod
+    def count_resumes(self):
+        pass
+
+    @abstractmethod
+    def add_jobs(self, records):
+        """Store (job_id, job_data) records in one batch"""
+
+    def add_job(self, job_id, job_data):
+        self.add_jobs([(job_id, job_data)])
+
+    @abstractmethod
+    def seed_jobs(self, records):
+        """Store records only if there are no jobs yet; returns True if they were stored"""
+
+    @abstractmethod
+    def list_jobs(self, limit=None, offset=0, experience_level=None, skill=None):
+        """[(job_id, job_data)] in insertion order, optionally filtered by level and required skill"""
+
+    @abstractmethod
+    def count_jobs(self, experience_level=None, skill=None):
+        pass
+
+    @abstractmethod
+    def jobs_revision(self):
+        """Counter that increases whenever jobs are written; used for ETags"""
+
+    @abstractmethod
+    def add_skill_alias(self, alias, canonical):
+        """Record that alias names the canonical skill"""
+
+    @abstractmethod
+    def skill_aliases_since(self, seq):
+        """[(seq, alias, canonical)] recorded after seq, in insertion order"""
+
+
+class MemoryStorage(Storage):
+    """
+    Process-local storage; data is lost on restart and not shared between workers.
+    Parsed resumes are kept in a compact CandidateStore rather than as dicts. A resume's text
+    is only held until resumes_since has handed it to the search indexes once; later reads
+    of the same rows return an empty text.
+    """
+
+    def __init__(self, normalizer=None):
+        self.normalizer = normalizer if normalizer is not None else SkillNormalizer()
+        self._resumes = CandidateStore()
+        # Candidate IDs in insertion order, read by resumes_since
+        self._resume_log = []
+        # seq -> text not yet returned by resumes_since
+        self._pending_texts = {}
+        self._jobs = {}
+        self._jobs_revision = 0
+        self._skill_aliases = []
+        self._lock = threading.Lock()
+
+    def add_resumes(self, records):
+        with self._lock:
+            for candidate_id, parsed_data, text in records:
+                self._resumes.add(candidate_id, parsed_data)
+                self._resume_log.append(candidate_id)
+                self._pending_texts[len(self._resume_log)] = text
+
+    def get_resume(self, candidate_id):
+        return self._resumes.get(candidate_id)
+
+    def get_resumes(self, candidate_ids):
+        return {cid: self._resumes.get(cid) for cid in candidate_ids if cid in self._resumes}
+
+    def resumes_since(self, seq, limit=1000):
+        with self._lock:
+            return [
+                (row_seq, cid, self._resumes.get(cid), self._pending_texts.pop(row_seq, ""))
+                for row_seq, cid in enumerate(self._resume_log[seq:seq + limit], start=seq + 1)
+            ]
+
+    def count_resumes(self):
+        return len(self._resumes)
+
+    def add_jobs(self, records):
+        with self._lock:
+            for job_id, job_data in records:
+                # Re-insert so a replaced job moves to the end, as in SQLiteStorage
+                self._jobs.pop(job_id, None)
+                self._jobs[job_id] = job_data
+                self._jobs_revision += 1
+
+    def seed_jobs(self, records):
+        with self._lock:
+            if self._jobs:
+                return False
+            records = list(records)
+            self._jobs.update(records)
+            self._jobs_revision += len(records)
+            return True
+
+    def _filter_jobs(self, experience_level, skill):
+        jobs = list(self._jobs.items())
+        if experience_level is not None:
+            jobs = [(job_id, data) for job_id, data in jobs if data.get("experience_level") == experience_level]
+        if skill is not None:
+            wanted = self.normalizer.lookup_keys(skill)
+            jobs = [
+                (job_id, data) for job_id, data in jobs
+                if any(skill_key(s) in wanted for s in data.get("required_skills") or [])
+            ]
+        return jobs
+
+    def list_jobs(self, limit=None, offset=0, experience_level=None, skill=None):
+        jobs = self._filter_jobs(experience_level, skill)
+        return jobs[offset:] if limit is None else jobs[offset:offset + limit]
+
+    def count_jobs(self, experience_level=None, skill=None):
+        if experience_level is None and skill is None:
+            return len(self._jobs)
+        return len(self._filter_jobs(experience_level, skill))
+
+    def jobs_revision(self):
+        return self._jobs_revision
+
+    def add_skill_alias(self, alias, canonical):
+        with self._lock:
+            self._skill_aliases.append((alias, canonical))
+
+    def skill_aliases_since(self, seq):
+        return [
+            (seq + offset + 1, alias, canonical)
+            for offset, (alias, canonical) in enumerate(self._skill_aliases[seq:])
+        ]
+
+
+class SQLiteStorage(Storage):
+    """
+    Embedded SQLite storage in WAL mode, safe to share between several uvicorn workers.
+    Resumes are JSON documents read by ID or in insertion order; filtering candidates by skill
+    and level is served by the in-memory SkillIndex. Job experience levels and skills are
+    stored in indexed columns next to the JSON documents for /jobs filters.
+    """
+
+    def __init__(self, path, normalizer=None):
+        self.path = path
+        # Expands a skill filter to all of its registered spellings
+        self.normalizer = normalizer if normalizer is not None else SkillNormalizer()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # sqlite3 keeps compiled statements in a per-connection cache, so the fixed
+        # SQL strings below are prepared once and reused
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, cached_statements=256)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS resumes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                candidate_id TEXT NOT NULL UNIQUE,
+                data TEXT NOT NULL,
+                text TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS jobs (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL UNIQUE,
+                experience_level TEXT,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_experience_level ON jobs (experience_level);
+            -- One row per skill_key() of a job's required skills
+            CREATE TABLE IF NOT EXISTS job_skills (
+                job_id TEXT NOT NULL,
+                skill TEXT NOT NULL,
+                PRIMARY KEY (skill, job_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS skill_aliases (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                alias TEXT NOT NULL,
+                canonical TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def add_resumes(self, records):
+        now = time.time()
+        resume_rows = [
+            (candidate_id, json.dumps(parsed_data), text, now) for candidate_id, parsed_data, text in records
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO resumes (candidate_id, data, text, created_at) VALUES (?, ?, ?, ?)",
+                resume_rows,
+            )
+
+    def get_resume(self, candidate_id):
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM resumes WHERE candidate_id = ?", (candidate_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_resumes(self, candidate_ids):
+        candidate_ids = list(candidate_ids)
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(candidate_ids), 500):
+            chunk = candidate_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT candidate_id, data FROM resumes WHERE candidate_id IN ({placeholders})", chunk
+                ).fetchall()
+            found.update((cid, json.loads(data)) for cid, data in rows)
+        return found
+
+    def resumes_since(self, seq, limit=1000):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, candidate_id, data, text FROM resumes WHERE seq > ? ORDER BY seq LIMIT ?",
+                (seq, limit),
+            ).fetchall()
+        return [(row_seq, cid, json.loads(data), text) for row_seq, cid, data, text in rows]
+
+    def count_resumes(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def add_jobs(self, records):
+        with self._lock, self._conn:
+            self._insert_jobs(records)
+
+    def _insert_jobs(self, records):
+        now = time.time()
+        records = list(records)
+        self._conn.executemany(
+            "DELETE FROM job_skills WHERE job_id = ?",
+            [(job_id,) for job_id, _ in records],
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO jobs (job_id, experience_level, data, created_at) VALUES (?, ?, ?, ?)",
+            [(job_id, job_data.get("experience_level"), json.dumps(job_data), now) for job_id, job_data in records],
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO job_skills (job_id, skill) VALUES (?, ?)",
+            _job_skill_rows(records),
+        )
+
+    def seed_jobs(self, records):
+        # BEGIN IMMEDIATE takes the write lock first, so only one worker seeds an empty table
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute("SELECT 1 FROM jobs LIMIT 1").fetchone():
+                    self._conn.rollback()
+                    return False
+                self._insert_jobs(records)
+                self._conn.commit()
+                return True
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def _job_filters(self, experience_level, skill):
+        clauses = []
+        params = []
+        if experience_level is not None:
+            clauses.append("experience_level = ?")
+            params.append(experience_level)
+        if skill is not None:
+            keys = sorted(self.normalizer.lookup_keys(skill))
+            placeholders = ",".join("?" * len(keys))
+            clauses.append(f"job_id IN (SELECT job_id FROM job_skills WHERE skill IN ({placeholders}))")
+            params.extend(keys)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def list_jobs(self, limit=None, offset=0, experience_level=None, skill=None):
+        where, params = self._job_filters(experience_level, skill)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT job_id, data FROM jobs{where} ORDER BY seq LIMIT ? OFFSET ?",
+                (*params, -1 if limit is None else limit, offset),
+            ).fetchall()
+        return [(job_id, json.loads(data)) for job_id, data in rows]
+
+    def count_jobs(self, experience_level=None, skill=None):
+        where, params = self._job_filters(experience_level, skill)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0]
+
+    def jobs_revision(self):
+        # Every insert or replace takes a new AUTOINCREMENT seq, so the max only grows on writes
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM jobs").fetchone()[0]
+
+    def add_skill_alias(self, alias, canonical):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO skill_aliases (alias, canonical, created_at) VALUES (?, ?, ?)",
+                (alias, canonical, time.time()),
+            )
+
+    def skill_aliases_since(self, seq):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT seq, alias, canonical FROM skill_aliases WHERE seq > ? ORDER BY seq", (seq,)
+            ).fetchall()
+
+
+def _job_skill_rows(records):
+    return [
+        (job_id, skill)
+        for job_id, job_data in records
+        for skill in {skill_key(skill) for skill in job_data.get("required_skills") or []}
+    ]
+
+
+def create_storage(normalizer=None):
+    """Build the storage backend selected by STORAGE_BACKEND (sqlite or memory)"""
+    backend = os.getenv("STORAGE_BACKEND", "sqlite").lower()
+    if backend == "memory":
+        return MemoryStorage(normalizer)
+    if backend == "sqlite":
+        return SQLiteStorage(os.getenv("STORAGE_PATH", "data/recruitment.db"), normalizer)
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
@@ -0,0 +1,53 @@
+import asyncio
+import unittest
+
+from llm_client import LLM_REQUESTS, LLMClient
+from llm_scheduler import LLMScheduler
+
+
+def requests(call, outcome):
+    """llm_requests_total for one call type and outcome"""
+    return dict(LLM_REQUESTS._values).get((("call", call), ("outcome", outcome)), 0)
+
+
+class Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class StreamingModel:
+    """Fake Gemini model streaming `chunks`, then waiting until cancelled"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        async def produce():
+            for text in self.chunks:
+                yield Chunk(text)
+            await asyncio.sleep(3600)
+        return produce()
+
+
+class StreamCancelTest(unittest.IsolatedAsyncioTestCase):
+    async def test_reader_closing_the_stream_is_counted_as_cancelled_and_charged(self):
+        scheduler = LLMScheduler(max_concurrency=1, requests_per_minute=100_000)
+        charged = []
+        scheduler.charge = charged.append
+        client = LLMClient(StreamingModel(["x" * 40, "y" * 40]), scheduler=scheduler)
+        before = (requests("stream", "ok"), requests("stream", "cancelled"))
+
+        stream = client.stream("prompt")
+        self.assertEqual(await stream.__anext__(), "x" * 40)
+        # What StreamingResponse does when its client disconnects
+        await stream.aclose()
+
+        self.assertEqual(requests("stream", "ok"), before[0])
+        self.assertEqual(requests("stream", "cancelled"), before[1] + 1)
+        # The 40 characters streamed before the disconnect, at 4 characters per token
+        self.assertEqual(charged, [10])
+        self.assertEqual((client.in_flight, scheduler.running), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
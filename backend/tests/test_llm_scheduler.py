@@ -0,0 +1,124 @@
+import asyncio
+import time
+import unittest
+
+from llm_scheduler import BACKGROUND, INTERACTIVE, LLMScheduler
+
+
+async def hold(scheduler, priority, seconds, admitted=None):
+    """Take a slot in the given lane and keep it for `seconds`; appends the priority to admitted"""
+    async with scheduler.slot(priority):
+        if admitted is not None:
+            admitted.append(priority)
+        await asyncio.sleep(seconds)
+
+
+class InteractiveAdmissionTest(unittest.IsolatedAsyncioTestCase):
+    async def test_interactive_call_starts_during_background_flood(self):
+        scheduler = LLMScheduler(max_concurrency=3, requests_per_minute=100_000)
+        flood = [asyncio.create_task(hold(scheduler, BACKGROUND, 0.3)) for _ in range(20)]
+        await asyncio.sleep(0.01)
+        # Background work leaves one slot free
+        self.assertEqual(scheduler.running, 2)
+        self.assertEqual(scheduler.queued(BACKGROUND), 18)
+
+        start = time.monotonic()
+        async with scheduler.slot(INTERACTIVE):
+            waited = time.monotonic() - start
+            self.assertEqual(scheduler.running, 3)
+        self.assertLess(waited, 0.05)
+
+        for task in flood:
+            task.cancel()
+        await asyncio.gather(*flood, return_exceptions=True)
+
+    async def test_interactive_lane_is_admitted_first(self):
+        scheduler = LLMScheduler(max_concurrency=1, requests_per_minute=100_000)
+        admitted = []
+        blocker = asyncio.create_task(hold(scheduler, INTERACTIVE, 0.05))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(hold(scheduler, BACKGROUND, 0, admitted)) for _ in range(3)]
+        await asyncio.sleep(0)
+        waiters.append(asyncio.create_task(hold(scheduler, INTERACTIVE, 0, admitted)))
+        await asyncio.gather(blocker, *waiters)
+        self.assertEqual(admitted, [INTERACTIVE, BACKGROUND, BACKGROUND, BACKGROUND])
+
+
+class ThrottleTest(unittest.IsolatedAsyncioTestCase):
+    async def test_quota_error_pauses_admission_and_halves_rate(self):
+        scheduler = LLMScheduler(max_concurrency=4, requests_per_minute=600, max_backoff=0.2)
+        self.assertEqual(scheduler.throttled(), 0.2)
+        self.assertEqual(scheduler.requests.rate, 300)
+
+        start = time.monotonic()
+        async with scheduler.slot(INTERACTIVE):
+            waited = time.monotonic() - start
+        self.assertGreaterEqual(waited, 0.15)
+        self.assertLess(waited, 0.5)
+
+    async def test_backoff_doubles_up_to_the_limit_and_resets_on_success(self):
+        scheduler = LLMScheduler(requests_per_minute=600, max_backoff=4.0)
+        self.assertEqual([scheduler.throttled() for _ in range(4)], [1.0, 2.0, 4.0, 4.0])
+        scheduler.succeeded()
+        self.assertEqual(scheduler.throttled(), 1.0)
+
+    async def test_throttle_clamps_burst_to_the_interactive_reserve(self):
+        scheduler = LLMScheduler(max_concurrency=4, requests_per_minute=600, interactive_reserve=0.2)
+        self.assertAlmostEqual(scheduler.requests.level, 600, delta=1)
+        scheduler.throttled()
+        self.assertLessEqual(scheduler.requests.level, 0.2 * 600 + 1)
+        # The reserve is kept, so an interactive call could start as soon as the pause ends...
+        scheduler._paused_until = 0.0
+        self.assertEqual(scheduler._wait_time(INTERACTIVE, 0), 0.0)
+        # ...while background calls wait for the halved rate to refill above the reserve
+        self.assertGreater(scheduler._wait_time(BACKGROUND, 0), 0.0)
+
+    async def test_rate_recovers_gradually_after_throttling(self):
+        scheduler = LLMScheduler(requests_per_minute=600)
+        scheduler.throttled()
+        scheduler.succeeded()
+        self.assertEqual(scheduler.requests.rate, 330)
+        for _ in range(20):
+            scheduler.succeeded()
+        self.assertEqual(scheduler.requests.rate, 600)
+
+
+class CancellationTest(unittest.IsolatedAsyncioTestCase):
+    async def test_waiter_cancelled_after_admission_returns_its_slot(self):
+        scheduler = LLMScheduler(max_concurrency=1, requests_per_minute=100_000)
+        entered = []
+
+        async def enter(name):
+            async with scheduler.slot(INTERACTIVE):
+                entered.append(name)
+
+        async with scheduler.slot(INTERACTIVE):
+            first = asyncio.create_task(enter("first"))
+            second = asyncio.create_task(enter("second"))
+            await asyncio.sleep(0)
+            self.assertEqual(scheduler.queued(), 2)
+        # Leaving the slot admitted the first waiter; cancel it before it gets to run
+        self.assertEqual(scheduler.running, 1)
+        first.cancel()
+
+        await asyncio.wait_for(second, timeout=1)
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+        self.assertEqual(entered, ["second"])
+        self.assertEqual(scheduler.running, 0)
+        self.assertEqual(scheduler.queued(), 0)
+
+    async def test_waiter_cancelled_while_queued_leaves_the_queue(self):
+        scheduler = LLMScheduler(max_concurrency=1, requests_per_minute=100_000)
+        async with scheduler.slot(INTERACTIVE):
+            waiter = asyncio.create_task(hold(scheduler, BACKGROUND, 0))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiter
+            self.assertEqual(scheduler.queued(), 0)
+        self.assertEqual(scheduler.running, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import time
+import unittest
+
+from parse_cache import ParseCache
+
+
+class ParseCacheTest(unittest.TestCase):
+    def make_cache(self, **kwargs):
+        return ParseCache(os.path.join(tempfile.mkdtemp(), "parse_cache.db"), **kwargs)
+
+    def last_used(self, cache, key):
+        return cache._conn.execute("SELECT last_used FROM parse_cache WHERE key = ?", (key,)).fetchone()[0]
+
+    def test_uses_wal_journal(self):
+        cache = self.make_cache()
+        self.assertEqual(cache._conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_recent_hits_do_not_write(self):
+        cache = self.make_cache(touch_interval=60)
+        cache.put("a", {"parsed": 1})
+        stored = self.last_used(cache, "a")
+        changes = cache._conn.total_changes
+        for _ in range(10):
+            self.assertEqual(cache.get("a"), {"parsed": 1})
+        self.assertEqual(cache._conn.total_changes, changes)
+        self.assertEqual(self.last_used(cache, "a"), stored)
+        self.assertEqual(cache.hits, 10)
+
+    def test_access_times_are_written_in_batches(self):
+        cache = self.make_cache(touch_interval=0, touch_batch=3)
+        for key in "abc":
+            cache.put(key, key)
+        before = {key: self.last_used(cache, key) for key in "abc"}
+        # Every hit records a touch, but only a full batch flushes them
+        cache._last_flush = time.monotonic() + 3600
+        time.sleep(0.01)
+        cache.get("a")
+        cache.get("b")
+        self.assertEqual({key: self.last_used(cache, key) for key in "abc"}, before)
+        cache.get("c")
+        self.assertTrue(all(self.last_used(cache, key) > before[key] for key in "abc"))
+
+    def test_eviction_sees_pending_access_times(self):
+        cache = self.make_cache(max_entries=2, touch_interval=0, touch_batch=100)
+        cache._last_flush = time.monotonic() + 3600
+        cache.put("old", 1)
+        cache.put("new", 2)
+        # Only recorded in memory, but put() flushes it before evicting
+        cache.get("old")
+        cache.put("newest", 3)
+        self.assertEqual(cache.get("old"), 1)
+        self.assertIsNone(cache.get("new"))
+        self.assertEqual(cache.evictions, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import pdf_extract
+from pdf_extract import PDFExtractionError, PDFExtractor
+
+
+def hang(path, char_budget=None, time_budget=None):
+    """Stand-in for extract_pdf_text that records its worker's PID and never finishes"""
+    with open(f"{path}.pid", "w") as f:
+        f.write(str(os.getpid()))
+    time.sleep(300)
+
+
+def process_exists(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+class RestartTest(unittest.IsolatedAsyncioTestCase):
+    async def test_timed_out_worker_is_terminated(self):
+        path = os.path.join(tempfile.mkdtemp(), "stuck.pdf")
+        extractor = PDFExtractor(max_workers=1, timeout=2)
+        try:
+            with mock.patch.object(pdf_extract, "extract_pdf_text", hang):
+                with self.assertRaises(PDFExtractionError):
+                    await extractor.extract(path)
+            with open(f"{path}.pid") as f:
+                pid = int(f.read())
+            deadline = time.monotonic() + 10
+            while process_exists(pid) and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            self.assertFalse(process_exists(pid))
+        finally:
+            extractor.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import time
+import unittest
+
+from preparse import years_from_date_ranges
+
+NOW = time.struct_time((2026, 10, 16, 0, 0, 0, 4, 289, 0))
+
+
+class DateRangeYearsTest(unittest.TestCase):
+    def test_year_only_ranges_count_whole_years(self):
+        self.assertEqual(years_from_date_ranges("Engineer, Acme, 2015 - 2021", NOW), 6.0)
+        self.assertEqual(years_from_date_ranges("2015 - 2018\n2017 - 2021", NOW), 6.0)
+
+    def test_month_ranges_include_the_end_month(self):
+        self.assertEqual(years_from_date_ranges("Jan 2015 - Dec 2021", NOW), 7.0)
+        self.assertEqual(years_from_date_ranges("03/2019 - 02/2020", NOW), 1.0)
+
+    def test_ongoing_range_runs_to_the_current_month(self):
+        self.assertAlmostEqual(years_from_date_ranges("Oct 2025 - Present", NOW), 13 / 12)
+
+    def test_no_ranges(self):
+        self.assertIsNone(years_from_date_ranges("Python developer", NOW))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from embeddings import VectorStore, embed_texts
+from matching import MatchMatrix
+from retrieval import HybridSearchEngine, top_k_indices
+from skills import SkillNormalizer
+
+
+class TopKTest(unittest.TestCase):
+    def test_ties_at_the_cutoff_are_kept_in_index_order(self):
+        scores = np.array([0.5, 0.9, 0.5, 0.1, 0.5, 0.9, 0.5], dtype=np.float32)
+        self.assertEqual(top_k_indices(scores, 4).tolist(), [1, 5, 0, 2])
+        self.assertEqual(top_k_indices(scores, 10).tolist(), [1, 5, 0, 2, 4, 6, 3])
+        self.assertEqual(top_k_indices(scores, 0).tolist(), [])
+
+
+class HybridSearchPagingTest(unittest.TestCase):
+    def test_pages_through_tied_scores_without_duplicates_or_gaps(self):
+        store = VectorStore(tempfile.mkdtemp(), "candidates", dim=32)
+        engine = HybridSearchEngine(store, lambda text: embed_texts([text], dim=32)[0])
+        # Five distinct texts over 500 documents: most scores tie with many others
+        texts = [f"python developer {'django ' * (i % 5)}" for i in range(500)]
+        ids = [f"c{i}" for i in range(500)]
+        store.add(ids, embed_texts(texts, dim=32))
+        for doc_id, text in zip(ids, texts):
+            engine.add(doc_id, text)
+
+        seen = []
+        for offset in range(0, 500, 20):
+            total, page = engine.search("python django", limit=20, offset=offset)
+            self.assertEqual(total, 500)
+            seen.extend(doc_id for doc_id, _ in page)
+        self.assertEqual(len(seen), 500)
+        self.assertEqual(set(seen), set(ids))
+
+
+class MatchMatrixTiesTest(unittest.TestCase):
+    def test_tied_candidates_rank_in_insertion_order(self):
+        matrix = MatchMatrix(SkillNormalizer())
+        for i in range(10):
+            skills = ["python", "sql"] if i % 2 else ["python"]
+            matrix.add_candidate(f"c{i}", skills, "mid")
+        matrix.add_job("j1", ["python", "sql"], "mid")
+        self.assertEqual([candidate_id for candidate_id, _ in matrix.top_candidates("j1", limit=3)],
+                         ["c1", "c3", "c5"])
+        self.assertEqual([candidate_id for candidate_id, _ in matrix.top_candidates("j1", limit=7)],
+                         ["c1", "c3", "c5", "c7", "c9", "c0", "c2"])
+
+
+class VectorStoreTiesTest(unittest.TestCase):
+    def test_equal_vectors_rank_in_row_order(self):
+        store = VectorStore(tempfile.mkdtemp(), "jobs", dim=8)
+        vectors = np.zeros((50, 8), dtype=np.float32)
+        vectors[:, 0] = 1.0
+        store.add([f"j{i}" for i in range(50)], vectors)
+        query = np.eye(8, dtype=np.float32)[0]
+        self.assertEqual([doc_id for doc_id, _ in store.search(query, limit=5)], ["j0", "j1", "j2", "j3", "j4"])
+        self.assertEqual([doc_id for doc_id, _ in store.search(query, limit=5, exclude={"j1"})],
+                         ["j0", "j2", "j3", "j4", "j5"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import asyncio
+import unittest
+
+from responses import with_keepalive
+
+
+class KeepaliveTest(unittest.IsolatedAsyncioTestCase):
+    async def test_idle_stream_sends_comments_between_events(self):
+        async def events():
+            yield "data: 1\n\n"
+            await asyncio.sleep(0.12)
+            yield "data: 2\n\n"
+
+        received = [event async for event in with_keepalive(events(), 0.05)]
+        self.assertEqual(received[0], "data: 1\n\n")
+        self.assertEqual(received[-1], "data: 2\n\n")
+        self.assertGreaterEqual(len(received), 3)
+        self.assertEqual(set(received[1:-1]), {": keepalive\n\n"})
+
+    async def test_closing_the_stream_cancels_the_event_source(self):
+        stopped = []
+
+        async def events():
+            try:
+                yield "data: 1\n\n"
+                await asyncio.sleep(3600)
+            finally:
+                stopped.append(True)
+
+        stream = with_keepalive(events(), 0.01)
+        self.assertEqual(await stream.__anext__(), "data: 1\n\n")
+        self.assertEqual(await stream.__anext__(), ": keepalive\n\n")
+        await stream.aclose()
+        self.assertEqual(stopped, [True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from preparse import PreParse
+from resume_schema import ResumeParseError, extract_json, validate_resume
+
+
+class ValidateResumeTest(unittest.TestCase):
+    def test_name_is_stripped(self):
+        parsed = validate_resume({"name": "  Ada Lovelace\n", "skills": ["Python"]})
+        self.assertEqual(parsed["name"], "Ada Lovelace")
+
+    def test_whitespace_only_name_is_rejected(self):
+        for name in ("", "   ", "\t\n"):
+            with self.assertRaises(ResumeParseError) as raised:
+                validate_resume({"name": name, "skills": ["Python"]})
+            self.assertEqual(raised.exception.reason, "validation")
+
+    def test_missing_or_placeholder_name_is_rejected(self):
+        for data in ({"name": None, "skills": ["Python"]}, {"skills": ["Python"]},
+                     {"name": "Not specified", "skills": ["Python"]}, {"name": "Unknown", "skills": ["Python"]}):
+            with self.assertRaises(ResumeParseError):
+                validate_resume(data)
+
+    def test_at_least_one_skill_is_required(self):
+        for skills in ([], "", " , ", ["  "]):
+            with self.assertRaises(ResumeParseError):
+                validate_resume({"name": "Ada", "skills": skills})
+
+    def test_local_parse_without_a_name_is_rejected(self):
+        local = PreParse({"skills": ["Python"], "experience": "5"}, {"skills": 1.0, "experience": 1.0})
+        self.assertIsNone(local.resolve()["name"])
+        with self.assertRaises(ResumeParseError):
+            validate_resume(local.resolve())
+
+    def test_fields_are_coerced(self):
+        parsed = validate_resume({"name": "Ada", "skills": "Python, SQL, ", "experience": 5,
+                                  "education": None, "experience_level": "SENIOR"})
+        self.assertEqual(parsed["skills"], ["Python", "SQL"])
+        self.assertEqual(parsed["experience"], "5")
+        self.assertEqual(parsed["education"], "Not specified")
+        self.assertEqual(parsed["experience_level"], "Senior")
+
+    def test_fenced_json_is_extracted(self):
+        self.assertEqual(extract_json('```json\n{"name": "Ada"}\n```'), {"name": "Ada"})
+        with self.assertRaises(ResumeParseError):
+            extract_json("not json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import unittest
+
+from singleflight import SINGLE_FLIGHT_CALLS, SingleFlight, prompt_key
+
+
+def calls(flight, role):
+    """singleflight_calls_total for one flight and role"""
+    return dict(SINGLE_FLIGHT_CALLS._values).get((("flight", flight.name), ("role", role)), 0)
+
+
+class DoTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_callers_share_the_leader_result(self):
+        flight = SingleFlight("test_share")
+        started = []
+
+        async def work():
+            started.append(1)
+            await asyncio.sleep(0.05)
+            return {"insights": "shared"}
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        self.assertEqual(len(started), 1)
+        # Every caller gets the leader's result object itself
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual((calls(flight, "leader"), calls(flight, "shared")), (1, 4))
+        self.assertEqual(len(flight), 0)
+
+    async def test_different_keys_and_later_calls_run_separately(self):
+        flight = SingleFlight("test_keys")
+        started = []
+
+        async def work(value):
+            started.append(value)
+            await asyncio.sleep(0.01)
+            return value
+
+        self.assertEqual(await asyncio.gather(flight.do("a", lambda: work("a")), flight.do("b", lambda: work("b"))),
+                         ["a", "b"])
+        # The first call finished, so the same key starts new work
+        self.assertEqual(await flight.do("a", lambda: work("again")), "again")
+        self.assertEqual(started, ["a", "b", "again"])
+        self.assertEqual(calls(flight, "leader"), 3)
+
+    async def test_error_is_raised_to_every_caller(self):
+        flight = SingleFlight("test_error")
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("quota")
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(3)), return_exceptions=True)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertIs(results[0], results[1])
+
+    async def test_cancelled_leader_does_not_cancel_shared_work(self):
+        flight = SingleFlight("test_cancel")
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        self.assertEqual(await follower, "done")
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+
+
+class StreamTest(unittest.IsolatedAsyncioTestCase):
+    async def test_late_subscriber_replays_chunks_and_shares_the_stream(self):
+        flight = SingleFlight("test_stream")
+        produced = []
+
+        async def chunks():
+            for chunk in ("a", "b", "c"):
+                produced.append(chunk)
+                yield chunk
+                await asyncio.sleep(0.02)
+
+        async def collect():
+            return [chunk async for chunk in flight.stream("key", chunks)]
+
+        early = asyncio.create_task(collect())
+        await asyncio.sleep(0.03)
+        late = asyncio.create_task(collect())
+        self.assertEqual(await asyncio.gather(early, late), [["a", "b", "c"], ["a", "b", "c"]])
+        self.assertEqual(produced, ["a", "b", "c"])
+        self.assertEqual((calls(flight, "leader"), calls(flight, "shared")), (1, 1))
+
+    async def test_stream_error_reaches_subscribers_after_the_chunks(self):
+        flight = SingleFlight("test_stream_error")
+
+        async def chunks():
+            yield "partial"
+            raise RuntimeError("stream broke")
+
+        received = []
+        with self.assertRaises(RuntimeError):
+            async for chunk in flight.stream("key", chunks):
+                received.append(chunk)
+        self.assertEqual(received, ["partial"])
+
+
+class PromptKeyTest(unittest.TestCase):
+    def test_key_depends_on_every_part(self):
+        self.assertEqual(prompt_key("prompt", {"temperature": 0}), prompt_key("prompt", {"temperature": 0}))
+        self.assertNotEqual(prompt_key("prompt", {"temperature": 0}), prompt_key("prompt", {"temperature": 1}))
+        # Parts are delimited, so shifting text between them changes the key
+        self.assertNotEqual(prompt_key("ab", "c"), prompt_key("a", "bc"))
+
+
+if __name__ == "__main__":
+    unittest.main()
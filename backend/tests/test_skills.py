@@ -0,0 +1,53 @@
+import unittest
+
+from matching import MatchMatrix
+from skill_index import SkillIndex
+from skills import SkillNormalizer
+
+
+class AliasTest(unittest.TestCase):
+    def test_lookup_keys_follow_an_alias_moved_to_another_skill(self):
+        normalizer = SkillNormalizer()
+        normalizer.add_skill("JavaScript", ["JS"])
+        golang = normalizer.skill_id("Golang")
+        self.assertEqual(normalizer.lookup_keys("js"), {"javascript", "js"})
+
+        normalizer.add_alias("Golang", "Go")
+        self.assertEqual(normalizer.lookup_keys("Go"), {"go", "golang"})
+        self.assertEqual(normalizer.lookup_keys("golang"), {"go", "golang"})
+        # The interned "Golang" skill has no spelling left
+        self.assertEqual(normalizer.aliases()["Golang"], [])
+        self.assertNotEqual(normalizer.skill_id("golang"), golang)
+        self.assertEqual(normalizer.lookup_keys("Rust"), {"rust"})
+
+
+class UpdateTest(unittest.TestCase):
+    def test_updated_entries_score_like_new_ones(self):
+        normalizer = SkillNormalizer()
+        matrix = MatchMatrix(normalizer)
+        index = SkillIndex(normalizer)
+        for candidate_id, skills in (("c0", ["Go"]), ("c1", ["Golang", "SQL"]), ("c2", ["SQL"])):
+            matrix.add_candidate(candidate_id, skills, "mid")
+            index.add(candidate_id, skills, "mid")
+        matrix.add_job("j0", ["Golang", "SQL"], "mid")
+        golang = normalizer.skill_id("Golang")
+
+        normalizer.add_alias("Golang", "Go")
+        self.assertEqual(matrix.candidates_with(golang), ["c1"])
+        self.assertEqual(matrix.jobs_with(golang), ["j0"])
+        matrix.update_candidate("c1", ["Golang", "SQL"], "mid")
+        index.add("c1", ["Golang", "SQL"], "mid")
+        matrix.update_job("j0", ["Golang", "SQL"], "mid")
+
+        expected = MatchMatrix(normalizer)
+        for candidate_id, skills in (("c0", ["Go"]), ("c1", ["Golang", "SQL"]), ("c2", ["SQL"])):
+            expected.add_candidate(candidate_id, skills, "mid")
+        expected.add_job("j0", ["Golang", "SQL"], "mid")
+        self.assertEqual(matrix.top_candidates("j0"), expected.top_candidates("j0"))
+        self.assertEqual(matrix.candidates_with(golang), [])
+        # Re-indexed candidates keep their place in upload order
+        self.assertEqual(index.search(["go"], "mid"), ["c0", "c1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
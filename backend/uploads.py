@@ -0,0 +1,89 @@
+import hashlib
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised when an uploaded file exceeds its size limit"""
+
+
+class EmptyUpload(Exception):
+    """Raised when an uploaded file has no content"""
+
+
+def safe_filename(filename):
+    """Strip any directory components from a client-supplied filename"""
+    return Path(filename or "upload").name
+
+
+async def save_upload(upload, path, max_bytes, chunk_size=CHUNK_SIZE):
+    """
+    Stream an UploadFile to disk chunk by chunk, without holding it in memory.
+    Returns the sha256 hex digest of the content; raises UploadTooLarge past max_bytes
+    and EmptyUpload for a zero-byte file.
+    """
+    # Reject early when the multipart parser already knows the size
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(f"{upload.filename} is larger than {max_bytes} bytes")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as f:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"{upload.filename} is larger than {max_bytes} bytes")
+                digest.update(chunk)
+                f.write(chunk)
+        if not size:
+            raise EmptyUpload(f"{upload.filename} is empty")
+    except BaseException:
+        Path(path).unlink(missing_ok=True)
+        raise
+    return digest.hexdigest()
+
+
+def file_sha256(path, chunk_size=CHUNK_SIZE):
+    """sha256 hex digest of a file on disk, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_zip_resumes(archive, extensions):
+    """Yield (filename, ZipInfo) for each resume file in an open zip archive"""
+    for member in archive.infolist():
+        name = safe_filename(member.filename)
+        if member.is_dir() or not name.lower().endswith(extensions):
+            continue
+        yield name, member
+
+
+def extract_zip_member(archive, member, path, max_bytes, chunk_size=CHUNK_SIZE):
+    """Stream one zip member to disk; raises UploadTooLarge if it inflates past max_bytes"""
+    if member.file_size > max_bytes:
+        raise UploadTooLarge(f"{member.filename} is larger than {max_bytes} bytes")
+    size = 0
+    try:
+        with archive.open(member) as src, open(path, "wb") as dst:
+            while True:
+                chunk = src.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"{member.filename} is larger than {max_bytes} bytes")
+                dst.write(chunk)
+    except BaseException:
+        Path(path).unlink(missing_ok=True)
+        raise
@@ -16,10 +16,51 @@ st.set_page_config(
 # Backend API URL
 BACKEND_API_URL = "http://localhost:8000"
 
+# How long read-only GET responses are reused across reruns
+CACHE_TTL_SECONDS = 30
+# GET endpoints whose responses may be cached; anything else (e.g. /batches polling) is always fetched
+CACHEABLE_ENDPOINTS = ("/jobs", "/matches/summary")
+# Request timeout in seconds, and the longer one for bulk uploads, which the backend answers
+# only after saving and unpacking every file
+REQUEST_TIMEOUT_SECONDS = 10
+BULK_UPLOAD_TIMEOUT_SECONDS = (5, 600)
+# How long to keep polling a bulk upload's progress before leaving it to finish in the background
+BATCH_POLL_TIMEOUT_SECONDS = 30 * 60
+# POST endpoints that do not change backend data, so they don't invalidate cached responses
+READ_ONLY_POSTS = ("/search-candidates/",)
+
+# Progress labels for the stages the backend reports while processing
+UPLOAD_STAGES = {
+    "received": "Upload received",
+    "extracted": "Text extracted",
+    "parsed": "Resume parsed",
+    "indexed": "Candidate indexed",
+}
+INSIGHTS_STAGES = {
+    "received": "Loading candidate profile...",
+    "cached": "Loading saved insights...",
+    "generating": "Waiting for the AI model...",
+}
+
+# Shared HTTP session so reruns reuse pooled keep-alive connections to the backend
+@st.cache_resource
+def get_http_session():
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Last ETag and response per cached URL, used to revalidate with If-None-Match when the TTL expires
+@st.cache_resource
+def get_etag_store():
+    return {}
+
 # Function to check if the backend server is running
+@st.cache_data(ttl=10, show_spinner=False)
 def is_backend_available():
     try:
-        response = requests.get(f"{BACKEND_API_URL}/health", timeout=2)
+        response = get_http_session().get(f"{BACKEND_API_URL}/health", timeout=2)
         return response.status_code == 200
     except:
         return False
@@ -199,18 +240,54 @@ with st.sidebar:
 
 # Wrapper function for API calls with proper error handling
 def api_call(method, endpoint, **kwargs):
+    if method.lower() == "get" and endpoint.startswith(CACHEABLE_ENDPOINTS) and set(kwargs) <= {"params"}:
+        result = cached_get(endpoint, kwargs.get("params"))
+        if not result["success"]:
+            # Don't keep serving a failure for the whole TTL
+            cached_get.clear()
+        return result
+    
+    result = _request(method, endpoint, **kwargs)
+    if method.lower() == "post" and result["success"] and endpoint not in READ_ONLY_POSTS:
+        invalidate_cache()
+    return result
+
+# Memoized read-only GET; revalidates with the backend's ETag once the TTL has expired
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def cached_get(endpoint, params=None):
+    etag_store = get_etag_store()
+    key = (endpoint, json.dumps(params, sort_keys=True))
+    etag, previous = etag_store.get(key, (None, None))
+    headers = {"If-None-Match": etag} if etag else None
+    
+    result = _request("get", endpoint, params=params, headers=headers)
+    if result.get("status_code") == 304 and previous is not None:
+        return previous
+    if result["success"] and result.get("etag"):
+        etag_store[key] = (result["etag"], result)
+    return result
+
+# Drop cached responses after a call that changed backend data
+def invalidate_cache():
+    cached_get.clear()
+    get_etag_store().clear()
+
+def _request(method, endpoint, **kwargs):
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT_SECONDS)
     try:
+        session = get_http_session()
         if method.lower() == "get":
-            response = requests.get(f"{BACKEND_API_URL}{endpoint}", timeout=10, **kwargs)
+            response = session.get(f"{BACKEND_API_URL}{endpoint}", **kwargs)
         elif method.lower() == "post":
-            response = requests.post(f"{BACKEND_API_URL}{endpoint}", timeout=10, **kwargs)
+            response = session.post(f"{BACKEND_API_URL}{endpoint}", **kwargs)
         else:
             return {"success": False, "error": f"Unsupported method: {method}"}
         
         return {
             "success": response.ok,
             "status_code": response.status_code,
-            "data": response.json() if response.ok else None,
+            "etag": response.headers.get("ETag"),
+            "data": response.json() if response.ok and response.status_code != 304 else None,
             "error": None if response.ok else f"Server error: {response.status_code}"
         }
     except requests.exceptions.ConnectionError:
@@ -226,17 +303,73 @@ def api_call(method, endpoint, **kwargs):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+# Read a server-sent events stream from the backend as events arrive
+def stream_events(method, endpoint, **kwargs):
+    """
+    Yield (event, payload) for each event; events without a name are reported as "text".
+    Yields ("failed", result) with the same shape as api_call if the request itself fails.
+    """
+    try:
+        with get_http_session().request(
+            method,
+            f"{BACKEND_API_URL}{endpoint}",
+            stream=True,
+            timeout=(5, 60),
+            **kwargs
+        ) as response:
+            if not response.ok:
+                yield "failed", {"success": False, "status_code": response.status_code, "error": f"Server error: {response.status_code}"}
+                return
+            
+            event = "text"
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    event = "text"
+                elif line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    yield event, json.loads(line[len("data:"):])
+    except requests.exceptions.ConnectionError:
+        yield "failed", {"success": False, "error": "Cannot connect to the backend server. Please make sure it's running."}
+    except requests.exceptions.Timeout:
+        yield "failed", {"success": False, "error": "Request timed out. The server might be overloaded."}
+    except Exception as e:
+        yield "failed", {"success": False, "error": str(e)}
+
+# Read career insights from the backend's server-sent events stream as they are generated
+def stream_insights(candidate_id, refresh=False):
+    """
+    Yield ("status", stage) and ("text", chunk) while insights are generated, then
+    ("done", info) or ("error", message), or ("failed", result) if the request fails.
+    """
+    params = {"refresh": "true"} if refresh else None
+    for event, payload in stream_events("get", f"/career-insights/{candidate_id}/stream", params=params):
+        if event == "text":
+            yield "text", payload.get("text", "")
+        elif event == "status":
+            yield "status", payload.get("stage")
+        elif event == "error":
+            yield "error", payload.get("message", "Unable to generate career insights.")
+        else:
+            yield event, payload
+
 # Dashboard Section
 if nav_selection == "Dashboard":
     # Fetch counts of resumes and jobs
     resume_count = 0
     job_count = 0
+    match_count = 0
     
     if backend_available:
         # Try to get job count
-        job_result = api_call("get", "/jobs")
-        if job_result["success"] and job_result["data"] and "jobs" in job_result["data"]:
-            job_count = len(job_result["data"]["jobs"])
+        job_result = api_call("get", "/jobs/count")
+        if job_result["success"] and job_result["data"]:
+            job_count = job_result["data"].get("count", 0)
+        
+        # Candidate-job pairs above the backend's match threshold
+        match_result = api_call("get", "/matches/summary")
+        if match_result["success"] and match_result["data"]:
+            match_count = match_result["data"].get("matches", 0)
     
     col1, col2, col3 = st.columns(3)
     
@@ -257,10 +390,10 @@ if nav_selection == "Dashboard":
         """, unsafe_allow_html=True)
     
     with col3:
-        st.markdown("""
+        st.markdown(f"""
         <div style='background-color: white; padding: 20px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.05); text-align: center;'>
             <h3 style='color: #FF5252;'>Matches</h3>
-            <h2 style='font-size: 2.5rem;'>0</h2>
+            <h2 style='font-size: 2.5rem;'>{match_count}</h2>
         </div>
         """, unsafe_allow_html=True)
     
@@ -293,11 +426,11 @@ if nav_selection == "Dashboard":
     st.markdown("---")
     st.markdown("### Available Job Openings")
     
-    # Fetch available jobs
-    job_result = api_call("get", "/jobs")
+    # Fetch only the first 3 jobs for the preview
+    job_result = api_call("get", "/jobs", params={"limit": 3, "description_chars": 100})
     
     if job_result["success"] and job_result["data"] and "jobs" in job_result["data"]:
-        jobs_preview = job_result["data"]["jobs"][:3]  # Show only first 3 jobs
+        jobs_preview = job_result["data"]["jobs"]
         
         for job in jobs_preview:
             st.markdown(f"""
@@ -314,8 +447,8 @@ if nav_selection == "Dashboard":
             </div>
             """, unsafe_allow_html=True)
         
-        if job_result["data"] and len(job_result["data"]["jobs"]) > 3:
-            st.markdown(f"<p style='text-align: center; margin-top: 10px;'><a href='#' style='color: #6C63FF; text-decoration: none;'>View all {len(job_result['data']['jobs'])} jobs</a></p>", unsafe_allow_html=True)
+        if job_result["data"].get("total", 0) > 3:
+            st.markdown(f"<p style='text-align: center; margin-top: 10px;'><a href='#' style='color: #6C63FF; text-decoration: none;'>View all {job_result['data']['total']} jobs</a></p>", unsafe_allow_html=True)
     else:
         st.info("No job postings available yet.")
 
@@ -343,18 +476,27 @@ elif nav_selection == "Resume Upload":
                 
                 if st.button("Process Resume", key="process_resume"):
                     with st.spinner("Analyzing resume with AI..."):
-                        # Simulate progress
+                        # Progress follows the stages the backend reports as it processes the resume
                         progress_bar = st.progress(0)
-                        for i in range(100):
-                            time.sleep(0.01)
-                            progress_bar.progress(i + 1)
-                        
-                        # Make API call
-                        result = api_call(
-                            "post", 
-                            "/upload-resume/", 
-                            files={"file": uploaded_file}
-                        )
+                        stage_text = st.empty()
+                        result = {"success": False, "error": "The server closed the connection before finishing."}
+                        for event, payload in stream_events("post", "/upload-resume/stream", files={"file": uploaded_file}):
+                            if event == "status":
+                                stage = payload.get("stage")
+                                if stage in UPLOAD_STAGES:
+                                    progress_bar.progress((list(UPLOAD_STAGES).index(stage) + 1) / len(UPLOAD_STAGES))
+                                    stage_text.caption(UPLOAD_STAGES[stage])
+                            elif event == "done":
+                                result = {"success": True, "data": payload}
+                                invalidate_cache()
+                            elif event == "queued":
+                                result = {"success": False, "queued": True, "data": payload, "error": payload.get("message")}
+                                invalidate_cache()
+                            elif event == "error":
+                                result = {"success": False, "error": payload.get("message", "Failed to process resume")}
+                            elif event == "failed":
+                                result = payload
+                        stage_text.empty()
                         
                         if result["success"]:
                             candidate_id = result["data"].get('candidate_id')
@@ -377,11 +519,82 @@ elif nav_selection == "Resume Upload":
                                 <p>You can now search for this candidate or get career insights using the ID.</p>
                             </div>
                             """, unsafe_allow_html=True)
+                        elif result.get("queued"):
+                            st.warning(f"{result['error']}. Track it in batch {result['data'].get('batch_id')} (candidate ID {result['data'].get('candidate_id')}).")
                         else:
                             st.error(f"Failed to process resume: {result['error']}")
                             if "Cannot connect" in result['error']:
                                 st.info("Please make sure the backend server is running.")
     
+    # Bulk upload: queue many resumes at once and poll the batch for progress
+    st.markdown("### Bulk Upload")
+    bulk_files = st.file_uploader(
+        "Upload many resumes, or zip archives of resumes",
+        type=["pdf", "txt", "zip"],
+        accept_multiple_files=True,
+        key="bulk_upload"
+    )
+    
+    if bulk_files and st.button("Process All Resumes", key="process_bulk"):
+        result = api_call(
+            "post",
+            "/upload-resumes/batch",
+            files=[("files", (f.name, f.getvalue())) for f in bulk_files],
+            timeout=BULK_UPLOAD_TIMEOUT_SECONDS
+        )
+        
+        if result["success"]:
+            batch_id = result["data"]["batch_id"]
+            total = result["data"]["total"]
+            st.info(f"Queued {total} resumes (batch {batch_id})")
+            
+            progress_bar = st.progress(0)
+            status_text = st.empty()
+            deadline = time.monotonic() + BATCH_POLL_TIMEOUT_SECONDS
+            while True:
+                batch_result = api_call("get", f"/batches/{batch_id}")
+                if not batch_result["success"]:
+                    st.error(f"Failed to check batch progress: {batch_result['error']}")
+                    break
+                
+                batch = batch_result["data"]
+                finished = batch["counts"]["done"] + batch["counts"]["failed"]
+                progress_bar.progress(finished / batch["total"])
+                status_text.markdown(f"Processed **{finished}** of **{batch['total']}** resumes ({batch['counts']['failed']} failed)")
+                if batch["complete"]:
+                    break
+                if time.monotonic() >= deadline:
+                    st.warning(f"Batch {batch_id} is still being processed in the background. Check its progress again later.")
+                    break
+                time.sleep(1)
+            
+            if batch_result["success"]:
+                if 'processed_resumes' not in st.session_state:
+                    st.session_state.processed_resumes = []
+                
+                for item in batch["items"]:
+                    if item["status"] == "done":
+                        st.session_state.processed_resumes.append({
+                            'id': item["candidate_id"],
+                            'name': item["filename"],
+                            'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        })
+                
+                failed_items = [item for item in batch["items"] if item["status"] == "failed"]
+                if failed_items:
+                    st.warning("Some resumes could not be processed:")
+                    st.dataframe(
+                        pd.DataFrame([{"File Name": item["filename"], "Error": item["error"]} for item in failed_items]),
+                        use_container_width=True,
+                        hide_index=True
+                    )
+                elif batch["complete"]:
+                    st.success(f"All {batch['total']} resumes processed successfully!")
+        else:
+            st.error(f"Failed to upload resumes: {result['error']}")
+            if "Cannot connect" in result['error']:
+                st.info("Please make sure the backend server is running.")
+    
     # Show previously processed resumes
     if 'processed_resumes' in st.session_state and st.session_state.processed_resumes:
         st.markdown("### Previously Processed Resumes")
@@ -472,14 +685,33 @@ elif nav_selection == "Job Management":
                 st.warning("Please fill all required fields.")
     
     with job_tabs[1]:
-        # Fetch all jobs from the backend
-        job_result = api_call("get", "/jobs")
+        # Filters and paging for the job list
+        filter_col1, filter_col2, filter_col3 = st.columns([2, 2, 1])
+        with filter_col1:
+            level_filter = st.selectbox("Experience Level", ["All", "Entry", "Mid", "Senior"], key="jobs_level_filter")
+        with filter_col2:
+            skill_filter = st.text_input("Required Skill", key="jobs_skill_filter")
+        with filter_col3:
+            jobs_page = st.number_input("Page", min_value=1, value=1, step=1, key="jobs_page")
+        
+        jobs_per_page = 20
+        job_params = {"limit": jobs_per_page, "offset": (jobs_page - 1) * jobs_per_page, "description_chars": 150}
+        if level_filter != "All":
+            job_params["experience_level"] = level_filter
+        if skill_filter.strip():
+            job_params["skill"] = skill_filter.strip()
+        
+        # Fetch one page of jobs from the backend
+        job_result = api_call("get", "/jobs", params=job_params)
         
         if job_result["success"] and job_result["data"] and "jobs" in job_result["data"]:
             jobs_list = job_result["data"]["jobs"]
+            total_jobs = job_result["data"].get("total", len(jobs_list))
             
             # Display the number of available jobs
-            st.markdown(f"### {len(jobs_list)} Job Postings Available")
+            st.markdown(f"### {total_jobs} Job Postings Available")
+            if total_jobs > jobs_per_page:
+                st.caption(f"Page {jobs_page} of {(total_jobs + jobs_per_page - 1) // jobs_per_page}")
             
             # Display jobs from the backend
             for job in jobs_list:
@@ -558,28 +790,35 @@ elif nav_selection == "Candidate Search":
     with col2:
         search_experience = st.selectbox("Experience Level", ["Entry", "Mid", "Senior"])
     
+    search_keywords = st.text_input("Keywords (optional)", placeholder="e.g., built data pipelines on AWS")
+    
     if st.button("Search Candidates", key="search_button"):
         if search_skills:
             with st.spinner("Searching for matching candidates..."):
-                # Simulate a bit of processing time
-                time.sleep(1)
-                
                 query = {
                     "skills": [skill.strip() for skill in search_skills.split(",")],
-                    "experience_level": search_experience
+                    "experience_level": search_experience,
+                    # Only the fields shown on the result cards
+                    "fields": ["name", "skills", "experience", "education", "experience_level"]
                 }
+                if search_keywords:
+                    query["query"] = search_keywords
                 
                 result = api_call("post", "/search-candidates/", json=query)
                 
                 if result["success"]:
                     candidates = result["data"].get("candidates", [])
+                    total = result["data"].get("total", len(candidates))
                     
                     if candidates:
-                        st.markdown(f"### Found {len(candidates)} Matching Candidates")
+                        st.markdown(f"### Found {total} Matching Candidates")
+                        if total > len(candidates):
+                            st.caption(f"Showing the top {len(candidates)} by relevance")
                         
                         for candidate in candidates:
                             cid = candidate.get("candidate_id")
                             details = candidate.get("details", {})
+                            score = candidate.get("score")
                             
                             st.markdown(f"""
                             <div style='background-color: white; padding: 20px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.05); margin-bottom: 15px;'>
@@ -587,6 +826,7 @@ elif nav_selection == "Candidate Search":
                                     <h3 style='margin-top: 0; color: #333;'>{details.get('name', 'Candidate')}</h3>
                                     <span style='background-color: #4CAF50; color: white; padding: 3px 10px; border-radius: 15px; font-size: 0.8rem;'>{details.get('experience_level', 'Unknown')}</span>
                                 </div>
+                                <p style='color: #777; font-size: 0.9rem;'>Relevance: {f"{score:.0%}" if score is not None else "N/A"}</p>
                                 <p style='color: #777; font-size: 0.9rem;'>Experience: {details.get('experience', 'Not specified')}</p>
                                 <p style='color: #777; font-size: 0.9rem;'>Education: {details.get('education', 'Not specified')}</p>
                                 <div style='margin: 10px 0;'>
@@ -629,23 +869,43 @@ elif nav_selection == "Career Insights":
     if candidate_id:
         # Auto-fetch insights if ID is provided in URL
         auto_fetch = url_candidate_id != ""
+        # Set by "Regenerate Insights" to bypass the backend's insights cache
+        refresh = st.session_state.pop("refresh_insights", False)
         
-        if auto_fetch or st.button("Get Career Insights", key="insights_button"):
+        if auto_fetch or refresh or st.button("Get Career Insights", key="insights_button"):
+            insights_header = """
+            <div style='background-color: white; padding: 20px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);'>
+                <h3 style='color: #6C63FF; margin-top: 0;'>AI Career Insights</h3>
+                <hr style='margin: 10px 0 20px 0;'>
+            """
+            header_placeholder = st.empty()
+            insights_placeholder = st.empty()
+            
             with st.spinner("Generating AI-powered career insights..."):
-                # Add progress indicator for better UX
-                progress_bar = st.progress(0)
-                for i in range(100):
-                    time.sleep(0.01)
-                    progress_bar.progress(i + 1)
-                
-                result = api_call("get", f"/career-insights/{candidate_id}")
+                # Render insights incrementally as the backend streams them
+                result = {"success": True, "data": {"insights": ""}}
+                insights_failed = False
+                for event, payload in stream_insights(candidate_id, refresh):
+                    if event == "status" and payload in INSIGHTS_STAGES:
+                        insights_placeholder.caption(INSIGHTS_STAGES[payload])
+                    elif event == "text":
+                        result["data"]["insights"] += payload
+                        header_placeholder.markdown(insights_header, unsafe_allow_html=True)
+                        insights_placeholder.markdown(result["data"]["insights"] + " ▌")
+                    elif event == "error":
+                        result["data"]["insights"] = payload
+                        insights_failed = True
+                    elif event == "failed":
+                        result = payload
                 
                 if result["success"]:
                     insights = result["data"].get("insights", "")
                     
                     # Check if we received an error message instead of real insights
-                    if insights.startswith("Unable to generate") or "error" in insights.lower():
-                        st.error(insights)
+                    if insights_failed or not insights:
+                        header_placeholder.empty()
+                        insights_placeholder.empty()
+                        st.error(insights or "Unable to generate career insights. Please try again.")
                         
                         # Display more specific troubleshooting tips based on the error
                         if "model" in insights.lower() and "not found" in insights.lower():
@@ -674,14 +934,10 @@ elif nav_selection == "Career Insights":
                             """, unsafe_allow_html=True)
                     else:
                         # Display insights in a nice formatted way
-                        st.markdown("""
-                        <div style='background-color: white; padding: 20px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);'>
-                            <h3 style='color: #6C63FF; margin-top: 0;'>AI Career Insights</h3>
-                            <hr style='margin: 10px 0 20px 0;'>
-                        """, unsafe_allow_html=True)
+                        header_placeholder.markdown(insights_header, unsafe_allow_html=True)
                         
                         # Show insights with better markdown rendering
-                        st.markdown(insights)
+                        insights_placeholder.markdown(insights)
                         
                         st.markdown("</div>", unsafe_allow_html=True)
                         
@@ -689,11 +945,14 @@ elif nav_selection == "Career Insights":
                         col1, col2 = st.columns(2)
                         with col1:
                             if st.button("Regenerate Insights", key="regenerate_insights"):
+                                st.session_state.refresh_insights = True
                                 st.experimental_rerun()
                         with col2:
                             if st.button("Download as PDF", key="download_insights"):
                                 st.info("PDF download functionality will be available in the next update.")
                 else:
+                    header_placeholder.empty()
+                    insights_placeholder.empty()
                     error_msg = "Failed to retrieve insights"
                     if result.get("status_code") == 404:
                         error_msg = "Candidate not found. Check if the ID is correct."